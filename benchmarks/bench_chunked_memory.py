@@ -0,0 +1,75 @@
+"""
+Benchmark peak memory of chunked vs unchunked page processing.
+
+Generates scan-like PDFs (a full-page image plus a text layer per page) of growing
+page counts and streams each through ``iter_sections`` in a fresh subprocess, with
+Config.PROCESS_PAGES_IN_CHUNKS off and on. With chunking, peak RSS should stay flat
+as the page count grows.
+
+Usage:
+    python benchmarks/bench_chunked_memory.py [page_count ...]
+
+Requires a Unix platform (peak RSS is read from /proc or the resource module).
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import pymupdf as fitz
+
+# ru_maxrss survives exec on Linux (the child would inherit this process's peak),
+# so prefer the per-address-space high-water mark when /proc is available.
+CHILD = """
+import logging, resource, sys
+logging.disable(logging.CRITICAL)
+from pdf_to_json import PDFStructureExtractor
+for _ in PDFStructureExtractor().iter_sections(sys.argv[1]):
+    pass
+try:
+    with open("/proc/self/status") as f:
+        print(next(int(line.split()[1]) for line in f if line.startswith("VmHWM:")))
+except OSError:
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def make_scanned_pdf(path: str, pages: int) -> None:
+    """Write a PDF whose pages each carry a distinct image and 30 lines of text."""
+    doc = fitz.open()
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 600, 800), 0)
+    for page_num in range(pages):
+        pixmap.clear_with((page_num * 37) % 256)
+        page = doc.new_page()
+        page.insert_image(page.rect, pixmap = pixmap)
+        page.insert_text((50, 60), f"Section {page_num}", fontsize = 15)
+        for line in range(30):
+            page.insert_text((50, 90 + 14 * line), f"Recognised line {line} on page {page_num}", fontsize = 11)
+    doc.save(path, deflate = True)
+    doc.close()
+
+
+def peak_rss_mb(pdf_path: str, chunked: bool) -> float:
+    """Return the peak RSS in MB of a subprocess streaming the PDF."""
+    env = dict(os.environ, PDF_TO_JSON_PROCESS_PAGES_IN_CHUNKS = str(chunked))
+    root = os.path.join(os.path.dirname(__file__), "..")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    output = subprocess.run([sys.executable, "-c", CHILD, pdf_path], env = env,
+                            capture_output = True, text = True, check = True).stdout
+    kilobytes = int(output.strip().splitlines()[-1])
+    return kilobytes / 1024
+
+
+def main():
+    page_counts = [int(arg) for arg in sys.argv[1:]] or [50, 200, 800]
+    print(f"{'pages':>6} {'unchunked MB':>13} {'chunked MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in page_counts:
+            pdf_path = os.path.join(tmp, f"scan_{pages}.pdf")
+            make_scanned_pdf(pdf_path, pages)
+            print(f"{pages:>6} {peak_rss_mb(pdf_path, False):>13.1f} {peak_rss_mb(pdf_path, True):>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark peak memory of writing JSON output.
+
+Compares the former in-memory path (extract to a dict, ``json.dumps`` the whole
+document into one string, write it) with the incremental writers, which serialize
+and write one section at a time. Peak Python allocations are measured with
+tracemalloc.
+
+Usage:
+    python benchmarks/bench_json_output_memory.py [page_count]
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import pymupdf as fitz
+
+from pdf_to_json import extract_pdf_to_dict, extract_pdf_to_file
+
+
+def make_text_pdf(path: str, pages: int) -> None:
+    """Write a text-dense PDF with a heading and several paragraphs per page."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 50), f"Chapter {page_num}", fontsize = 18)
+        y = 80
+        for paragraph in range(4):
+            for line in range(10):
+                page.insert_text((50, y), f"Paragraph {paragraph} line {line} of page {page_num}, lorem ipsum",
+                                 fontsize = 10)
+                y += 12
+            y += 20
+    doc.save(path)
+    doc.close()
+
+
+def in_memory(pdf_path: str, output_path: str) -> None:
+    """Previous output path: whole dict plus whole string."""
+    result = extract_pdf_to_dict(pdf_path)
+    json_str = json.dumps(result, ensure_ascii = False, indent = 2)
+    with open(output_path, 'w', encoding = 'utf-8') as f:
+        f.write(json_str)
+
+
+def measure(func, *args) -> float:
+    """Return peak traced memory in MB while running ``func``."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "dense.pdf")
+        output_path = os.path.join(tmp, "out.json")
+        make_text_pdf(pdf_path, pages)
+
+        print(f"{pages} pages")
+        print(f"  dict + json.dumps:   {measure(in_memory, pdf_path, output_path):8.1f} MB peak")
+        print(f"  streamed JSON:       {measure(extract_pdf_to_file, pdf_path, output_path):8.1f} MB peak")
+        print(f"  streamed JSONL:      {measure(extract_pdf_to_file, pdf_path, output_path, 'jsonl'):8.1f} MB peak")
+        print(f"  output size:         {os.path.getsize(output_path) / (1024 * 1024):8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark the columnar line store against per-line dicts.
+
+Decodes every page once, then builds the lines of the whole document both as the
+former list of five-key dicts and as LineStore tables, reporting the memory held
+(tracemalloc), build time, paragraph-grouping time and pickled size (what the
+process pool ships back per page range).
+
+Usage:
+    python benchmarks/bench_line_store.py [pdf_path ...]
+"""
+
+import logging
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import pymupdf as fitz
+
+from pdf_to_json import PDFStructureExtractor
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "papers", "1751-0473-7-7.pdf")
+
+
+def dict_lines(page_num, spans):
+    """Build the former per-line dict records from a page's span table."""
+    lines = []
+    end = len(spans)
+    i = 0
+    while i < end:
+        line_no = spans[i][0]
+        text_parts = []
+        max_size = 0.0
+        top_y = None
+        bottom_y = None
+        while i < end and spans[i][0] == line_no:
+            _, text, font, span_top, span_bottom = spans[i]
+            text_parts.append(text)
+            if font.size > max_size:
+                max_size = font.size
+            if span_top is not None:
+                top_y = span_top if top_y is None else min(top_y, span_top)
+                bottom_y = span_bottom if bottom_y is None else max(bottom_y, span_bottom)
+            i += 1
+        lines.append({"page": page_num, "text": "".join(text_parts).strip(),
+                      "font_size": round(max_size, 1), "top": top_y, "bottom": bottom_y})
+    return lines
+
+
+def group_dict_paragraphs(lines, gap_multiplier = 0.8):
+    """Former dict-based paragraph grouping."""
+    paragraphs, current, prev_bottom = [], [], None
+    for ln in lines:
+        if prev_bottom is None:
+            current = [ln]
+            prev_bottom = ln.get("bottom")
+            continue
+        top = ln.get("top")
+        threshold = (ln.get("font_size") or 10.0) * gap_multiplier
+        gap = (top - prev_bottom) if top is not None else threshold + 1
+        if gap > threshold:
+            paragraphs.append(current)
+            current = [ln]
+        else:
+            current.append(ln)
+        prev_bottom = ln.get("bottom")
+    if current:
+        paragraphs.append(current)
+    return paragraphs
+
+
+def measure(build, tables):
+    """Return (result, bytes held, build seconds) for building lines of every page."""
+    start = time.perf_counter()
+    [build(page_num, spans) for page_num, spans in enumerate(tables)]
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = [build(page_num, spans) for page_num, spans in enumerate(tables)]
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, held, elapsed
+
+
+def timed(func, pages):
+    """Return seconds spent applying ``func`` to each page's lines."""
+    start = time.perf_counter()
+    for lines in pages:
+        func(lines)
+    return time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    extractor = PDFStructureExtractor()
+    for pdf_path in sys.argv[1:] or [DEFAULT_PDF]:
+        with fitz.open(pdf_path) as doc:
+            tables = [extractor._parse_page(page) for page in doc]
+
+        dicts, dict_bytes, dict_build = measure(dict_lines, tables)
+        stores, store_bytes, store_build = measure(PDFStructureExtractor._page_lines, tables)
+        line_count = sum(len(lines) for lines in dicts)
+
+        dict_group = timed(group_dict_paragraphs, dicts)
+        store_group = timed(extractor._group_paragraphs, stores)
+
+        print(f"{os.path.basename(pdf_path)}: {len(tables)} pages, {line_count} lines")
+        print(f"  memory held:  dicts {dict_bytes / 1e6:.2f} MB, LineStore {store_bytes / 1e6:.2f} MB")
+        print(f"  build:        dicts {dict_build * 1000:.1f} ms, LineStore {store_build * 1000:.1f} ms")
+        print(f"  paragraphs:   dicts {dict_group * 1000:.1f} ms, LineStore {store_group * 1000:.1f} ms")
+        print(f"  pickled size: dicts {len(pickle.dumps(dicts)) / 1e6:.2f} MB, "
+              f"LineStore {len(pickle.dumps(stores)) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark outline-only extraction against full extraction.
+
+``extract_outline`` reads the embedded bookmarks and metadata when the PDF has them
+("toc" source) and otherwise scans lines for headings without grouping paragraphs
+("fonts" source). Each mode is run once to warm up MuPDF, then timed over several runs.
+
+Usage:
+    python benchmarks/bench_outline.py [--runs N] [pdf_path ...]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import time
+
+from pdf_to_json import PDFStructureExtractor
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "papers", "1751-0473-7-7.pdf")
+
+
+def median_seconds(func, pdf_path: str, runs: int) -> float:
+    """Return the median wall time of ``func(pdf_path)`` after one warm-up call."""
+    func(pdf_path)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(pdf_path)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("pdf_paths", nargs = "*", default = [DEFAULT_PDF])
+    parser.add_argument("--runs", type = int, default = 5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    extractor = PDFStructureExtractor()
+    for pdf_path in args.pdf_paths:
+        outline = extractor.extract_outline(pdf_path)
+        outline_time = median_seconds(extractor.extract_outline, pdf_path, args.runs)
+        full_time = median_seconds(extractor.extract_text_with_structure, pdf_path, args.runs)
+
+        print(f"{os.path.basename(pdf_path)}: {outline['stats']['page_count']} pages, "
+              f"{outline['stats']['num_headings']} headings from {outline['source']}")
+        print(f"  full extraction: {full_time * 1000:.1f} ms")
+        print(f"  outline only:    {outline_time * 1000:.1f} ms ({full_time / outline_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
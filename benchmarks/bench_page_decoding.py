@@ -0,0 +1,72 @@
+"""
+Benchmark page decoding work done by a full extraction.
+
+Counts ``page.get_text`` calls made by ``extract_text_with_structure`` and compares them
+with the decode count of the former three-pass layout (font analysis, title detection
+and line iteration each decoding pages on their own).
+
+Usage:
+    python benchmarks/bench_page_decoding.py [pdf_path ...]
+"""
+
+import logging
+import os
+import sys
+import time
+
+import pymupdf as fitz
+
+from pdf_to_json import Config, PDFStructureExtractor
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "papers", "1751-0473-7-7.pdf")
+
+
+def count_decodes(pdf_path: str) -> tuple[int, float]:
+    """Run one extraction and return (get_text calls, seconds)."""
+    calls = 0
+    original = fitz.Page.get_text
+
+    def counting_get_text(page, *args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(page, *args, **kwargs)
+
+    fitz.Page.get_text = counting_get_text
+    try:
+        start = time.perf_counter()
+        PDFStructureExtractor().extract_text_with_structure(pdf_path)
+        elapsed = time.perf_counter() - start
+    finally:
+        fitz.Page.get_text = original
+    return calls, elapsed
+
+
+def time_decode(pdf_path: str, page_nums: list) -> float:
+    """Return seconds spent decoding the given pages once each."""
+    with fitz.open(pdf_path) as doc:
+        start = time.perf_counter()
+        for page_num in page_nums:
+            doc[page_num].get_text("dict")
+        return time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    for pdf_path in sys.argv[1:] or [DEFAULT_PDF]:
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+        analysed = min(page_count, Config.MAX_PAGES_FOR_FONT_ANALYSIS)
+        legacy_decodes = page_count + analysed + (1 if page_count else 0)
+        duplicate_pages = list(range(analysed)) + ([0] if page_count else [])
+
+        decodes, elapsed = count_decodes(pdf_path)
+        saved = time_decode(pdf_path, duplicate_pages)
+
+        print(f"{os.path.basename(pdf_path)}: {page_count} pages")
+        print(f"  page decodes (three-pass): {legacy_decodes}")
+        print(f"  page decodes (single-pass): {decodes}")
+        print(f"  extraction time: {elapsed:.3f}s, duplicate decoding removed: {saved:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
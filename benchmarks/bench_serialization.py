@@ -0,0 +1,67 @@
+"""
+Benchmark JSON serialization time per backend.
+
+Builds a synthetic extraction result (many sections of multi-paragraph text) and
+times pretty and compact serialization with each installed backend, both for a
+whole result dictionary and for the streaming writer.
+
+Usage:
+    python benchmarks/bench_serialization.py [section_count]
+"""
+
+import io
+import sys
+import time
+
+from pdf_to_json.extractor import DocumentStream
+from pdf_to_json.output import dumps_result, write_json
+from pdf_to_json.serialization import get_dumps
+
+
+def make_result(sections: int) -> dict:
+    """Return a result shaped like real output, with ``sections`` sections."""
+    paragraph = "Layout-aware extraction of scientific text – ünïcödé included. " * 8
+    return {
+        "title": "Synthetic Document",
+        "sections": [
+            {"level": f"H{1 + i % 3}", "title": f"Section {i}", "paragraphs": [paragraph] * 6}
+            for i in range(sections)
+        ],
+        "font_histogram": {str(size / 10): 1000 + size for size in range(60, 240, 3)},
+        "heading_levels": {"18.0": "H1", "14.0": "H2", "12.0": "H3"},
+        "stats": {"page_count": sections // 2, "processing_time": 1.25, "num_sections": sections,
+                  "num_headings": sections, "num_paragraphs": sections * 6},
+    }
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Return the fastest of ``repeat`` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    result = make_result(sections)
+    size_mb = len(dumps_result(result, None)) / (1024 * 1024)
+    print(f"{sections} sections, {size_mb:.1f} MB compact")
+    print(f"{'backend':>8} {'dict pretty':>12} {'dict compact':>13} {'stream pretty':>14}")
+
+    for backend in ["json", "orjson", "msgspec"]:
+        try:
+            dumps = get_dumps(backend)
+        except ValueError:
+            print(f"{backend:>8} (not installed)")
+            continue
+        pretty = best_of(lambda: dumps_result(result, 2, dumps))
+        compact = best_of(lambda: dumps_result(result, None, dumps))
+        streamed = best_of(lambda: write_json(DocumentStream.from_result(result), io.StringIO(), 2, dumps))
+        print(f"{backend:>8} {pretty * 1000:>10.1f}ms {compact * 1000:>11.1f}ms {streamed * 1000:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark the extraction service against one process per file.
+
+Extracts the same list of files (each input repeated ``--repeat`` times) twice: by
+starting ``python -m pdf_to_json.cli <file> --compact`` for every file, ``--workers``
+at a time, and by posting the paths to a ``pdf_to_json serve`` pool of the same size
+from as many client threads. Both run with the result cache disabled.
+
+Usage:
+    python benchmarks/bench_serve.py [--workers N] [--repeat N] [pdf_path ...]
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pdf_to_json import Config
+from pdf_to_json.server import create_server
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "papers", "1751-0473-7-7.pdf")
+
+
+def run_processes(paths, workers: int) -> float:
+    """Return seconds to extract ``paths`` with one CLI process per file."""
+    env = dict(os.environ, PDF_TO_JSON_CACHE_DIR = "")
+
+    def extract(path):
+        subprocess.run([sys.executable, "-m", "pdf_to_json.cli", path, "--compact"],
+                       check = True, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL, env = env)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(extract, paths))
+    return time.perf_counter() - start
+
+
+def run_service(paths, workers: int) -> float:
+    """Return seconds to extract ``paths`` through a warm service (start-up excluded)."""
+    config = Config()
+    config.CACHE_DIR = ''
+    server = create_server(config, port = 0, workers = workers)
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    local = threading.local()
+
+    def extract(path):
+        # One keep-alive connection per client thread
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection(*server.server_address[:2])
+        local.conn.request("POST", "/extract", json.dumps({"path": os.path.abspath(path)}),
+                           {"Content-Type": "application/json"})
+        response = local.conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{path}: HTTP {response.status}")
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(extract, paths))
+        return time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("pdf_paths", nargs = "*", default = [DEFAULT_PDF])
+    parser.add_argument("--workers", type = int, default = os.cpu_count() or 1)
+    parser.add_argument("--repeat", type = int, default = 20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    paths = args.pdf_paths * args.repeat
+    process_time = run_processes(paths, args.workers)
+    service_time = run_service(paths, args.workers)
+
+    print(f"{len(paths)} files, {args.workers} workers")
+    print(f"  process per file: {process_time:6.2f} s ({len(paths) / process_time:6.1f} files/s)")
+    print(f"  warm service:     {service_time:6.2f} s ({len(paths) / service_time:6.1f} files/s, "
+          f"{process_time / service_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
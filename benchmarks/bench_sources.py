@@ -0,0 +1,71 @@
+"""
+Benchmark extraction from bytes and memory-mapped files.
+
+Compares, per PDF: writing received bytes to a temporary file and extracting that
+path (the former way to handle in-memory PDFs) against extracting the bytes
+directly, and extracting a path with buffered file reads against memory-mapped
+reads (Config.MMAP_FILES).
+
+Usage:
+    python benchmarks/bench_sources.py [--runs N] [pdf_path ...]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from pdf_to_json import Config, PDFStructureExtractor
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "papers", "1751-0473-7-7.pdf")
+
+
+def median_seconds(func, runs: int) -> float:
+    """Return the median wall time of ``func()`` after one warm-up call."""
+    func()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def via_temp_file(extractor, data: bytes):
+    """Extract bytes by way of a temporary file."""
+    with tempfile.NamedTemporaryFile(suffix = ".pdf") as f:
+        f.write(data)
+        f.flush()
+        return extractor.extract_text_with_structure(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("pdf_paths", nargs = "*", default = [DEFAULT_PDF])
+    parser.add_argument("--runs", type = int, default = 5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    buffered_config = Config()
+    buffered_config.MMAP_FILES = False
+    mapped = PDFStructureExtractor()
+    buffered = PDFStructureExtractor(buffered_config)
+
+    for pdf_path in args.pdf_paths:
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+        timings = {
+            "bytes via temp file": median_seconds(lambda: via_temp_file(buffered, data), args.runs),
+            "bytes in place": median_seconds(lambda: mapped.extract_text_with_structure(data), args.runs),
+            "path, buffered reads": median_seconds(lambda: buffered.extract_text_with_structure(pdf_path), args.runs),
+            "path, memory-mapped": median_seconds(lambda: mapped.extract_text_with_structure(pdf_path), args.runs),
+        }
+        print(f"{os.path.basename(pdf_path)}: {len(data) / 1e6:.2f} MB")
+        for name, seconds in timings.items():
+            print(f"  {name:22s} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
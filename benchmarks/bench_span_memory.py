@@ -0,0 +1,89 @@
+"""
+Benchmark the memory held per span by each span representation.
+
+Decodes every page once and measures, per million spans, the memory held by:
+
+- the span dicts page.get_text("dict") returns (what dict-based records keep)
+- the former flat tuples (line, text, size, top, bottom), one float per span size
+- TextSpan records sharing pooled FontInfo instances, with interned font names and
+  rounded sizes
+
+Sizes are deep sizes (sys.getsizeof over every reachable object, each shared object
+counted once), so sharing between spans is credited exactly. Span texts are included.
+
+Usage:
+    python benchmarks/bench_span_memory.py [pdf_path ...]
+"""
+
+import logging
+import os
+import sys
+import time
+
+import pymupdf as fitz
+
+from pdf_to_json import PDFStructureExtractor
+from pdf_to_json.extractor import TextSpan, font_info
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "papers", "1751-0473-7-7.pdf")
+
+
+def deep_size(root) -> int:
+    """Return the bytes held by ``root`` and everything reachable from it, counting shared objects once."""
+    seen = set()
+    total = 0
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return total
+
+
+def span_dicts(page_dicts):
+    """Return the non-blank span dicts of decoded pages, as get_text built them."""
+    return [span for page in page_dicts for block in page.get("blocks", []) for line in block.get("lines", [])
+            for span in line.get("spans", []) if span.get("text", "").strip()]
+
+
+def flat_tuples(spans):
+    """Build the former (line, text, size, top, bottom) tuples; line numbers are not needed for sizing."""
+    return [(0, span["text"], float(span["size"]), span["bbox"][1], span["bbox"][3]) for span in spans]
+
+
+def pooled_spans(spans):
+    """Build TextSpan records with pooled fonts."""
+    return [TextSpan(0, span["text"], font_info(float(span["size"]), span["font"], span["flags"]),
+                     span["bbox"][1], span["bbox"][3]) for span in spans]
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    flags = PDFStructureExtractor()._text_flags()
+    for pdf_path in sys.argv[1:] or [DEFAULT_PDF]:
+        with fitz.open(pdf_path) as doc:
+            page_dicts = [page.get_text("dict", flags = flags) for page in doc]
+        spans = span_dicts(page_dicts)
+        count = len(spans)
+
+        print(f"{os.path.basename(pdf_path)}: {len(page_dicts)} pages, {count} spans")
+        baseline = None
+        for name, build in [("span dicts", list), ("flat tuples", flat_tuples), ("pooled TextSpan", pooled_spans)]:
+            start = time.perf_counter()
+            records = build(spans)
+            elapsed = time.perf_counter() - start
+            per_million = deep_size(records) / count * 1e6
+            baseline = baseline or per_million
+            print(f"  {name:<16} {per_million / 1e6:8.1f} MB per million spans "
+                  f"({per_million / baseline:5.1%} of span dicts), built in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
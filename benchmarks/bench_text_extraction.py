@@ -0,0 +1,107 @@
+"""
+Per-page microbenchmark of the PyMuPDF extraction modes.
+
+Times ``_parse_page`` (page.get_text plus span flattening) for every
+Config.TEXT_EXTRACTION mode, page by page, and the bare ``get_text`` calls of a few
+other PyMuPDF outputs for reference. "rawdict" carries one dict per character and is
+slower than "dict" for our purposes.
+
+Runs on the bundled sample paper by default. --images adds a generated image-heavy
+document (a full-page photo-like image and a few lines of text per page), the case
+the "text" mode is meant for; it is cached in the temporary directory.
+
+Usage:
+    python benchmarks/bench_text_extraction.py [--runs N] [--images] [pdf_path ...]
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import pymupdf as fitz
+
+from pdf_to_json import Config, PDFStructureExtractor
+from pdf_to_json.extractor import TEXT_EXTRACTION_FLAGS
+
+DEFAULT_PDF = os.path.join(os.path.dirname(__file__), "..", "papers", "1751-0473-7-7.pdf")
+
+IMAGE_PDF = os.path.join(tempfile.gettempdir(), "pdf_to_json_benchmarks", "images-10.pdf")
+
+NO_IMAGES = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+REFERENCE_CALLS = {
+    "rawdict (text only)": lambda page: page.get_text("rawdict", flags = NO_IMAGES),
+    "json (text only)": lambda page: page.get_text("json", flags = NO_IMAGES),
+}
+
+
+def make_image_pdf(path: str, pages: int = 10, side: int = 1000) -> None:
+    """Write ``pages`` pages, each with a ``side``-pixel noise image (incompressible, like a photo) and a caption."""
+    rng = random.Random(0)
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        samples = rng.getrandbits(8 * side * side * 3).to_bytes(side * side * 3, "little")
+        pixmap = fitz.Pixmap(fitz.csRGB, side, side, samples, False)
+        page.insert_image(fitz.Rect(50, 120, 545, 615), pixmap = pixmap)
+        page.insert_text((50, 60), f"Figure {page_num + 1}", fontsize = 18)
+        page.insert_text((50, 90), "Caption text describing the figure below", fontsize = 11)
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    doc.save(path, deflate = True)
+    doc.close()
+
+
+def per_page_ms(func, doc, runs: int) -> list:
+    """Return the median milliseconds of ``func(page)`` for each page, after a warm-up pass."""
+    for page in doc:
+        func(page)
+    timings = []
+    for page in doc:
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func(page)
+            samples.append(time.perf_counter() - start)
+        timings.append(statistics.median(samples) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("pdf_paths", nargs = "*", default = [DEFAULT_PDF])
+    parser.add_argument("--runs", type = int, default = 7)
+    parser.add_argument("--images", action = "store_true", help = "also run on a generated image-heavy document")
+    args = parser.parse_args()
+
+    pdf_paths = list(args.pdf_paths)
+    if args.images:
+        if not os.path.exists(IMAGE_PDF):
+            make_image_pdf(IMAGE_PDF)
+        pdf_paths.append(IMAGE_PDF)
+
+    logging.disable(logging.CRITICAL)
+    for pdf_path in pdf_paths:
+        calls = {}
+        for mode in TEXT_EXTRACTION_FLAGS:
+            config = Config()
+            config.TEXT_EXTRACTION = mode
+            calls[f"{mode} (_parse_page)"] = PDFStructureExtractor(config)._parse_page
+        calls.update(REFERENCE_CALLS)
+
+        with fitz.open(pdf_path) as doc:
+            results = {name: per_page_ms(func, doc, args.runs) for name, func in calls.items()}
+
+        baseline = sum(results["dict (_parse_page)"])
+        print(f"{os.path.basename(pdf_path)}: {len(next(iter(results.values())))} pages")
+        print("  page " + "".join(f"{name:>24}" for name in results))
+        for page_num, row in enumerate(zip(*results.values()), 1):
+            print(f"  {page_num:4d} " + "".join(f"{ms:21.2f} ms" for ms in row))
+        print("  total" + "".join(f"{sum(ms):21.2f} ms" for ms in results.values()))
+        print("  ratio" + "".join(f"{sum(ms) / baseline:23.3f}x" for ms in results.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Benchmark suite with machine-readable results and baseline comparison.
+
+Generates synthetic PDFs of 1, 50, 500 and 2000 pages with PyMuPDF (cached between
+runs) and times, per document size:
+
+- ``extract``: end-to-end extract_text_with_structure
+- ``outline``: extract_outline
+- ``stage.<name>``: time per extraction stage, from Config.PROFILE profiles
+- ``serialize.<backend>``: dumps_result of the extraction result, per installed backend
+- ``cli``: a ``python -m pdf_to_json.cli`` process, including interpreter start-up
+
+Each case is run once to warm up, then timed over several runs; the median, minimum
+and maximum are reported in seconds. Results are written as JSON with --output and
+compared against a stored baseline with --compare, which exits with status 1 when a
+case is slower than the baseline by more than --tolerance. Timings only compare
+meaningfully on the machine that recorded the baseline.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1,50] [--runs N] [--filter SUBSTRING]
+                               [--output results.json] [--compare benchmarks/baseline.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import pymupdf as fitz
+
+import pdf_to_json
+from pdf_to_json import Config, PDFStructureExtractor
+from pdf_to_json.output import dumps_result
+from pdf_to_json.serialization import JSON_BACKENDS, get_dumps
+
+DEFAULT_SIZES = [1, 50, 500, 2000]
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "pdf_to_json_benchmarks")
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Stages reported from profiles; others (e.g. parallel_wait) only appear in some modes
+STAGES = ["open", "title", "font_analysis", "page_decode", "line_building",
+          "heading_detection", "paragraph_grouping", "sectioning", "output"]
+
+
+def make_pdf(path: str, pages: int) -> None:
+    """Write a ``pages``-page document with a heading every third page and body paragraphs."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        y = 60
+        if page_num % 3 == 0:
+            page.insert_text((50, y), f"Chapter {page_num // 3 + 1}", fontsize = 18)
+            y += 30
+            page.insert_text((50, y), f"Section {page_num // 3 + 1}.1", fontsize = 14)
+            y += 24
+        while y < 760:
+            for _ in range(5):
+                page.insert_text((50, y), f"Body text of page {page_num + 1} at line {y}, "
+                                 "long enough to look like a line of prose.", fontsize = 11)
+                y += 14
+            y += 10
+    doc.save(path)
+    doc.close()
+
+
+def synthetic_pdf(data_dir: str, pages: int) -> str:
+    """Return the path of the ``pages``-page synthetic PDF, generating it on first use."""
+    path = os.path.join(data_dir, f"synthetic-{pages}.pdf")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok = True)
+        make_pdf(path + ".tmp", pages)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """Return the median, minimum and maximum of ``times`` and the run count."""
+    return {"median": statistics.median(times), "min": min(times), "max": max(times), "runs": len(times)}
+
+
+def time_runs(func: Callable[[], object], runs: int) -> List[float]:
+    """Return the wall times of ``runs`` calls of ``func`` after one warm-up call."""
+    func()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def stage_times(pdf_path: str, runs: int) -> Dict[str, List[float]]:
+    """Return the per-stage times of ``runs`` profiled extractions."""
+    config = Config()
+    config.PROFILE = True
+    extractor = PDFStructureExtractor(config)
+    extractor.extract_text_with_structure(pdf_path)
+    times = defaultdict(list)
+    for _ in range(runs):
+        profile = extractor.extract_text_with_structure(pdf_path)["stats"]["profile"]
+        for stage in STAGES:
+            times[stage].append(profile["stages"].get(stage, 0.0))
+    return times
+
+
+def installed_backends() -> List[str]:
+    """Return the JSON backends that can be loaded here."""
+    backends = []
+    for backend in JSON_BACKENDS:
+        if backend == "auto":
+            continue
+        try:
+            get_dumps(backend)
+        except ValueError:
+            continue
+        backends.append(backend)
+    return backends
+
+
+def run_cli(pdf_path: str) -> None:
+    """Run the command-line tool on ``pdf_path`` in a fresh interpreter."""
+    subprocess.run([sys.executable, "-m", "pdf_to_json.cli", pdf_path, "-o", os.devnull],
+                   check = True, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+
+
+def run_suite(sizes: List[int], runs: int, data_dir: str, name_filter: str = "") -> Dict[str, Dict[str, float]]:
+    """Run every case whose name contains ``name_filter`` and return their summaries by name."""
+    results = {}
+    extractor = PDFStructureExtractor()
+
+    def record(name: str, func: Callable[[], List[float]]) -> None:
+        if name_filter in name:
+            results[name] = summarize(func())
+            print(f"  {name:36s} {results[name]['median'] * 1000:10.2f} ms", file = sys.stderr)
+
+    for pages in sizes:
+        pdf_path = synthetic_pdf(data_dir, pages)
+        print(f"{pages} pages ({os.path.getsize(pdf_path) / 1e6:.1f} MB)", file = sys.stderr)
+        # Fewer runs for the largest documents keep the suite to a few minutes
+        size_runs = max(1, runs // 2) if pages >= 500 else runs
+
+        record(f"extract[{pages}]", lambda: time_runs(lambda: extractor.extract_text_with_structure(pdf_path), size_runs))
+        record(f"outline[{pages}]", lambda: time_runs(lambda: extractor.extract_outline(pdf_path), size_runs))
+        if any(name_filter in f"stage.{stage}[{pages}]" for stage in STAGES):
+            stages = stage_times(pdf_path, size_runs)
+            for stage in STAGES:
+                record(f"stage.{stage}[{pages}]", lambda: stages[stage])
+        result = extractor.extract_text_with_structure(pdf_path)
+        for backend in installed_backends():
+            dumps = get_dumps(backend)
+            record(f"serialize.{backend}[{pages}]", lambda: time_runs(lambda: dumps_result(result, dumps = dumps), runs))
+        record(f"cli[{pages}]", lambda: time_runs(lambda: run_cli(pdf_path), size_runs))
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float, min_seconds: float) -> List[str]:
+    """
+    Print each case's median against the baseline and return the regressed case names.
+
+    Cases faster than ``min_seconds`` in both runs are reported but never flagged, as
+    their medians are dominated by timer and scheduling noise.
+    """
+    regressions = []
+    print(f"{'case':36s} {'baseline ms':>12s} {'current ms':>12s} {'ratio':>7s}")
+    for name, summary in results.items():
+        if name not in baseline:
+            print(f"{name:36s} {'-':>12s} {summary['median'] * 1000:12.2f}       new")
+            continue
+        before, after = baseline[name]["median"], summary["median"]
+        ratio = after / before if before > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance and max(before, after) >= min_seconds:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:36s} {before * 1000:12.2f} {after * 1000:12.2f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default = ",".join(map(str, DEFAULT_SIZES)),
+                        help = "Comma-separated page counts of the synthetic PDFs")
+    parser.add_argument("--runs", type = int, default = 5, help = "Timed runs per case (halved for 500+ pages)")
+    parser.add_argument("--filter", default = "", help = "Only run cases whose name contains this text")
+    parser.add_argument("--data-dir", default = DEFAULT_DATA_DIR, help = "Where the synthetic PDFs are kept")
+    parser.add_argument("--output", "-o", help = "Write results as JSON to this file ('-' for stdout)")
+    parser.add_argument("--compare", nargs = "?", const = BASELINE, metavar = "BASELINE",
+                        help = f"Compare against a results file (default {os.path.relpath(BASELINE)})")
+    parser.add_argument("--tolerance", type = float, default = 0.25,
+                        help = "Allowed slowdown against the baseline, as a fraction")
+    parser.add_argument("--min-seconds", type = float, default = 0.005,
+                        help = "Cases faster than this are never flagged as regressions")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    report = {
+        "meta": {
+            "version": pdf_to_json.__version__,
+            "pymupdf": fitz.VersionBind,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": run_suite(sizes, args.runs, args.data_dir, args.filter),
+    }
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent = 2)
+        print()
+    elif args.output:
+        with open(args.output, "w", encoding = "utf-8") as f:
+            json.dump(report, f, indent = 2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding = "utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline["results"], args.tolerance, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by more than "
+                  f"{args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,18 +16,19 @@ def example_batch_processing():
     pdf_files = ["document1.pdf", "document2.pdf", "document3.pdf"]
     results = []
 
-    for pdf_file in pdf_files:
-        try:
-            result = pdf_to_json.extract_pdf_to_dict(pdf_file)
+    # Files are extracted concurrently; results arrive as each file finishes
+    for item in pdf_to_json.extract_many(pdf_files, workers=4):
+        if item.ok:
+            result = item.result
             results.append({
-                "file": pdf_file,
+                "file": item.path,
                 "title": result["title"],
                 "sections": len(result["sections"]),
                 "pages": result["stats"]["page_count"]
             })
-            print(f"[OK] Processed {pdf_file}: {result['title']}")
-        except PdfToJsonError as e:
-            print(f"[FAIL] Failed to process {pdf_file}: {e}")
+            print(f"[OK] Processed {item.path}: {result['title']}")
+        else:
+            print(f"[FAIL] Failed to process {item.path}: {item.error}")
 
     # Save batch results
     with open("batch_results.json", "w") as f:
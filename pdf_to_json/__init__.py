@@ -17,11 +17,19 @@ __version__ = "1.0.0"
 __author__ = "Rushi Balapure"
 __email__ = "rishibalapure12@gmail.com"
 
-import json
+import importlib
+from typing import TYPE_CHECKING
 
 from .config import Config
 from .exceptions import InvalidPDFError, PDFProcessingError, PdfToJsonError
-from .extractor import PDFStructureExtractor
+
+if TYPE_CHECKING:
+    from .aio import AsyncExtractor, aextract_many, aextract_pdf_to_dict
+    from .batch import BatchResult, extract_many
+    from .extractor import DocumentStream, PDFStructureExtractor
+    from .instrumentation import register_hook, unregister_hook
+    from .layout import LayoutProfile
+    from .sources import PDFInput
 
 __all__ = [
     "PDFStructureExtractor",
@@ -30,16 +38,73 @@ __all__ = [
     "PDFProcessingError",
     "InvalidPDFError",
     "extract_pdf_to_json",
-    "extract_pdf_to_dict"
+    "extract_pdf_to_dict",
+    "extract_pdf_to_file",
+    "iter_sections",
+    "extract_outline",
+    "extract_incremental",
+    "extract_many",
+    "BatchResult",
+    "aextract_pdf_to_dict",
+    "aextract_many",
+    "AsyncExtractor",
+    "DocumentStream",
+    "LayoutProfile",
+    "register_hook",
+    "unregister_hook"
 ]
 
-def extract_pdf_to_json(pdf_path: str, output_path: str = None) -> str:
+# Attributes imported from their submodule on first access, so that importing the
+# package (or running ``pdf_to_json --help``) does not load PyMuPDF or asyncio
+_LAZY_ATTRIBUTES = {
+    "AsyncExtractor": ".aio",
+    "aextract_many": ".aio",
+    "aextract_pdf_to_dict": ".aio",
+    "BatchResult": ".batch",
+    "extract_many": ".batch",
+    "DocumentStream": ".extractor",
+    "PDFStructureExtractor": ".extractor",
+    "register_hook": ".instrumentation",
+    "unregister_hook": ".instrumentation",
+    "LayoutProfile": ".layout",
+    "PDFInput": ".sources",
+}
+
+def __getattr__(name: str):
+    """Import lazy attributes on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List lazy attributes along with the loaded ones."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+def _extraction_options(pages, max_sections, stop_after_heading) -> dict:
+    """Return the page-range and early-stop options that were given."""
+    options = {"pages": pages, "max_sections": max_sections, "stop_after_heading": stop_after_heading}
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def extract_pdf_to_json(pdf_path: "PDFInput", output_path: str = None, config: Config = None,
+                        pages = None, max_sections: int = None, stop_after_heading: str = None) -> str:
     """
     Extract PDF content to JSON string.
 
+    When saving to a file, sections are serialized and written as they are extracted
+    instead of building the whole JSON string in memory.
+
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str, bytes or file): Path to the PDF file, or its contents as bytes,
+            bytearray, memoryview or a binary file object
         output_path (str, optional): Path to save JSON output. If None, returns JSON string.
+        config (Config, optional): Configuration object. If None, uses default config.
+        pages (Iterable[int | slice] or slice, optional): 0-based pages to extract. Defaults to all pages.
+        max_sections (int, optional): Stop after this many sections
+        stop_after_heading (str, optional): Stop after the first heading containing this text
 
     Returns:
         str: JSON string if output_path is None, otherwise saves to file and returns path
@@ -47,23 +112,77 @@ def extract_pdf_to_json(pdf_path: str, output_path: str = None) -> str:
     Raises:
         PdfToJsonError: If PDF processing fails
     """
-    extractor = PDFStructureExtractor()
-    result = extractor.extract_text_with_structure(pdf_path)
-
-    json_str = json.dumps(result, ensure_ascii = False, indent = 2)
-
+    options = _extraction_options(pages, max_sections, stop_after_heading)
     if output_path:
-        with open(output_path, 'w', encoding = 'utf-8') as f:
-            f.write(json_str)
+        extract_pdf_to_file(pdf_path, output_path, config = config, **options)
         return output_path
-    return json_str
 
-def extract_pdf_to_dict(pdf_path: str) -> dict:
+    from . import PDFStructureExtractor
+    from .output import dumps_result
+    from .serialization import get_dumps
+
+    dumps = get_dumps((config or Config()).JSON_BACKEND)
+
+    extractor = PDFStructureExtractor(config)
+    result = extractor.extract_text_with_structure(pdf_path, **options)
+
+    return dumps_result(result, indent = 2, dumps = dumps)
+
+def extract_pdf_to_file(pdf_path: "PDFInput", output, output_format: str = "pretty", config: Config = None,
+                        pages = None, max_sections: int = None, stop_after_heading: str = None) -> None:
+    """
+    Extract PDF content and write it incrementally, section by section.
+
+    Args:
+        pdf_path (str, bytes or file): Path to the PDF file, or its contents as bytes,
+            bytearray, memoryview or a binary file object
+        output (str or TextIO): Output file path, or a text file object such as sys.stdout.
+            A file path is replaced only once the whole document has been written.
+        output_format (str): "pretty" (indented JSON), "compact" (JSON without whitespace),
+            "jsonl" (header line, one line per section, stats line) or a format added
+            with pdf_to_json.output.register_format
+        config (Config, optional): Configuration object. If None, uses default config.
+        pages (Iterable[int | slice] or slice, optional): 0-based pages to extract. Defaults to all pages.
+        max_sections (int, optional): Stop after this many sections
+        stop_after_heading (str, optional): Stop after the first heading containing this text
+
+    Raises:
+        ValueError: If output_format or Config.JSON_BACKEND is unknown
+        PdfToJsonError: If PDF processing fails
+    """
+    from . import PDFStructureExtractor
+    from .cache import _atomic_write
+    from .output import get_writer
+    from .serialization import get_dumps
+
+    writer = get_writer(output_format)
+    dumps = get_dumps((config or Config()).JSON_BACKEND)
+
+    extractor = PDFStructureExtractor(config)
+    options = _extraction_options(pages, max_sections, stop_after_heading)
+    with extractor.open_stream(pdf_path, **options) as stream:
+        if not isinstance(output, str):
+            writer(stream, output, dumps = dumps)
+            return
+        # A failed extraction leaves any previous file at ``output`` untouched
+        with _atomic_write(output) as f:
+            writer(stream, f, dumps = dumps)
+
+
+def extract_pdf_to_dict(pdf_path: "PDFInput", config: Config = None,
+                        pages = None, max_sections: int = None, stop_after_heading: str = None) -> dict:
     """
     Extract PDF content to Python dictionary.
 
+    Results are served from the on-disk cache when Config.CACHE_DIR is set.
+
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str, bytes or file): Path to the PDF file, or its contents as bytes,
+            bytearray, memoryview or a binary file object
+        config (Config, optional): Configuration object. If None, uses default config.
+        pages (Iterable[int | slice] or slice, optional): 0-based pages to extract. Defaults to all pages.
+        max_sections (int, optional): Stop after this many sections
+        stop_after_heading (str, optional): Stop after the first heading containing this text
 
     Returns:
         dict: Dictionary containing extracted PDF structure
@@ -71,5 +190,80 @@ def extract_pdf_to_dict(pdf_path: str) -> dict:
     Raises:
         PdfToJsonError: If PDF processing fails
     """
-    extractor = PDFStructureExtractor()
-    return extractor.extract_text_with_structure(pdf_path)
+    from . import PDFStructureExtractor
+
+    extractor = PDFStructureExtractor(config)
+    return extractor.extract_text_with_structure(
+        pdf_path, **_extraction_options(pages, max_sections, stop_after_heading))
+
+def iter_sections(pdf_path: "PDFInput", config: Config = None,
+                  pages = None, max_sections: int = None, stop_after_heading: str = None):
+    """
+    Stream extracted sections from a PDF as they are parsed.
+
+    Args:
+        pdf_path (str, bytes or file): Path to the PDF file, or its contents as bytes,
+            bytearray, memoryview or a binary file object
+        config (Config, optional): Configuration object. If None, uses default config.
+        pages (Iterable[int | slice] or slice, optional): 0-based pages to extract. Defaults to all pages.
+        max_sections (int, optional): Stop after this many sections
+        stop_after_heading (str, optional): Stop after the first heading containing this text
+
+    Returns:
+        Iterator[dict]: Generator of section dictionaries, in document order
+
+    Raises:
+        PdfToJsonError: If PDF processing fails
+    """
+    from . import PDFStructureExtractor
+
+    extractor = PDFStructureExtractor(config)
+    return extractor.iter_sections(pdf_path, **_extraction_options(pages, max_sections, stop_after_heading))
+
+def extract_outline(pdf_path: "PDFInput", config: Config = None) -> dict:
+    """
+    Extract only the title and heading outline of a PDF, without paragraph text.
+
+    Uses the document metadata and embedded bookmarks when present, and otherwise
+    scans the pages for headings.
+
+    Args:
+        pdf_path (str, bytes or file): Path to the PDF file, or its contents as bytes,
+            bytearray, memoryview or a binary file object
+        config (Config, optional): Configuration object. If None, uses default config.
+
+    Returns:
+        dict: ``title``, ``outline`` (``level``, ``title``, 0-based ``page``), ``source`` and ``stats``
+
+    Raises:
+        PdfToJsonError: If PDF processing fails
+    """
+    from . import PDFStructureExtractor
+
+    extractor = PDFStructureExtractor(config)
+    return extractor.extract_outline(pdf_path)
+
+def extract_incremental(pdf_path: "PDFInput", index_path: str, config: Config = None) -> dict:
+    """
+    Extract PDF content to a dictionary, decoding only pages changed since the last run.
+
+    A page index kept at ``index_path`` records each page's fingerprint and decoded
+    lines; pages found there are reused, and the index is updated for the next run.
+    The result equals that of extract_pdf_to_dict.
+
+    Args:
+        pdf_path (str, bytes or file): Path to the PDF file, or its contents as bytes,
+            bytearray, memoryview or a binary file object
+        index_path (str): Page index file, created if missing
+        config (Config, optional): Configuration object. If None, uses default config.
+
+    Returns:
+        dict: Dictionary containing extracted PDF structure, with ``stats["pages_reused"]``
+
+    Raises:
+        PdfToJsonError: If PDF processing fails
+    """
+    from . import PDFStructureExtractor
+
+    extractor = PDFStructureExtractor(config)
+    return extractor.extract_incremental(pdf_path, index_path)
@@ -0,0 +1,247 @@
+"""
+asyncio interface: run extractions off the event loop.
+
+Extraction is CPU-bound and PyMuPDF is not thread-safe, so work is handed to a
+managed executor: one shared background thread for in-process extraction, or a
+process pool. A semaphore bounds the number of extractions submitted at once, and
+cancelling an awaiting task withdraws its extraction if it has not started yet (a
+running one finishes in the background and its result is discarded).
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Union
+
+from . import _extraction_options
+from .batch import BatchResult, _pool_workers
+from .config import Config
+from .exceptions import PdfToJsonError
+from .extractor import PageSelection, PDFStructureExtractor
+from .sources import PDFInput
+
+# A PDF input, or a stream whose read() is a coroutine
+Source = Union[PDFInput, Any]
+
+
+def _extract_source(source, config: Config, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract a path or in-memory PDF; runs inside the executor."""
+    return PDFStructureExtractor(config).extract_text_with_structure(source, **options)
+
+
+@functools.lru_cache(maxsize = None)
+def _shared_thread() -> ThreadPoolExecutor:
+    """Return the background thread that runs every in-process extraction."""
+    return ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "pdf_to_json")
+
+
+def _page_list(pages):
+    """Materialize a page iterable so it can be sent to a worker process."""
+    return pages if pages is None or isinstance(pages, slice) else list(pages)
+
+
+async def _read_source(source: Source, in_process: bool):
+    """
+    Prepare ``source`` for the executor: async streams are drained on the event loop,
+    and buffers and files bound for a worker process are turned into bytes.
+    """
+    if isinstance(source, (str, os.PathLike, bytes, bytearray)):
+        return source
+    if isinstance(source, memoryview):
+        return source if in_process else source.tobytes()
+    read = getattr(source, "read", None)
+    if read is None:
+        raise TypeError(f"Unsupported PDF source: {type(source).__name__}")
+    if in_process and not inspect.iscoroutinefunction(read):
+        # Read (or memory-mapped) by the extractor on the background thread
+        return source
+    data = read()
+    if asyncio.iscoroutine(data) or isinstance(data, asyncio.Future):
+        data = await data
+    return bytes(data)
+
+
+class AsyncExtractor:
+    """
+    Extracts PDFs from coroutines through a managed executor.
+
+    Use it as an async context manager, or call ``aclose()`` when done, to shut the
+    executor down.
+
+    Args:
+        config (Config, optional): Configuration used for every extraction
+        workers (int, optional): Number of worker processes. Defaults to one per CPU.
+            With 1 worker extractions run one at a time on a background thread of this
+            process, shared with aextract_pdf_to_dict, using Config.WORKERS to decode
+            each document's pages in parallel.
+        max_concurrency (int, optional): Extractions submitted to the executor at once;
+            further calls wait their turn. Defaults to twice the number of workers.
+    """
+
+    def __init__(self, config: Optional[Config] = None, workers: Optional[int] = None,
+                 max_concurrency: Optional[int] = None):
+        self.workers, self.config = _pool_workers(config, workers)
+        self.max_concurrency = max_concurrency or self.workers * 2
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> Executor:
+        """Return the executor, starting the process pool on first use."""
+        if self.workers <= 1:
+            return _shared_thread()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers = self.workers)
+        return self._executor
+
+    async def extract(self, source: Source, pages: Optional[PageSelection] = None,
+                      max_sections: Optional[int] = None,
+                      stop_after_heading: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract one PDF without blocking the event loop.
+
+        Args:
+            source: Path, PDF bytes (``bytes``, ``bytearray``, ``memoryview``) or a
+                binary stream whose ``read()`` may be a coroutine
+            pages (Iterable[int | slice] or slice, optional): 0-based pages to extract
+            max_sections (int, optional): Stop after this many sections
+            stop_after_heading (str, optional): Stop after the first heading containing this text
+
+        Returns:
+            Dict[str, Any]: Extraction result, as from extract_pdf_to_dict
+
+        Raises:
+            PdfToJsonError: If PDF processing fails
+            TypeError: If ``source`` is not a supported type
+        """
+        source = await _read_source(source, in_process = self.workers <= 1)
+        options = _extraction_options(_page_list(pages), max_sections, stop_after_heading)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), functools.partial(_extract_source, source, self.config, options))
+
+    async def _extract_one(self, source: Source, name: str) -> BatchResult:
+        """Extract one batch entry, capturing failures instead of raising."""
+        try:
+            return BatchResult(name, result = await self.extract(source))
+        except (PdfToJsonError, TypeError) as e:
+            return BatchResult(name, error = str(e))
+        except Exception as e:
+            return BatchResult(name, error = f"Unexpected error: {e}")
+
+    async def extract_many(self, sources) -> AsyncIterator[BatchResult]:
+        """
+        Extract many PDFs concurrently, yielding results as they finish.
+
+        At most ``max_concurrency`` sources are read and in flight at a time. Leaving
+        the loop early cancels the extractions that have not started.
+
+        Args:
+            sources (Iterable or AsyncIterable): Sources as accepted by ``extract``
+
+        Yields:
+            BatchResult: One result per source, in completion order. In-memory sources
+            are named ``<input N>`` after their 0-based position.
+        """
+        pending = set()
+        try:
+            index = 0
+            async for source in _as_async_iterable(sources):
+                if len(pending) >= self.max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when = asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else f"<input {index}>"
+                pending.add(asyncio.ensure_future(self._extract_one(source, name)))
+                index += 1
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when = asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def aclose(self) -> None:
+        """Shut down the process pool, cancelling extractions that have not started."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, functools.partial(_shutdown, executor))
+
+    async def __aenter__(self) -> "AsyncExtractor":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+
+def _shutdown(executor: Executor) -> None:
+    """Shut an executor down, dropping queued work where supported (Python 3.9+)."""
+    try:
+        executor.shutdown(wait = True, cancel_futures = True)
+    except TypeError:
+        executor.shutdown(wait = True)
+
+
+async def _as_async_iterable(sources):
+    """Iterate a sync or async iterable asynchronously."""
+    if hasattr(sources, "__aiter__"):
+        async for source in sources:
+            yield source
+    else:
+        for source in sources:
+            yield source
+
+
+async def aextract_pdf_to_dict(source: Source, config: Optional[Config] = None,
+                               pages: Optional[PageSelection] = None, max_sections: Optional[int] = None,
+                               stop_after_heading: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract PDF content to a dictionary without blocking the event loop.
+
+    Calls share one background thread, so they run one at a time; use an
+    AsyncExtractor with several workers to extract in parallel.
+
+    Args:
+        source: Path, PDF bytes or a binary stream whose ``read()`` may be a coroutine
+        config (Config, optional): Configuration object. If None, uses default config.
+        pages (Iterable[int | slice] or slice, optional): 0-based pages to extract. Defaults to all pages.
+        max_sections (int, optional): Stop after this many sections
+        stop_after_heading (str, optional): Stop after the first heading containing this text
+
+    Returns:
+        Dict[str, Any]: Extraction result
+
+    Raises:
+        PdfToJsonError: If PDF processing fails
+    """
+    source = await _read_source(source, in_process = True)
+    options = _extraction_options(_page_list(pages), max_sections, stop_after_heading)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _shared_thread(), functools.partial(_extract_source, source, config or Config(), options))
+
+
+async def aextract_many(sources: Iterable[Source], workers: Optional[int] = None,
+                        config: Optional[Config] = None,
+                        max_concurrency: Optional[int] = None) -> AsyncIterator[BatchResult]:
+    """
+    Extract many PDFs concurrently from a coroutine, yielding results as they finish.
+
+    Args:
+        sources (Iterable or AsyncIterable): Paths, PDF bytes or binary streams
+        workers (int, optional): Number of worker processes (see AsyncExtractor)
+        config (Config, optional): Configuration used for every file
+        max_concurrency (int, optional): Extractions in flight at once (see AsyncExtractor)
+
+    Yields:
+        BatchResult: One result per source, in completion order
+    """
+    async with AsyncExtractor(config, workers, max_concurrency) as extractor:
+        async for item in extractor.extract_many(sources):
+            yield item
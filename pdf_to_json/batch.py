@@ -0,0 +1,116 @@
+"""
+Batch extraction over many PDF files with a worker pool.
+"""
+
+import copy
+import glob
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import Config
+from .exceptions import PdfToJsonError
+
+
+@dataclass
+class BatchResult:
+    """Outcome of extracting one file in a batch."""
+    path: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True when the file was extracted successfully."""
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record written for this file in JSONL output."""
+        if self.ok:
+            return {"path": self.path, "result": self.result}
+        return {"path": self.path, "error": self.error}
+
+
+def find_pdf_paths(target: str) -> List[str]:
+    """
+    Resolve a directory or glob pattern to a sorted list of PDF paths.
+
+    Args:
+        target (str): Directory (searched non-recursively for *.pdf), glob pattern or single file
+
+    Returns:
+        List[str]: Matching file paths
+    """
+    if os.path.isdir(target):
+        return sorted(
+            os.path.join(target, name) for name in os.listdir(target)
+            if name.lower().endswith(".pdf") and os.path.isfile(os.path.join(target, name))
+        )
+    if os.path.isfile(target):
+        return [target]
+    return sorted(p for p in glob.glob(target, recursive = True) if os.path.isfile(p))
+
+
+def _extract_one(pdf_path: str, config: Config) -> BatchResult:
+    """Extract a single file, capturing failures instead of raising."""
+    # Imported here so that the CLI can import this module without loading PyMuPDF
+    from .extractor import PDFStructureExtractor
+
+    try:
+        result = PDFStructureExtractor(config).extract_text_with_structure(pdf_path)
+        return BatchResult(pdf_path, result = result)
+    except PdfToJsonError as e:
+        return BatchResult(pdf_path, error = str(e))
+    except Exception as e:
+        return BatchResult(pdf_path, error = f"Unexpected error: {e}")
+
+
+def _pool_workers(config: Optional[Config], workers: Optional[int]) -> Tuple[int, Config]:
+    """Resolve a pool size (None or 0: one per CPU) and the config its documents are extracted with."""
+    config = copy.copy(config or Config())
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        # Documents already run in parallel, so each one is extracted serially
+        config.WORKERS = 1
+    return workers, config
+
+
+def extract_many(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    config: Optional[Config] = None,
+) -> Iterator[BatchResult]:
+    """
+    Extract many PDFs concurrently, yielding results as they finish.
+
+    A failure in one file is reported on its BatchResult and does not stop the batch.
+
+    Args:
+        paths (Iterable[str]): PDF file paths
+        workers (int, optional): Number of worker processes. Defaults to one per CPU.
+            With 1 worker files are processed in this process, using Config.WORKERS
+            to decode each file's pages in parallel.
+        config (Config, optional): Configuration used for every file
+
+    Yields:
+        BatchResult: One result per input path, in completion order
+    """
+    workers, config = _pool_workers(config, workers)
+    paths = list(paths)
+    if workers <= 1 or len(paths) <= 1:
+        for pdf_path in paths:
+            yield _extract_one(pdf_path, config)
+        return
+
+    # multiprocessing is only loaded once a pool is needed
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers = min(workers, len(paths))) as executor:
+        futures = {executor.submit(_extract_one, pdf_path, config): pdf_path for pdf_path in paths}
+        for future in as_completed(futures):
+            try:
+                item = future.result()
+            except Exception as e:
+                # The worker died or its result could not be sent back
+                item = BatchResult(futures[future], error = f"Worker failed: {e!r}")
+            yield item
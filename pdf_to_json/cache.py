@@ -0,0 +1,252 @@
+"""
+On-disk cache of extraction results keyed by file content and configuration, and an
+in-memory cache of decoded pages keyed by page content.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from .config import Config
+
+# Settings that change how extraction runs but not what it returns
+_NON_OUTPUT_SETTINGS = {
+    "CACHE_DIR", "CACHE_MAX_MB", "CHUNK_SIZE", "DEBUG_MODE", "JSON_BACKEND", "LOG_LEVEL",
+    "MMAP_FILES", "PAGE_CACHE_MB", "PARALLEL_MIN_PAGES", "PROCESS_PAGES_IN_CHUNKS", "SERVE_MAX_QUEUE",
+    "SERVE_MAX_UPLOAD_MB", "SERVE_TIMEOUT", "VECTORIZE", "WORKERS",
+}
+
+_READ_BLOCK_SIZE = 1 << 20
+
+
+def _effective_settings(config: Config) -> Dict[str, Any]:
+    """Return the output-affecting settings of a config, including instance overrides."""
+    settings = {
+        name: getattr(config, name) for name in sorted(dir(config))
+        if name.isupper() and name not in _NON_OUTPUT_SETTINGS
+    }
+    if settings.get("LAYOUT_PROFILE"):
+        # The profile's contents affect the output, not where it is stored
+        try:
+            with open(settings["LAYOUT_PROFILE"], 'rb') as f:
+                settings["LAYOUT_PROFILE"] = hashlib.blake2b(f.read(), digest_size = 16).hexdigest()
+        except OSError:
+            pass
+    return settings
+
+
+@contextlib.contextmanager
+def _atomic_write(path: str) -> Iterator[TextIO]:
+    """
+    Open a text file whose contents replace ``path`` only once the block completes.
+
+    The data goes to a temporary file in the same directory, which is renamed over
+    ``path`` on success and removed on failure, so ``path`` always holds either its
+    previous contents or the complete new ones. A replaced file keeps its permissions;
+    a new one gets the usual permissions under the umask.
+    """
+    tmp_path = f"{path}.{secrets.token_hex(6)}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, 'w', encoding = 'utf-8') as f:
+            with contextlib.suppress(FileNotFoundError):
+                os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+class ResultCache:
+    """
+    Directory of cached extraction results with a total size bound.
+
+    Entries are written atomically (temporary file + rename), so several processes can
+    share one directory without locking: readers see either a complete entry or none.
+    Reads refresh an entry's modification time, and eviction removes the least recently
+    used entries once the directory exceeds ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str): Cache directory, created if missing
+            max_bytes (int): Total size bound; 0 or less disables eviction
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok = True)
+
+    @classmethod
+    def from_config(cls, config: Config) -> Optional["ResultCache"]:
+        """Return the cache configured by Config.CACHE_DIR, or None if caching is disabled."""
+        if not config.CACHE_DIR:
+            return None
+        return cls(config.CACHE_DIR, int(config.CACHE_MAX_MB * 1024 * 1024))
+
+    @staticmethod
+    def key_for(pdf_path: Union[str, bytes, bytearray, memoryview], config: Config,
+                options: Optional[Dict[str, Any]] = None) -> str:
+        """Hash the PDF's bytes (a path is read), the effective configuration, extraction options and the library version."""
+        from . import __version__
+
+        digest = hashlib.blake2b(digest_size = 20)
+        if isinstance(pdf_path, memoryview) and not pdf_path.c_contiguous:
+            # hashlib only accepts contiguous buffers
+            digest.update(pdf_path.tobytes())
+        elif isinstance(pdf_path, (bytes, bytearray, memoryview)):
+            digest.update(pdf_path)
+        else:
+            with open(pdf_path, 'rb') as f:
+                for block in iter(lambda: f.read(_READ_BLOCK_SIZE), b""):
+                    digest.update(block)
+        digest.update(json.dumps(_effective_settings(config), sort_keys = True, default = str).encode())
+        if options:
+            digest.update(json.dumps(options, sort_keys = True, default = str).encode())
+        digest.update(__version__.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Return the entry file path for ``key``."""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding = 'utf-8') as f:
+                result = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result, then evict old entries if the size bound is exceeded."""
+        with _atomic_write(self._path(key)) as f:
+            json.dump(result, f, ensure_ascii = False, separators = (',', ':'))
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in ``max_bytes``."""
+        if self.max_bytes <= 0:
+            return
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except OSError:
+                # Already evicted by a concurrent process
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+# Approximate size of a span record besides its text: the tuple, its bounds and the str
+# header (fonts are pooled and shared between spans)
+_SPAN_OVERHEAD = 200
+
+
+class PageCache:
+    """
+    Process-wide LRU cache of decoded page span tables, bounded in bytes.
+
+    Entries are keyed by a page fingerprint (see incremental.page_fingerprint) and the
+    decode flags, so identical pages in different documents, such as cover pages,
+    templates or legal appendices, are decoded once per process. Sizes are estimated
+    from the span count and text length.
+    """
+
+    _shared: Optional["PageCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Approximate bound on the memory held by cached pages
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[List[tuple], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Config) -> Optional["PageCache"]:
+        """Return the process-wide cache sized by Config.PAGE_CACHE_MB, or None if it is disabled."""
+        max_bytes = int(config.PAGE_CACHE_MB * 1024 * 1024)
+        if max_bytes <= 0:
+            return None
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(max_bytes)
+            elif cls._shared.max_bytes != max_bytes:
+                cls._shared.resize(max_bytes)
+            return cls._shared
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, int]) -> Optional[List[tuple]]:
+        """Return the span table cached under ``key`` and mark it recently used, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Tuple[str, int], spans: List[tuple]) -> None:
+        """Cache a span table, evicting least recently used pages to stay within the bound."""
+        size = sum(_SPAN_OVERHEAD + len(span[1]) for span in spans)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (spans, size)
+            self.size += size
+            self._evict()
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the bound, evicting pages if the cache no longer fits."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop every cached page."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _evict(self) -> None:
+        """Remove least recently used pages until the cache fits; the lock must be held."""
+        while self.size > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last = False)
+            self.size -= size
@@ -3,16 +3,317 @@ Command-line interface for pdf_to_json library.
 """
 
 import argparse
-import json
+import logging
 import os
+import socket
 import sys
 
-from . import extract_pdf_to_dict, extract_pdf_to_json
+from . import extract_incremental, extract_outline, extract_pdf_to_file
+from .batch import extract_many, find_pdf_paths
+from .config import Config
 from .exceptions import PdfToJsonError
+from .output import available_formats, dumps_result
+from .serialization import JSON_BACKENDS, get_dumps, stdlib_dumps
 
 
-def main():
+def add_common_arguments(parser):
+    """Add the cache, layout and serialization options shared by the single-file and batch commands."""
+    parser.add_argument(
+        "--layout",
+        metavar = "FILE",
+        help = "Use the layout profile in FILE (see --save-layout) instead of analyzing each "
+               "document's fonts (default: PDF_TO_JSON_LAYOUT_PROFILE)"
+    )
+
+    parser.add_argument(
+        "--json-backend",
+        choices = JSON_BACKENDS,
+        help = "JSON encoder (default: PDF_TO_JSON_JSON_BACKEND or auto, which uses orjson "
+               "or msgspec when installed)"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help = "Reuse results cached in this directory (default: PDF_TO_JSON_CACHE_DIR)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action = "store_true",
+        help = "Disable the result cache for this run"
+    )
+
+
+def parse_page_spec(spec: str):
+    """
+    Parse a 1-based page specification such as "1-5,8" or "10-" into 0-based pages.
+
+    Args:
+        spec (str): Comma-separated page numbers and ranges; a range may omit its end
+
+    Returns:
+        List[int | slice]: 0-based page numbers and slices, as accepted by the API's pages option
+
+    Raises:
+        argparse.ArgumentTypeError: If the specification is malformed
+    """
+    pages = []
+    try:
+        for part in spec.split(","):
+            start, sep, end = part.strip().partition("-")
+            first = int(start)
+            if first < 1:
+                raise ValueError
+            if not sep:
+                pages.append(first - 1)
+            elif not end.strip():
+                pages.append(slice(first - 1, None))
+            else:
+                last = int(end)
+                if last < first:
+                    raise ValueError
+                pages.append(slice(first - 1, last))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid page specification: '{spec}'") from None
+    return pages
+
+
+def build_config(args) -> Config:
+    """Return a Config reflecting the command-line options."""
+    config = Config()
+    if args.no_cache:
+        config.CACHE_DIR = ''
+    elif args.cache_dir:
+        config.CACHE_DIR = args.cache_dir
+    if args.json_backend:
+        config.JSON_BACKEND = args.json_backend
+    if args.layout:
+        config.LAYOUT_PROFILE = args.layout
+    return config
+
+
+def output_paths(paths, output_dir: str):
+    """
+    Map each input PDF to its JSON file in ``output_dir``.
+
+    Inputs are placed by their path relative to the deepest directory containing them
+    all, so the subdirectories a recursive glob matched are mirrored and files sharing
+    a base name do not overwrite each other.
+
+    Args:
+        paths (List[str]): Input PDF paths
+        output_dir (str): Output directory
+
+    Returns:
+        Dict[str, str]: Output file path per input path
+
+    Raises:
+        ValueError: If two inputs would still be written to the same file
+    """
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    outputs = {}
+    sources = {}
+    for path in paths:
+        relative = os.path.relpath(os.path.abspath(path), root)
+        output = os.path.join(output_dir, os.path.splitext(relative)[0] + ".json")
+        if os.path.normcase(output) in sources:
+            raise ValueError(f"'{path}' and '{sources[os.path.normcase(output)]}' would both be written to '{output}'")
+        sources[os.path.normcase(output)] = path
+        outputs[path] = output
+    return outputs
+
+
+def batch_main(argv):
+    """Entry point for ``pdf_to_json batch``: extract every PDF in a directory or glob."""
+    parser = argparse.ArgumentParser(
+        prog = "pdf_to_json batch",
+        description = "Extract many PDF files concurrently",
+        formatter_class = argparse.RawDescriptionHelpFormatter,
+        epilog = """
+Examples:
+  pdf_to_json batch pdfs/                     # JSONL stream to stdout
+  pdf_to_json batch "pdfs/**/*.pdf" -j 8      # Glob pattern, 8 workers
+  pdf_to_json batch pdfs/ -o out/             # One JSON file per input
+  pdf_to_json batch pdfs/ --jsonl all.jsonl   # Single JSONL file
+        """
+    )
+
+    parser.add_argument(
+        "target",
+        help = "Directory or glob pattern of PDF files"
+    )
+
+    parser.add_argument(
+        "-j", "--workers",
+        type = int,
+        default = None,
+        help = "Number of worker processes (default: one per CPU)"
+    )
+
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "-o", "--output-dir",
+        help = "Write one <name>.json per input into this directory, mirroring the inputs' subdirectories"
+    )
+    output.add_argument(
+        "--jsonl",
+        help = "Write one JSON record per input to this file ('-' for stdout, the default)"
+    )
+
+    parser.add_argument(
+        "--compact",
+        action = "store_true",
+        help = "Compact JSON output in --output-dir mode (no indentation)"
+    )
+
+    add_common_arguments(parser)
+
+    args = parser.parse_args(argv)
+    config = build_config(args)
+    try:
+        dumps = get_dumps(config.JSON_BACKEND)
+    except ValueError as e:
+        print(f"Error: {e}", file = sys.stderr)
+        sys.exit(1)
+
+    paths = find_pdf_paths(args.target)
+    if not paths:
+        print(f"Error: no PDF files match '{args.target}'", file = sys.stderr)
+        sys.exit(1)
+
+    if args.output_dir:
+        try:
+            outputs = output_paths(paths, args.output_dir)
+        except ValueError as e:
+            print(f"Error: {e}", file = sys.stderr)
+            sys.exit(1)
+        os.makedirs(args.output_dir, exist_ok = True)
+        stream = None
+    elif args.jsonl and args.jsonl != "-":
+        stream = open(args.jsonl, 'w', encoding = 'utf-8')
+    else:
+        stream = sys.stdout
+
+    failures = 0
+    try:
+        for item in extract_many(paths, workers = args.workers, config = config):
+            if not item.ok:
+                failures += 1
+                print(f"Error: {item.path}: {item.error}", file = sys.stderr)
+            if stream is not None:
+                if item.ok:
+                    record = '{"path":' + stdlib_dumps(item.path) + ',"result":' + dumps_result(item.result, None, dumps) + '}'
+                else:
+                    record = stdlib_dumps(item.to_dict())
+                stream.write(record + "\n")
+                stream.flush()
+            elif item.ok:
+                output = outputs[item.path]
+                os.makedirs(os.path.dirname(output), exist_ok = True)
+                with open(output, 'w', encoding = 'utf-8') as f:
+                    f.write(dumps_result(item.result, None if args.compact else 2, dumps))
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+
+    print(f"Processed {len(paths)} file(s), {failures} failed", file = sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+def serve_main(argv):
+    """Entry point for ``pdf_to_json serve``: run the extraction service."""
+    parser = argparse.ArgumentParser(
+        prog = "pdf_to_json serve",
+        description = "Serve extraction requests from a pool of warm worker processes",
+        formatter_class = argparse.RawDescriptionHelpFormatter,
+        epilog = """
+Examples:
+  pdf_to_json serve -j 4                          # http://127.0.0.1:8765
+  pdf_to_json serve --socket /tmp/pdf_to_json.sock
+  curl -s localhost:8765/extract -H 'Content-Type: application/json' -d '{"path": "doc.pdf"}'
+  curl -s 'localhost:8765/extract?pages=1-3' --data-binary @doc.pdf
+        """
+    )
+
+    parser.add_argument(
+        "--host",
+        default = "127.0.0.1",
+        help = "Interface to listen on (default: 127.0.0.1); requests may name any readable path, "
+               "so do not expose the service beyond trusted clients"
+    )
+
+    parser.add_argument(
+        "--port",
+        type = int,
+        default = 8765,
+        help = "TCP port (default: 8765)"
+    )
+
+    parser.add_argument(
+        "--socket",
+        help = "Listen on this Unix socket instead of TCP"
+    )
+
+    parser.add_argument(
+        "-j", "--workers",
+        type = int,
+        default = None,
+        help = "Number of worker processes (default: one per CPU)"
+    )
+
+    parser.add_argument(
+        "--max-queue",
+        type = int,
+        help = "Requests allowed to wait for a busy worker; more are refused with 503 "
+               "(default: PDF_TO_JSON_SERVE_MAX_QUEUE)"
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type = float,
+        help = "Seconds allowed per request, including queueing; slower requests get 504 "
+               "(default: PDF_TO_JSON_SERVE_TIMEOUT)"
+    )
+
+    add_common_arguments(parser)
+
+    args = parser.parse_args(argv)
+    config = build_config(args)
+    if args.max_queue is not None:
+        config.SERVE_MAX_QUEUE = args.max_queue
+    if args.timeout is not None:
+        config.SERVE_TIMEOUT = args.timeout
+    try:
+        get_dumps(config.JSON_BACKEND)
+    except ValueError as e:
+        print(f"Error: {e}", file = sys.stderr)
+        sys.exit(1)
+
+    if args.socket and not hasattr(socket, "AF_UNIX"):
+        parser.error("--socket needs Unix domain sockets, which this platform lacks; use --host/--port")
+
+    from .server import serve
+    try:
+        serve(config, host = args.host, port = args.port, socket_path = args.socket, workers = args.workers)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file = sys.stderr)
+        sys.exit(1)
+
+
+def main(argv = None):
     """Main CLI entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+    # Logging is configured by the application; importing the library leaves it alone
+    logging.basicConfig(level = getattr(logging, Config.LOG_LEVEL))
+    if argv and argv[0] == "batch":
+        batch_main(argv[1:])
+        return
+    if argv and argv[0] == "serve":
+        serve_main(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Extract structured content from PDF files and output as JSON",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -22,12 +323,21 @@ Examples:
   pdf_to_json document.pdf -o output.json    # Save to file
   pdf_to_json document.pdf --pretty          # Pretty print JSON
   pdf_to_json document.pdf --compact         # Compact JSON output
+  pdf_to_json document.pdf -f jsonl          # One section per line
+  pdf_to_json document.pdf --pages 1-5,8     # Only pages 1 to 5 and 8
+  pdf_to_json document.pdf --max-sections 3  # Stop after three sections
+  pdf_to_json document.pdf --outline         # Title and headings only
+  pdf_to_json document.pdf -o out.json --index out.index  # Re-decode changed pages only
+  pdf_to_json template.pdf --save-layout t.layout  # Save the template's layout profile
+  pdf_to_json report.pdf --layout t.layout   # Skip font analysis for that template
+  pdf_to_json batch pdfs/ -o out/            # Extract a directory of PDFs
+  pdf_to_json serve -j 4                     # Extraction service on localhost:8765
         """
     )
 
     parser.add_argument(
         "pdf_path",
-        help = "Path to the PDF file to process"
+        help = "Path to the PDF file to process ('-' reads it from standard input)"
     )
 
     parser.add_argument(
@@ -35,16 +345,60 @@ Examples:
         help = "Output file path (default: stdout)"
     )
 
+    parser.add_argument(
+        "-f", "--format",
+        choices = available_formats(),
+        default = None,
+        help = "Output format (default: pretty)"
+    )
+
     parser.add_argument(
         "--pretty",
         action = "store_true",
-        help = "Pretty print JSON output (default: True)"
+        help = "Pretty print JSON output, same as --format pretty (default)"
     )
 
     parser.add_argument(
         "--compact",
         action = "store_true",
-        help = "Compact JSON output (no indentation)"
+        help = "Compact JSON output (no indentation), same as --format compact"
+    )
+
+    parser.add_argument(
+        "--pages",
+        type = parse_page_spec,
+        help = "Pages to extract, 1-based, e.g. '1-5,8' or '10-' (default: all pages)"
+    )
+
+    parser.add_argument(
+        "--max-sections",
+        type = int,
+        help = "Stop after this many sections; later pages are not read"
+    )
+
+    parser.add_argument(
+        "--stop-after-heading",
+        metavar = "TEXT",
+        help = "Stop after the first heading containing TEXT (case-insensitive)"
+    )
+
+    parser.add_argument(
+        "--outline",
+        action = "store_true",
+        help = "Output only the title and heading outline, from the PDF's bookmarks when present"
+    )
+
+    parser.add_argument(
+        "--index",
+        metavar = "FILE",
+        help = "Page index for incremental extraction: pages unchanged since the run that wrote FILE are not decoded again"
+    )
+
+    parser.add_argument(
+        "--save-layout",
+        metavar = "FILE",
+        help = "Save the document's layout profile (font histogram and heading levels) to FILE "
+               "instead of extracting it"
     )
 
     parser.add_argument(
@@ -53,42 +407,59 @@ Examples:
         version = "pdf_to_json 1.0.0"
     )
 
-    args = parser.parse_args()
+    add_common_arguments(parser)
+
+    args = parser.parse_args(argv)
+    config = build_config(args)
+    output_format = args.format or ("compact" if args.compact else "pretty")
+    options = {
+        name: value for name, value in (
+            ("pages", args.pages),
+            ("max_sections", args.max_sections),
+            ("stop_after_heading", args.stop_after_heading),
+        ) if value is not None
+    }
 
     # Validate input file
-    if not os.path.exists(args.pdf_path):
+    if args.pdf_path != "-" and not os.path.exists(args.pdf_path):
         print(f"Error: PDF file '{args.pdf_path}' not found", file = sys.stderr)
         sys.exit(1)
+    source = sys.stdin.buffer if args.pdf_path == "-" else args.pdf_path
 
-    try:
-        # Extract PDF content
-        if args.output:
-            # Save to file
-            result = extract_pdf_to_dict(args.pdf_path)
-
-            # Format JSON
-            if args.compact:
-                json_str = json.dumps(result, ensure_ascii = False, separators = (',', ':'))
-            else:
-                json_str = json.dumps(result, ensure_ascii = False, indent = 2)
+    if args.outline and (output_format == "jsonl" or options):
+        parser.error("--outline supports only the pretty and compact formats and no page or stop options")
+    if args.index and (output_format == "jsonl" or options or args.outline):
+        parser.error("--index supports only the pretty and compact formats and no page, stop or outline options")
 
-            with open(args.output, 'w', encoding = 'utf-8') as f:
-                f.write(json_str)
+    try:
+        if args.save_layout:
+            from . import PDFStructureExtractor
 
+            PDFStructureExtractor(config).extract_layout_profile(source, args.pages).save(args.save_layout)
+            print(f"Successfully saved layout profile to '{args.save_layout}'")
+        elif args.outline or args.index:
+            dumps = get_dumps(config.JSON_BACKEND)
+            if args.outline:
+                result, what = extract_outline(source, config = config), "outline"
+            else:
+                result, what = extract_incremental(source, args.index, config = config), "content"
+            text = dumps_result(result, None if output_format == "compact" else 2, dumps)
+            if args.output:
+                with open(args.output, 'w', encoding = 'utf-8') as f:
+                    f.write(text)
+                print(f"Successfully extracted PDF {what} to '{args.output}'")
+            else:
+                print(text)
+        # Extract once; the writer serializes sections as they are produced
+        elif args.output:
+            extract_pdf_to_file(source, args.output, output_format, config = config, **options)
             print(f"Successfully extracted PDF content to '{args.output}'")
         else:
-            # Output to stdout
-            if args.compact:
-                json_str = extract_pdf_to_json(args.pdf_path)
-                # Remove indentation for compact output
-                result = extract_pdf_to_dict(args.pdf_path)
-                json_str = json.dumps(result, ensure_ascii = False, separators = (',', ':'))
-            else:
-                json_str = extract_pdf_to_json(args.pdf_path)
-
-            print(json_str)
+            extract_pdf_to_file(source, sys.stdout, output_format, config = config, **options)
+            if output_format != "jsonl":
+                sys.stdout.write("\n")
 
-    except PdfToJsonError as e:
+    except (PdfToJsonError, ValueError) as e:
         print(f"Error: {e}", file = sys.stderr)
         sys.exit(1)
     except Exception as e:
@@ -14,6 +14,13 @@ class Config:
     MAX_PAGES_FOR_FONT_ANALYSIS = int(os.getenv('PDF_TO_JSON_MAX_PAGES_FOR_FONT_ANALYSIS', '10'))
     FONT_SIZE_PRECISION = float(os.getenv('PDF_TO_JSON_FONT_SIZE_PRECISION', '0.1'))
     MIN_HEADING_FREQUENCY = float(os.getenv('PDF_TO_JSON_MIN_HEADING_FREQUENCY', '0.001'))
+    # Pages used for the font histogram: "first" MAX_PAGES_FOR_FONT_ANALYSIS pages,
+    # "stratified" (that many pages spread over the document) or "full" (every page,
+    # counted during the single extraction pass)
+    FONT_SAMPLING = os.getenv('PDF_TO_JSON_FONT_SAMPLING', 'first')
+    # Saved layout profile (font histogram and heading levels) to use instead of
+    # analyzing each document's fonts; empty analyzes every document
+    LAYOUT_PROFILE = os.getenv('PDF_TO_JSON_LAYOUT_PROFILE', '')
 
     # Text processing settings
     MIN_TEXT_LENGTH = int(os.getenv('PDF_TO_JSON_MIN_TEXT_LENGTH', '3'))
@@ -28,6 +35,40 @@ class Config:
     PROCESS_PAGES_IN_CHUNKS = bool(os.getenv('PDF_TO_JSON_PROCESS_PAGES_IN_CHUNKS', 'False').lower() == 'true')
     CHUNK_SIZE = int(os.getenv('PDF_TO_JSON_CHUNK_SIZE', '10'))
 
+    # Page decoding: "text" (text blocks only, the default) or "dict" (PyMuPDF's full
+    # dict output, including image blocks)
+    TEXT_EXTRACTION = os.getenv('PDF_TO_JSON_TEXT_EXTRACTION', 'text')
+
+    # Read files on disk through a read-only memory map instead of buffered reads
+    MMAP_FILES = bool(os.getenv('PDF_TO_JSON_MMAP_FILES', 'True').lower() == 'true')
+
+    # Parallel extraction (WORKERS = 1 keeps extraction serial, 0 uses one worker per CPU)
+    WORKERS = int(os.getenv('PDF_TO_JSON_WORKERS', '1'))
+    PARALLEL_MIN_PAGES = int(os.getenv('PDF_TO_JSON_PARALLEL_MIN_PAGES', '50'))
+
+    # Vectorized line processing (uses NumPy when installed; output is identical either way)
+    VECTORIZE = bool(os.getenv('PDF_TO_JSON_VECTORIZE', 'True').lower() == 'true')
+
+    # Result cache (disabled when CACHE_DIR is empty)
+    CACHE_DIR = os.getenv('PDF_TO_JSON_CACHE_DIR', '')
+    CACHE_MAX_MB = float(os.getenv('PDF_TO_JSON_CACHE_MAX_MB', '512'))
+
+    # In-memory cache of decoded pages shared by documents processed in the same process,
+    # keyed by page content (0 disables it)
+    PAGE_CACHE_MB = float(os.getenv('PDF_TO_JSON_PAGE_CACHE_MB', '0'))
+
+    # Extraction service (pdf_to_json serve): per-request timeout in seconds, requests
+    # allowed to wait for a busy worker before new ones are refused, upload size limit
+    SERVE_TIMEOUT = float(os.getenv('PDF_TO_JSON_SERVE_TIMEOUT', '60'))
+    SERVE_MAX_QUEUE = int(os.getenv('PDF_TO_JSON_SERVE_MAX_QUEUE', '32'))
+    SERVE_MAX_UPLOAD_MB = float(os.getenv('PDF_TO_JSON_SERVE_MAX_UPLOAD_MB', '100'))
+
+    # JSON encoding backend: auto (orjson or msgspec when installed), json, orjson, msgspec
+    JSON_BACKEND = os.getenv('PDF_TO_JSON_JSON_BACKEND', 'auto')
+
+    # Record per-stage timings, per-page decode times and counters in stats["profile"]
+    PROFILE = bool(os.getenv('PDF_TO_JSON_PROFILE', 'False').lower() == 'true')
+
     # Debug settings
     DEBUG_MODE = bool(os.getenv('PDF_TO_JSON_DEBUG_MODE', 'False').lower() == 'true')
     LOG_LEVEL = os.getenv('PDF_TO_JSON_LOG_LEVEL', 'INFO')
@@ -39,6 +80,8 @@ class Config:
             'max_pages_for_font_analysis': cls.MAX_PAGES_FOR_FONT_ANALYSIS,
             'font_size_precision': cls.FONT_SIZE_PRECISION,
             'min_heading_frequency': cls.MIN_HEADING_FREQUENCY,
+            'font_sampling': cls.FONT_SAMPLING,
+            'layout_profile': cls.LAYOUT_PROFILE,
             'min_text_length': cls.MIN_TEXT_LENGTH,
             'max_heading_levels': cls.MAX_HEADING_LEVELS,
             'combine_consecutive_text': cls.COMBINE_CONSECUTIVE_TEXT,
@@ -46,6 +89,19 @@ class Config:
             'default_encoding': cls.DEFAULT_ENCODING,
             'process_pages_in_chunks': cls.PROCESS_PAGES_IN_CHUNKS,
             'chunk_size': cls.CHUNK_SIZE,
+            'text_extraction': cls.TEXT_EXTRACTION,
+            'mmap_files': cls.MMAP_FILES,
+            'workers': cls.WORKERS,
+            'parallel_min_pages': cls.PARALLEL_MIN_PAGES,
+            'vectorize': cls.VECTORIZE,
+            'cache_dir': cls.CACHE_DIR,
+            'cache_max_mb': cls.CACHE_MAX_MB,
+            'page_cache_mb': cls.PAGE_CACHE_MB,
+            'serve_timeout': cls.SERVE_TIMEOUT,
+            'serve_max_queue': cls.SERVE_MAX_QUEUE,
+            'serve_max_upload_mb': cls.SERVE_MAX_UPLOAD_MB,
+            'json_backend': cls.JSON_BACKEND,
+            'profile': cls.PROFILE,
             'debug_mode': cls.DEBUG_MODE,
             'log_level': cls.LOG_LEVEL
         }
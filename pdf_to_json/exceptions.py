@@ -8,8 +8,17 @@ class PdfToJsonError(Exception):
 class PDFProcessingError(PdfToJsonError):
     """Raised when PDF processing fails."""
 
+class PageRangeError(PDFProcessingError):
+    """Raised when a page selection names a page the document does not have."""
+
 class InvalidPDFError(PdfToJsonError):
     """Raised when the PDF file is invalid or corrupted."""
 
 class PDFFileNotFoundError(PdfToJsonError):
     """Raised when the PDF file is not found."""
+
+class ServerBusyError(PdfToJsonError):
+    """Raised when the extraction service has no room to queue another request."""
+
+class ExtractionTimeoutError(PdfToJsonError):
+    """Raised when an extraction request exceeds its time limit."""
@@ -2,36 +2,176 @@
 PDF structure extractor with layout-aware text extraction.
 """
 
+import contextlib
+import functools
 import logging
 import os
+import sys
 import time
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
 
 import pymupdf as fitz  # PyMuPDF
 
+from .cache import PageCache, ResultCache
 from .config import Config
-from .exceptions import InvalidPDFError, PDFFileNotFoundError, PDFProcessingError
+from .exceptions import InvalidPDFError, PageRangeError, PDFProcessingError, PdfToJsonError
+from .incremental import PageIndex, PageRecord, page_fingerprint, settings_key
+from .instrumentation import Profiler, has_hooks, notify_hooks
+from .layout import LayoutProfile, assign_heading_levels
+from .lines import LineStore
+from .sources import PDFInput, check_input, close_document, describe, is_path, open_document
 
-# Configure logging
-logging.basicConfig(level = getattr(logging, Config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
-@dataclass
-class FontInfo:
-    """Font information for text spans."""
+# Title of documents (or page selections) without text
+DEFAULT_TITLE = "Untitled Document"
+
+# 0-based page numbers and slices of pages, or a single slice
+PageSelection = Union[slice, Iterable[Union[int, slice]]]
+
+# Stage context used when profiling is off
+_NO_STAGE = contextlib.nullcontext()
+
+# page.get_text("dict") flags for each Config.TEXT_EXTRACTION mode. "text" leaves out
+# image blocks, which the extractor never reads but MuPDF would otherwise decode.
+TEXT_EXTRACTION_FLAGS = {
+    "dict": fitz.TEXTFLAGS_DICT,
+    "text": fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES,
+}
+
+class FontInfo(NamedTuple):
+    """Font of a text span; pooled, so spans set in the same font share one instance (see font_info)."""
     size: float
     name: str
     flags: int
+    # Size rounded to 0.1 pt, as in font histograms and line font sizes
+    rounded: float
 
-@dataclass
-class TextSpan:
-    """Text span with font and layout information."""
+class TextSpan(NamedTuple):
+    """One non-blank span of a decoded page. top/bottom are None when the span carries no bbox."""
+    line: int  # Line number within the page
     text: str
-    font_info: FontInfo
-    bbox: tuple
-    level: Optional[str] = None
+    font: FontInfo
+    top: Optional[float]
+    bottom: Optional[float]
+
+# Rounded font sizes shared by all FontInfo instances
+_ROUNDED_SIZES: Dict[float, float] = {}
+
+@functools.lru_cache(maxsize = 4096)
+def font_info(size: float, name: str, flags: int) -> FontInfo:
+    """Return the pooled FontInfo of a font, with its name and rounded size interned."""
+    rounded = round(size, 1)
+    return FontInfo(size, sys.intern(name), flags, _ROUNDED_SIZES.setdefault(rounded, rounded))
+
+class DocumentStream:
+    """
+    Incremental view of one extraction.
+
+    ``title``, ``font_histogram`` and ``heading_levels`` are available as soon as the
+    stream is opened. ``sections`` is a one-shot iterator producing sections as pages
+    are parsed, and ``stats`` is filled in once it has been exhausted. Output fields
+    use the same (string-keyed) form as extract_text_with_structure.
+    """
+
+    def __init__(self, title: str, font_histogram: Dict[str, int], heading_levels: Dict[str, str],
+                 sections: Iterable[Dict[str, Any]], page_count: int, start_time: float,
+                 on_close: Optional[Callable[[], None]] = None, pages_processed: Optional[Set[int]] = None,
+                 profiler: Optional[Profiler] = None, on_stats: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 page_cache_counts: Optional[Dict[str, int]] = None):
+        self.title = title
+        self.font_histogram = font_histogram
+        self.heading_levels = heading_levels
+        self.stats: Optional[Dict[str, Any]] = None
+        self._source = sections
+        self._page_count = page_count
+        self._start_time = start_time
+        self._on_close = on_close
+        self._pages_processed = pages_processed if pages_processed is not None else set()
+        self._profiler = profiler
+        self._on_stats = on_stats
+        self._page_cache_counts = page_cache_counts
+        self.sections: Iterator[Dict[str, Any]] = self._count_sections()
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "DocumentStream":
+        """Replay an already extracted result as a stream."""
+        stream = cls(result["title"], result["font_histogram"], result["heading_levels"],
+                     result["sections"], result["stats"]["page_count"], time.time())
+        stream.sections = iter(result["sections"])
+        stream.stats = result["stats"]
+        return stream
+
+    def _count_sections(self) -> Iterator[Dict[str, Any]]:
+        """Pass sections through while counting them, then record the stats."""
+        num_sections = num_headings = num_paragraphs = 0
+        profiler = self._profiler
+        if profiler is None:
+            for section in self._source:
+                num_sections += 1
+                if section.get("level", "").startswith("H"):
+                    num_headings += 1
+                num_paragraphs += len(section.get("paragraphs", []))
+                yield section
+        else:
+            # Time between sections is spent by the consumer, e.g. a writer serializing them
+            profiler.switch("sectioning")
+            for section in self._source:
+                num_sections += 1
+                if section.get("level", "").startswith("H"):
+                    num_headings += 1
+                num_paragraphs += len(section.get("paragraphs", []))
+                profiler.switch("output")
+                yield section
+                profiler.switch("sectioning")
+            profiler.switch(None)
+
+        processing_time = time.time() - self._start_time
+        logger.info(f"Processing completed in {processing_time:.2f} seconds")
+
+        self.stats = {
+            "page_count": self._page_count,
+            "pages_processed": sorted(self._pages_processed),
+            "processing_time": processing_time,
+            "num_sections": num_sections,
+            "num_headings": num_headings,
+            "num_paragraphs": num_paragraphs
+        }
+        if self._page_cache_counts is not None:
+            self.stats["page_cache"] = dict(self._page_cache_counts)
+        if profiler is not None:
+            self.stats["profile"] = profiler.to_dict()
+        if self._on_stats is not None:
+            self._on_stats(self.stats)
+
+    def close(self) -> None:
+        """Stop extraction early and release the document."""
+        close = getattr(self._source, "close", None)
+        if close is not None:
+            close()
+        if self._on_close is not None:
+            self._on_close()
+
+    def __enter__(self) -> "DocumentStream":
+        """Return the stream itself for use in a with-statement."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the stream."""
+        self.close()
+
+    def to_dict(self, sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assemble the full result once ``sections`` has been collected from the stream."""
+        return {
+            "title": self.title,
+            "sections": sections,
+            "font_histogram": self.font_histogram,
+            "heading_levels": self.heading_levels,
+            "stats": self.stats
+        }
+
 
 class PDFStructureExtractor:
     """
@@ -49,230 +189,885 @@ class PDFStructureExtractor:
         self.config = config or Config()
         self.font_size_histogram = defaultdict(int)
         self.heading_levels = {}
+        self._span_doc: Optional[fitz.Document] = None
+        self._span_tables: Dict[int, List[TextSpan]] = {}
+        self._font_digests: Dict[int, bytes] = {}
+        self._pages_processed: Set[int] = set()
+        self._profiler: Optional[Profiler] = None
+        self._page_cache = PageCache.from_config(self.config)
+        self._page_cache_counts: Optional[Dict[str, int]] = None
+        self._reset_page_cache_counts()
+
+    def _reset_page_cache_counts(self) -> None:
+        """Start counting page cache hits and misses for a new extraction."""
+        self._page_cache_counts = {"hits": 0, "misses": 0} if self._page_cache is not None else None
+
+    def _stage(self, stage: str):
+        """Charge the enclosed work to ``stage`` when profiling; a no-op otherwise."""
+        profiler = self._profiler
+        return _NO_STAGE if profiler is None else profiler.stage(stage)
+
+    def analyze_font_sizes(self, doc: fitz.Document,
+                           pages: Optional[Sequence[int]] = None) -> tuple[Dict[float, int], Dict[float, str]]:
+        """
+        Analyze font sizes across the document to determine heading levels.
+
+        Up to Config.MAX_PAGES_FOR_FONT_ANALYSIS pages are sampled from ``pages`` (all
+        pages by default), chosen by Config.FONT_SAMPLING: the first pages ("first"),
+        or pages spread evenly over the selection ("stratified"). "full" samples every
+        page; extraction itself handles that mode in a single pass instead.
+        """
+        if pages is None:
+            pages = range(len(doc))
 
-    def analyze_font_sizes(self, doc: fitz.Document) -> tuple[Dict[float, int], Dict[float, str]]:
-        """Analyze font sizes across the document to determine heading levels."""
         font_histogram = defaultdict(int)
-        total_chars = 0
+        for page_num in self._sample_pages(pages):
+            self._count_font_sizes(self._page_spans(doc, page_num), font_histogram)
 
-        max_pages = min(len(doc), self.config.MAX_PAGES_FOR_FONT_ANALYSIS)
+        return font_histogram, self._assign_heading_levels(font_histogram)
 
-        for page_num in range(max_pages):
-            blocks = doc[page_num].get_text("dict").get("blocks", [])
-            for block in blocks:
-                lines = block.get("lines")
-                if not lines:
-                    continue
-                for line in lines:
-                    for span in line.get("spans", []):
-                        text = span.get("text", "")
-                        if not text or not text.strip():
-                            continue
-                        size = span.get("size", 0)
-                        font_size = round(float(size), 1)
-                        char_count = len(text)
-                        font_histogram[font_size] += char_count
-                        total_chars += char_count
-
-        # Determine heading levels based on frequency and size
-        heading_levels = {}
-        if font_histogram:
-            sorted_fonts_desc = sorted(font_histogram.items(), key=lambda x: x[0], reverse=True)
-            main_font_size = max(font_histogram.items(), key=lambda x: x[1])[0]
-            level_index = 1
-            for font_size, count in sorted_fonts_desc:
-                if font_size > main_font_size and count > total_chars * self.config.MIN_HEADING_FREQUENCY:
-                    heading_levels[font_size] = f"H{min(level_index, self.config.MAX_HEADING_LEVELS)}"
-                    level_index += 1
-
-        return font_histogram, heading_levels
-
-    def _iter_lines(self, doc: fitz.Document):
-        """Yield lines with their concatenated text, max font size, and y-position bounds."""
-        for page_num in range(len(doc)):
-            blocks = doc[page_num].get_text("dict").get("blocks", [])
-            for block in blocks:
-                lines = block.get("lines")
-                if not lines:
-                    continue
-                for line in lines:
-                    text_parts: List[str] = []
-                    max_size = 0.0
-                    top_y = None
-                    bottom_y = None
-                    for span in line.get("spans", []):
-                        text = span.get("text", "")
-                        if not text or not text.strip():
-                            continue
-                        text_parts.append(text)
-                        size = float(span.get("size", 0.0))
-                        if size > max_size:
-                            max_size = size
-                        bbox = span.get("bbox")
-                        if bbox:
-                            span_top, span_bottom = bbox[1], bbox[3]
-                            top_y = span_top if top_y is None else min(top_y, span_top)
-                            bottom_y = span_bottom if bottom_y is None else max(bottom_y, span_bottom)
-                    if not text_parts:
+    def _sample_pages(self, pages: Sequence[int]) -> Sequence[int]:
+        """Return the pages sampled for font analysis under Config.FONT_SAMPLING."""
+        limit = self.config.MAX_PAGES_FOR_FONT_ANALYSIS
+        sampling = self.config.FONT_SAMPLING
+        if sampling == "first":
+            return pages[:limit]
+        if sampling == "stratified":
+            if len(pages) <= limit:
+                return pages
+            if limit <= 1:
+                return pages[:limit]
+            step = (len(pages) - 1) / (limit - 1)
+            return [pages[round(i * step)] for i in range(limit)]
+        if sampling == "full":
+            return pages
+        raise ValueError(f"Unknown font sampling mode: {sampling} (choose from first, stratified, full)")
+
+    @staticmethod
+    def _count_font_sizes(spans: List[TextSpan], font_histogram: Dict[float, int]) -> None:
+        """Add the character count of each span to the histogram bucket of its rounded font size."""
+        for span in spans:
+            font_histogram[span.font.rounded] += len(span.text)
+
+    def _assign_heading_levels(self, font_histogram: Dict[float, int]) -> Dict[float, str]:
+        """Map font sizes larger than the body size, and frequent enough, to heading levels."""
+        return assign_heading_levels(font_histogram, self.config.MIN_HEADING_FREQUENCY,
+                                     self.config.MAX_HEADING_LEVELS)
+
+    def _template_layout(self) -> Optional[LayoutProfile]:
+        """Return the layout profile named by Config.LAYOUT_PROFILE, or None when font analysis should run."""
+        path = self.config.LAYOUT_PROFILE
+        return LayoutProfile.load(path) if path else None
+
+    def extract_layout_profile(self, pdf_path: PDFInput, pages: Optional[PageSelection] = None) -> LayoutProfile:
+        """
+        Run font analysis only and return the document's layout profile.
+
+        Save the profile and name it in Config.LAYOUT_PROFILE to extract other documents
+        made from the same template without their own font analysis.
+
+        Args:
+            pdf_path (PDFInput): Path to the PDF file, or its contents as bytes, bytearray,
+                memoryview or a binary file object
+            pages (Iterable[int | slice] or slice, optional): 0-based pages to sample from
+
+        Returns:
+            LayoutProfile: Sampled font histogram and heading levels
+
+        Raises:
+            PDFFileNotFoundError: If PDF file doesn't exist
+            TypeError: If ``pdf_path`` is not a supported input
+            InvalidPDFError: If PDF file is corrupted
+            PDFProcessingError: If processing fails
+        """
+        check_input(pdf_path)
+        doc = None
+        try:
+            doc = open_document(pdf_path, self.config.MMAP_FILES)
+            font_histogram, _ = self.analyze_font_sizes(doc, self._select_pages(len(doc), pages))
+        except Exception as e:
+            raise self._wrap_error(e)
+        finally:
+            if doc is not None:
+                self._close_document(doc)
+        return LayoutProfile.from_histogram(font_histogram, self.config.MIN_HEADING_FREQUENCY,
+                                            self.config.MAX_HEADING_LEVELS)
+
+    def _collect_lines(self, doc: fitz.Document,
+                       pages: Sequence[int]) -> Tuple[Dict[float, int], Dict[float, str], List[LineStore]]:
+        """
+        Decode every page once, building the font histogram along the way ("full" sampling).
+
+        Heading levels are then derived from the complete histogram and applied to the
+        collected line stores, so no page is decoded twice.
+        """
+        font_histogram = defaultdict(int)
+        stores = list(self._iter_lines(doc, pages, font_histogram))
+        return font_histogram, self._assign_heading_levels(font_histogram), stores
+
+    def _text_flags(self) -> int:
+        """Return the get_text flags for Config.TEXT_EXTRACTION."""
+        try:
+            return TEXT_EXTRACTION_FLAGS[self.config.TEXT_EXTRACTION]
+        except KeyError:
+            raise ValueError(f"Unknown text extraction mode: {self.config.TEXT_EXTRACTION} "
+                             f"(choose from {', '.join(TEXT_EXTRACTION_FLAGS)})") from None
+
+    def _parse_page(self, page: fitz.Page) -> List[TextSpan]:
+        """Decode a page once into a flat table of non-blank spans."""
+        spans: List[TextSpan] = []
+        line_no = 0
+        for block in page.get_text("dict", flags = self._text_flags()).get("blocks", []):
+            lines = block.get("lines")
+            if not lines:
+                continue
+            for line in lines:
+                for span in line.get("spans", []):
+                    text = span.get("text", "")
+                    if not text or not text.strip():
                         continue
-                    yield {
-                        "page": page_num,
-                        "text": "".join(text_parts).strip(),
-                        "font_size": round(max_size, 1),
-                        "top": top_y,
-                        "bottom": bottom_y,
-                    }
+                    bbox = span.get("bbox")
+                    top, bottom = (bbox[1], bbox[3]) if bbox else (None, None)
+                    font = font_info(float(span.get("size", 0.0)), span.get("font", ""), span.get("flags", 0))
+                    spans.append(TextSpan(line_no, text, font, top, bottom))
+                line_no += 1
+        return spans
+
+    def _page_spans(self, doc: fitz.Document, page_num: int, keep: bool = True) -> List[TextSpan]:
+        """
+        Return the span table of a page, decoding it at most once per document.
+
+        Tables requested with ``keep=True`` (font analysis, title detection) are retained
+        so that the line pass can reuse them; the line pass takes them with ``keep=False``,
+        which releases each table as soon as it has been consumed.
+        """
+        if self._span_doc is not doc:
+            self._span_doc = doc
+            self._span_tables = {}
+            self._font_digests = {}
+        table = self._span_tables.get(page_num) if keep else self._span_tables.pop(page_num, None)
+        if table is None:
+            profiler = self._profiler
+            if profiler is None:
+                table = self._decode_page(doc, page_num)
+            else:
+                previous = profiler.switch("page_decode")
+                table = self._decode_page(doc, page_num)
+                profiler.switch(previous)
+            self._pages_processed.add(page_num)
+            if keep:
+                self._span_tables[page_num] = table
+        return table
+
+    def _decode_page(self, doc: fitz.Document, page_num: int) -> List[TextSpan]:
+        """Decode the span table of a page, or take it from the page cache when an identical page was decoded before."""
+        cache = self._page_cache
+        if cache is not None:
+            key = (page_fingerprint(doc, page_num, self._font_digests), self._text_flags())
+            table = cache.get(key)
+            if table is not None:
+                self._page_cache_counts["hits"] += 1
+                return table
+            self._page_cache_counts["misses"] += 1
+        profiler = self._profiler
+        start = time.perf_counter() if profiler is not None else 0.0
+        table = self._parse_page(doc[page_num])
+        if profiler is not None:
+            profiler.record_page(page_num, time.perf_counter() - start, len(table))
+        if cache is not None:
+            cache.put(key, table)
+        return table
+
+    def _release_spans(self) -> None:
+        """Drop span tables and the document reference held for reuse."""
+        self._span_doc = None
+        self._span_tables = {}
+        self._font_digests = {}
+
+    @staticmethod
+    def _page_lines(page_num: int, spans: List[TextSpan]) -> LineStore:
+        """Build the line store (text, max font size, y-position bounds) of a page from its span table."""
+        texts: List[str] = []
+        font_sizes: List[float] = []
+        tops: List[Optional[float]] = []
+        bottoms: List[Optional[float]] = []
+        end = len(spans)
+        i = 0
+        while i < end:
+            line_no = spans[i][0]
+            text_parts: List[str] = []
+            max_size = max_rounded = 0.0
+            top_y = None
+            bottom_y = None
+            while i < end and spans[i][0] == line_no:
+                _, text, font, span_top, span_bottom = spans[i]
+                text_parts.append(text)
+                if font.size > max_size:
+                    max_size, max_rounded = font.size, font.rounded
+                if span_top is not None:
+                    top_y = span_top if top_y is None else min(top_y, span_top)
+                    bottom_y = span_bottom if bottom_y is None else max(bottom_y, span_bottom)
+                i += 1
+            texts.append("".join(text_parts).strip())
+            font_sizes.append(max_rounded)
+            tops.append(top_y)
+            bottoms.append(bottom_y)
+        return LineStore.from_columns([page_num] * len(texts), texts, font_sizes, tops, bottoms)
+
+    def _worker_count(self, page_count: int) -> int:
+        """Return how many worker processes to use for a document of ``page_count`` pages."""
+        workers = self.config.WORKERS or os.cpu_count() or 1
+        if workers <= 1 or page_count < self.config.PARALLEL_MIN_PAGES:
+            return 1
+        return min(workers, page_count)
+
+    def _iter_page_lines(self, doc: fitz.Document, pages: Sequence[int],
+                         font_histogram: Optional[Dict[float, int]] = None) -> Iterator[LineStore]:
+        """
+        Yield the line store of each page in ``pages``, counting font sizes into
+        ``font_histogram`` when one is given.
+
+        With Config.PROCESS_PAGES_IN_CHUNKS, pages are processed in windows of
+        Config.CHUNK_SIZE and MuPDF's resource store (decoded fonts, images and
+        display lists) is emptied after each window, so memory stays bounded by
+        one chunk instead of growing with the page count.
+        """
+        chunk_size = self.config.CHUNK_SIZE if self.config.PROCESS_PAGES_IN_CHUNKS else 0
+        for index, page_num in enumerate(pages, 1):
+            spans = self._page_spans(doc, page_num, keep = False)
+            with self._stage("line_building"):
+                if font_histogram is not None:
+                    self._count_font_sizes(spans, font_histogram)
+                page_lines = self._page_lines(page_num, spans)
+            if chunk_size > 0 and index % chunk_size == 0:
+                fitz.TOOLS.store_shrink(100)
+            yield page_lines
+
+    def _iter_lines(self, doc: fitz.Document, pages: Optional[Sequence[int]] = None,
+                    font_histogram: Optional[Dict[float, int]] = None) -> Iterator[LineStore]:
+        """Yield one LineStore per page, in page order, optionally counting font sizes."""
+        if pages is None:
+            pages = range(len(doc))
+        workers = self._worker_count(len(pages))
+        if workers > 1 and doc.name:
+            return self._iter_lines_parallel(doc, pages, workers, font_histogram)
+        return self._iter_page_lines(doc, pages, font_histogram)
+
+    def _iter_lines_parallel(self, doc: fitz.Document, pages: Sequence[int], workers: int,
+                             font_histogram: Optional[Dict[float, int]] = None) -> Iterator[LineStore]:
+        """
+        Yield the same line stores as the serial path, decoding page ranges in a process pool.
+
+        Pages already decoded by font analysis or title detection are consumed locally;
+        runs of the remaining pages are split into contiguous ranges, each worker opening
+        its own copy of the document. Results (and the workers' font histograms) are
+        merged back in page order, with at most two ranges per worker in flight so that
+        finished ranges do not pile up ahead of the consumer. Ranges not yet started are
+        cancelled if the consumer stops early.
+        """
+        remote_count = sum(1 for page_num in pages if page_num not in self._span_tables)
+        if not remote_count:
+            yield from self._iter_page_lines(doc, pages, font_histogram)
+            return
+        # A few ranges per worker keeps the pool busy when pages differ in cost
+        range_size = max(1, -(-remote_count // (workers * 4)))
+        if self.config.PROCESS_PAGES_IN_CHUNKS and self.config.CHUNK_SIZE > 0:
+            range_size = min(range_size, self.config.CHUNK_SIZE)
+
+        # Consecutive pages with the same placement, as (remote, page_nums) segments
+        segments: deque = deque()
+        for page_num in pages:
+            remote = page_num not in self._span_tables
+            if segments and segments[-1][0] == remote and not (remote and len(segments[-1][1]) >= range_size):
+                segments[-1][1].append(page_num)
+            else:
+                segments.append((remote, [page_num]))
+        max_pending = workers * 2
+        count_fonts = font_histogram is not None
+
+        with ProcessPoolExecutor(max_workers = min(workers, -(-remote_count // range_size))) as executor:
+            pending: deque = deque()
+            try:
+                while segments or pending:
+                    while segments and len(pending) < max_pending:
+                        remote, page_nums = segments.popleft()
+                        future = (executor.submit(_extract_pages, doc.name, self.config, page_nums, count_fonts)
+                                  if remote else None)
+                        pending.append((page_nums, future))
+                    page_nums, future = pending.popleft()
+                    if future is None:
+                        yield from self._iter_page_lines(doc, page_nums, font_histogram)
+                        continue
+                    self._pages_processed.update(page_nums)
+                    with self._stage("parallel_wait"):
+                        stores, range_histogram, range_profile, range_cache_counts = future.result()
+                    if range_profile is not None:
+                        self._profiler.merge_worker(range_profile)
+                    if range_cache_counts is not None:
+                        for name, count in range_cache_counts.items():
+                            self._page_cache_counts[name] += count
+                    if count_fonts:
+                        for font_size, char_count in range_histogram.items():
+                            font_histogram[font_size] += char_count
+                    yield from stores
+            finally:
+                for _, future in pending:
+                    if future is not None:
+                        future.cancel()
 
     def _classify_level(self, line_font_size: float, heading_levels: Dict[float, str]) -> Optional[str]:
         """Return heading level like 'H1'..'H6' if font size matches, else None."""
         return heading_levels.get(round(line_font_size, 1))
 
-    def _group_paragraphs(self, lines: List[Dict[str, Any]], gap_multiplier: float = 0.8) -> List[List[Dict[str, Any]]]:
-        """Group consecutive lines into paragraphs based on vertical gaps."""
-        paragraphs: List[List[Dict[str, Any]]] = []
-        current: List[Dict[str, Any]] = []
+    def _group_paragraphs(self, lines: LineStore, gap_multiplier: float = 0.8) -> List[range]:
+        """Group consecutive lines into paragraphs based on vertical gaps, as ranges of line indices."""
+        return lines.paragraph_ranges(gap_multiplier, vectorize = self.config.VECTORIZE)
 
-        prev_bottom = None
-        for ln in lines:
-            if prev_bottom is None:
-                current = [ln]
-                prev_bottom = ln.get("bottom")
-                continue
+    def _iter_section_dicts(self, stores: Iterable[LineStore],
+                            heading_levels: Dict[float, str]) -> Iterator[Dict[str, Any]]:
+        """
+        Split lines by headings, yielding each section once the next heading closes it.
+
+        Non-heading lines are buffered and grouped into paragraphs of the open section;
+        content that precedes the first heading forms a "content" section.
+        """
+        current_section: Optional[Dict[str, Any]] = None
+        buffer_non_heading = LineStore()
+        profiler = self._profiler
+        for store in stores:
+            run_start = 0
+            with self._stage("heading_detection"):
+                headings = store.heading_indices(heading_levels, vectorize = self.config.VECTORIZE)
+            if profiler is not None:
+                profiler.lines += len(store)
+            for i in headings:
+                # Stored font sizes are rounded like the table's keys, so this is a plain lookup
+                level = heading_levels[store.font_sizes[i]]
+                buffer_non_heading.extend(store, run_start, i)
+                run_start = i + 1
+
+                # Flush any buffered content into the open section before closing it
+                if len(buffer_non_heading):
+                    if current_section is None:
+                        current_section = {"level": "content", "title": None, "paragraphs": []}
+                    current_section["paragraphs"].extend(self._paragraph_texts(buffer_non_heading))
+                    buffer_non_heading = LineStore()
+                if current_section is not None:
+                    yield current_section
+
+                # Start a new heading section
+                current_section = {"level": level, "title": store.text(i), "paragraphs": []}
+            buffer_non_heading.extend(store, run_start)
+
+        # Flush remaining buffer into the last/current section
+        if len(buffer_non_heading):
+            if current_section is None:
+                current_section = {"level": "content", "title": None, "paragraphs": []}
+            current_section["paragraphs"].extend(self._paragraph_texts(buffer_non_heading))
+        if current_section is not None:
+            yield current_section
+
+    def _paragraph_texts(self, lines: LineStore) -> List[str]:
+        """Group lines into paragraphs and join each paragraph's text."""
+        with self._stage("paragraph_grouping"):
+            return [" ".join(lines.texts(para.start, para.stop)) for para in self._group_paragraphs(lines)]
+
+    def iter_sections(self, pdf_path: PDFInput, pages: Optional[PageSelection] = None, max_sections: Optional[int] = None,
+                      stop_after_heading: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream sections from a PDF as soon as the following heading closes them.
+
+        Pages are decoded lazily, so consumers receive the first sections before the
+        document has been fully parsed and only the open section is held in memory.
+        The sections are the same as the "sections" of extract_text_with_structure.
+
+        Args:
+            pdf_path (PDFInput): Path to the PDF file, or its contents as bytes, bytearray,
+                memoryview or a binary file object
+            pages, max_sections, stop_after_heading: See extract_text_with_structure
+
+        Returns:
+            Iterator[Dict[str, Any]]: Generator of section dictionaries
+
+        Raises:
+            PDFFileNotFoundError: If PDF file doesn't exist
+            TypeError: If ``pdf_path`` is not a supported input
+            InvalidPDFError: If PDF file is corrupted
+            PDFProcessingError: If processing fails (also raised during iteration)
+        """
+        check_input(pdf_path)
+        return self._open_stream(pdf_path, pages, max_sections, stop_after_heading).sections
+
+    def open_stream(self, pdf_path: PDFInput, pages: Optional[PageSelection] = None, max_sections: Optional[int] = None,
+                    stop_after_heading: Optional[str] = None) -> "DocumentStream":
+        """
+        Open an incremental extraction of a PDF.
+
+        The title, font histogram and heading levels are computed up front; sections are
+        produced lazily while the stream is iterated. When the result cache is enabled the
+        result is looked up (or computed and stored) in full and replayed from memory.
+
+        Args:
+            pdf_path (PDFInput): Path to the PDF file, or its contents as bytes, bytearray,
+                memoryview or a binary file object
+            pages, max_sections, stop_after_heading: See extract_text_with_structure
+
+        Returns:
+            DocumentStream: Stream over the extracted structure
+
+        Raises:
+            PDFFileNotFoundError: If PDF file doesn't exist
+            TypeError: If ``pdf_path`` is not a supported input
+            InvalidPDFError: If PDF file is corrupted
+            PDFProcessingError: If processing fails (also raised during iteration)
+        """
+        check_input(pdf_path)
+        if self.config.CACHE_DIR:
+            return DocumentStream.from_result(
+                self.extract_text_with_structure(pdf_path, pages, max_sections, stop_after_heading))
+        return self._open_stream(pdf_path, pages, max_sections, stop_after_heading)
+
+    def _open_stream(self, pdf_path: PDFInput, pages: Optional[PageSelection] = None, max_sections: Optional[int] = None,
+                     stop_after_heading: Optional[str] = None) -> "DocumentStream":
+        """Open the document, run font analysis and title detection, and wrap the rest lazily."""
+        start_time = time.time()
+        doc = None
+        self._pages_processed = set()
+        self._reset_page_cache_counts()
+        profiler = self._profiler = Profiler() if self.config.PROFILE else None
+
+        try:
+            doc = open_document(pdf_path, self.config.MMAP_FILES)
+            selected = self._select_pages(len(doc), pages)
+
+            # Extract document title (usually from first page, largest non-body font)
+            # An empty selection decodes nothing, not even a page for the title
+            with self._stage("title"):
+                title = self._extract_title(doc, page_num = selected[0]) if selected else DEFAULT_TITLE
+
+            # Analyze font sizes for heading detection
+            with self._stage("font_analysis"):
+                layout = self._template_layout()
+                if layout is not None:
+                    font_histogram, heading_levels = layout.font_histogram, layout.heading_levels
+                    lines = self._iter_lines(doc, selected)
+                elif self.config.FONT_SAMPLING == "full":
+                    font_histogram, heading_levels, lines = self._collect_lines(doc, selected)
+                else:
+                    font_histogram, heading_levels = self.analyze_font_sizes(doc, selected)
+                    lines = self._iter_lines(doc, selected)
+            if profiler is not None:
+                profiler.switch("output")
+        except Exception as e:
+            if doc is not None:
+                self._close_document(doc)
+            raise self._wrap_error(e)
 
-            top = ln.get("top")
-            font_size = ln.get("font_size") or 0.0
-            # Heuristic threshold: if the gap is larger than k * font_size, start a new paragraph
-            threshold = (font_size or 10.0) * gap_multiplier
-            gap = (top - prev_bottom) if (top is not None and prev_bottom is not None) else threshold + 1
+        return DocumentStream(
+            title = title,
+            font_histogram = {str(k): v for k, v in sorted(font_histogram.items())},
+            heading_levels = {str(k): v for k, v in heading_levels.items()},
+            sections = self._limit_sections(self._iter_document_sections(doc, heading_levels, lines),
+                                            max_sections, stop_after_heading),
+            page_count = len(doc),
+            start_time = start_time,
+            on_close = lambda: self._close_document(doc),
+            pages_processed = self._pages_processed,
+            profiler = profiler,
+            page_cache_counts = self._page_cache_counts,
+            on_stats = functools.partial(notify_hooks, describe(pdf_path)) if has_hooks() else None,
+        )
 
-            if gap is not None and gap > threshold:
-                if current:
-                    paragraphs.append(current)
-                current = [ln]
+    @staticmethod
+    def _select_pages(page_count: int, pages: Optional[PageSelection]) -> List[int]:
+        """Return the sorted, de-duplicated page selection, defaulting to every page."""
+        if pages is None:
+            return list(range(page_count))
+        selected = set()
+        for item in [pages] if isinstance(pages, slice) else pages:
+            if isinstance(item, slice):
+                # Open-ended ranges are clipped to the document
+                selected.update(range(*item.indices(page_count)))
+            elif 0 <= item < page_count:
+                selected.add(item)
             else:
-                current.append(ln)
-            prev_bottom = ln.get("bottom")
+                raise PageRangeError(f"Page index {item} out of range for a {page_count}-page document (indices are 0-based)")
+        return sorted(selected)
+
+    @staticmethod
+    def _limit_sections(sections: Iterator[Dict[str, Any]], max_sections: Optional[int],
+                        stop_after_heading: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Stop a section stream early, so that the pages after the cut-off are never decoded.
+
+        Stops after ``max_sections`` sections, or after the first heading section whose
+        title contains ``stop_after_heading`` (case-insensitive).
+        """
+        if max_sections is None and not stop_after_heading:
+            yield from sections
+            return
+        needle = stop_after_heading.casefold() if stop_after_heading else None
+        count = 0
+        try:
+            if max_sections is not None and max_sections <= 0:
+                return
+            for section in sections:
+                yield section
+                count += 1
+                if max_sections is not None and count >= max_sections:
+                    return
+                if needle and section["title"] and needle in section["title"].casefold():
+                    return
+        finally:
+            sections.close()
 
-        if current:
-            paragraphs.append(current)
+    def _iter_document_sections(self, doc: fitz.Document, heading_levels: Dict[float, str],
+                                lines: Iterable[LineStore]) -> Iterator[Dict[str, Any]]:
+        """Yield the sections of an open document, closing it when done or abandoned."""
+        try:
+            # Split lines by headings and group non-heading lines into paragraphs per section
+            yield from self._iter_section_dicts(lines, heading_levels)
+        except Exception as e:
+            raise self._wrap_error(e)
+        finally:
+            self._close_document(doc)
+
+    def _close_document(self, doc: fitz.Document) -> None:
+        """Release span tables and close the document; safe to call more than once."""
+        self._release_spans()
+        close_document(doc)
 
-        return paragraphs
+    @staticmethod
+    def _wrap_error(e: Exception) -> PdfToJsonError:
+        """Map an exception raised during processing to the library's exception types."""
+        if isinstance(e, PdfToJsonError):
+            return e
+        if isinstance(e, fitz.FileDataError):
+            return InvalidPDFError(f"Invalid or corrupted PDF file: {str(e)}")
+        logger.error(f"Error processing PDF: {str(e)}")
+        return PDFProcessingError(f"Failed to process PDF: {str(e)}")
 
-    def extract_text_with_structure(self, pdf_path: str) -> Dict[str, Any]:
+    def extract_text_with_structure(self, pdf_path: PDFInput, pages: Optional[PageSelection] = None,
+                                    max_sections: Optional[int] = None,
+                                    stop_after_heading: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract text with hierarchical structure from PDF.
         Returns JSON format with title and outline.
 
+        Pages outside ``pages`` and pages after an early stop are never decoded;
+        ``stats["pages_processed"]`` lists the (0-based) pages that were decoded for the
+        result. Worker processes decode page ranges, so after an early stop it includes
+        the rest of the range the stop fell in; ranges decoded ahead and discarded are
+        not listed.
+
         Args:
-            pdf_path (str): Path to the PDF file
+            pdf_path (PDFInput): Path to the PDF file, or its contents as bytes, bytearray,
+                memoryview or a binary file object
+            pages (Iterable[int | slice] or slice, optional): 0-based page numbers and slices
+                of pages to extract; font analysis samples and the title is taken from these
+                pages. Slices are clipped to the document. Defaults to all pages.
+            max_sections (int, optional): Stop after this many sections
+            stop_after_heading (str, optional): Stop after the first heading section whose
+                title contains this text (case-insensitive)
 
         Returns:
             Dict[str, Any]: Dictionary containing extracted PDF structure
 
         Raises:
             PDFFileNotFoundError: If PDF file doesn't exist
+            TypeError: If ``pdf_path`` is not a supported input
             InvalidPDFError: If PDF file is corrupted
-            PDFProcessingError: If processing fails
+            PDFProcessingError: If processing fails or a selected page is out of range
         """
-        start_time = time.time()
+        check_input(pdf_path)
 
-        if not os.path.exists(pdf_path):
-            raise PDFFileNotFoundError(f"PDF file not found: {pdf_path}")
+        try:
+            cache = ResultCache.from_config(self.config)
+        except OSError as e:
+            logger.warning(f"Result cache unavailable: {str(e)}")
+            cache = None
+        if pages is not None and not isinstance(pages, slice):
+            # Materialize once so a generator serves both the cache key and the extraction
+            pages = list(pages)
+        options = (pages, max_sections, stop_after_heading)
+        if cache is None or self.config.PROFILE:
+            # A profile describes the run that produced it, so profiled runs bypass the cache
+            return self._extract(pdf_path, *options)
+        if not is_path(pdf_path) and hasattr(pdf_path, "read"):
+            # A stream is read once, to serve both the cache key and the extraction
+            pdf_path = pdf_path.read()
 
+        key = cache.key_for(pdf_path, self.config, {
+            "pages": pages,
+            "max_sections": max_sections,
+            "stop_after_heading": stop_after_heading,
+        })
+        result = cache.get(key)
+        if result is not None:
+            logger.info(f"Loaded cached result for {describe(pdf_path)}")
+            return result
+        result = self._extract(pdf_path, *options)
         try:
-            doc = fitz.open(pdf_path)
+            cache.put(key, result)
+        except OSError as e:
+            logger.warning(f"Could not write result cache: {str(e)}")
+        return result
 
-            # Analyze font sizes for heading detection
-            font_histogram, heading_levels = self.analyze_font_sizes(doc)
+    def _extract(self, pdf_path: PDFInput, *options) -> Dict[str, Any]:
+        """Run a full extraction, bypassing the result cache."""
+        stream = self._open_stream(pdf_path, *options)
+        sections = list(stream.sections)
+        return stream.to_dict(sections)
 
-            # Extract document title (usually from first page, largest non-body font)
-            title = self._extract_title(doc, heading_levels)
-
-            # Extract structured content
-            sections: List[Dict[str, Any]] = []
-            current_section: Optional[Dict[str, Any]] = None
-
-            # Collect all non-empty lines first with layout info
-            all_lines: List[Dict[str, Any]] = list(self._iter_lines(doc))
-
-            # Split by headings and group non-heading lines into paragraphs per section
-            buffer_non_heading: List[Dict[str, Any]] = []
-            for ln in all_lines:
-                level = self._classify_level(ln["font_size"], heading_levels)
-                if level:
-                    # Flush any buffered content as a paragraph section if present
-                    if buffer_non_heading:
-                        paragraphs = self._group_paragraphs(buffer_non_heading)
-                        if current_section is None:
-                            current_section = {"level": "content", "title": None, "paragraphs": []}
-                            sections.append(current_section)
-                        current_section["paragraphs"].extend([" ".join(p_i["text"] for p_i in para) for para in paragraphs])
-                        buffer_non_heading = []
-
-                    # Start a new heading section
-                    current_section = {"level": level, "title": ln["text"], "paragraphs": []}
-                    sections.append(current_section)
-                else:
-                    buffer_non_heading.append(ln)
+    def _extract_title(self, doc: fitz.Document, heading_levels: Optional[Dict[float, str]] = None,
+                       page_num: int = 0) -> str:
+        """Extract document title from the first (or given) page."""
+        if len(doc) == 0:
+            return DEFAULT_TITLE
+
+        # Look for the largest text on the first page
+        largest_text = ""
+        largest_size = 0
 
-            # Flush remaining buffer into the last/current section
-            if buffer_non_heading:
-                paragraphs = self._group_paragraphs(buffer_non_heading)
-                if current_section is None:
-                    current_section = {"level": "content", "title": None, "paragraphs": []}
-                    sections.append(current_section)
-                current_section["paragraphs"].extend([" ".join(p_i["text"] for p_i in para) for para in paragraphs])
+        for span in self._page_spans(doc, page_num):
+            if span.font.size > largest_size:
+                largest_size = span.font.size
+                largest_text = span.text.strip()
+
+        return largest_text if largest_text else DEFAULT_TITLE
+
+    def extract_outline(self, pdf_path: PDFInput) -> Dict[str, Any]:
+        """
+        Extract only the title and the heading outline of a PDF.
 
+        The document metadata and embedded outline (bookmarks) are used when present,
+        which avoids decoding page text altogether. Otherwise heading levels are derived
+        by font analysis and the lines are scanned for headings, without the paragraph
+        grouping of a full extraction; the headings found then match the section titles
+        of extract_text_with_structure.
+
+        Args:
+            pdf_path (PDFInput): Path to the PDF file, or its contents as bytes, bytearray,
+                memoryview or a binary file object
+
+        Returns:
+            Dict[str, Any]: ``title``, ``outline`` (list of ``level``, ``title`` and
+            0-based ``page``, None when the bookmark has no target), ``source``
+            ("toc" or "fonts") and ``stats``
+
+        Raises:
+            PDFFileNotFoundError: If PDF file doesn't exist
+            TypeError: If ``pdf_path`` is not a supported input
+            InvalidPDFError: If PDF file is corrupted
+            PDFProcessingError: If processing fails
+        """
+        check_input(pdf_path)
+
+        start_time = time.time()
+        doc = None
+        self._pages_processed = set()
+        self._reset_page_cache_counts()
+        profiler = self._profiler = Profiler() if self.config.PROFILE else None
+
+        try:
+            doc = open_document(pdf_path, self.config.MMAP_FILES)
+            toc = doc.get_toc(simple = True)
+            title = ((doc.metadata or {}).get("title") or "").strip()
+
+            if toc:
+                source = "toc"
+                outline = [
+                    {
+                        "level": f"H{min(max(level, 1), self.config.MAX_HEADING_LEVELS)}",
+                        "title": text.strip(),
+                        "page": page - 1 if page > 0 else None,
+                    }
+                    for level, text, page in toc
+                ]
+                if not title:
+                    with self._stage("title"):
+                        title = self._extract_title(doc)
+            else:
+                source = "fonts"
+                if not title:
+                    with self._stage("title"):
+                        title = self._extract_title(doc)
+                with self._stage("font_analysis"):
+                    layout = self._template_layout()
+                    if layout is not None:
+                        heading_levels = layout.heading_levels
+                        lines = self._iter_lines(doc)
+                    elif self.config.FONT_SAMPLING == "full":
+                        _, heading_levels, lines = self._collect_lines(doc, range(len(doc)))
+                    else:
+                        _, heading_levels = self.analyze_font_sizes(doc)
+                        lines = self._iter_lines(doc)
+                if profiler is not None:
+                    profiler.switch("heading_detection")
+                outline = []
+                for store in lines:
+                    if profiler is not None:
+                        profiler.lines += len(store)
+                    for i in store.heading_indices(heading_levels, vectorize = self.config.VECTORIZE):
+                        outline.append({
+                            "level": heading_levels[store.font_sizes[i]],
+                            "title": store.text(i),
+                            "page": store.pages[i],
+                        })
             page_count = len(doc)
-            doc.close()
-
-            processing_time = time.time() - start_time
-            logger.info(f"Processing completed in {processing_time:.2f} seconds")
-
-            # Prepare enriched output
-            num_headings = sum(1 for s in sections if s.get("level", "").startswith("H"))
-            num_paragraphs = sum(len(s.get("paragraphs", [])) for s in sections)
-
-            return {
-                "title": title,
-                "sections": sections,
-                "font_histogram": {str(k): v for k, v in sorted(font_histogram.items())},
-                "heading_levels": {str(k): v for k, v in heading_levels.items()},
-                "stats": {
-                    "page_count": page_count,
-                    "processing_time": processing_time,
-                    "num_sections": len(sections),
-                    "num_headings": num_headings,
-                    "num_paragraphs": num_paragraphs
-                }
-            }
-
-        except fitz.FileDataError as e:
-            raise InvalidPDFError(f"Invalid or corrupted PDF file: {str(e)}")
         except Exception as e:
-            logger.error(f"Error processing PDF: {str(e)}")
-            raise PDFProcessingError(f"Failed to process PDF: {str(e)}")
+            raise self._wrap_error(e)
+        finally:
+            if doc is not None:
+                self._close_document(doc)
 
-    def _extract_title(self, doc: fitz.Document, heading_levels: Dict[float, str]) -> str:
-        """Extract document title from first page."""
-        if len(doc) == 0:
-            return "Untitled Document"
+        processing_time = time.time() - start_time
+        logger.info(f"Outline extracted in {processing_time:.2f} seconds")
+        stats = {
+            "page_count": page_count,
+            "pages_processed": sorted(self._pages_processed),
+            "processing_time": processing_time,
+            "num_headings": len(outline),
+        }
+        if self._page_cache_counts is not None:
+            stats["page_cache"] = dict(self._page_cache_counts)
+        if profiler is not None:
+            profiler.switch(None)
+            stats["profile"] = profiler.to_dict()
+        if has_hooks():
+            notify_hooks(describe(pdf_path), stats)
+        return {
+            "title": title,
+            "outline": outline,
+            "source": source,
+            "stats": stats,
+        }
 
-        first_page = doc[0]
-        blocks = first_page.get_text("dict")["blocks"]
+    def extract_incremental(self, pdf_path: PDFInput, index_path: str) -> Dict[str, Any]:
+        """
+        Extract a PDF like extract_text_with_structure, reusing the pages recorded in a page index.
 
-        # Look for the largest text on the first page
-        largest_text = ""
-        largest_size = 0
+        Pages whose fingerprint (content streams, fonts and geometry) is found in the
+        index at ``index_path`` are not decoded again, wherever they moved in the
+        document; the others are decoded and the index is rewritten for the next run.
+        Sections are rebuilt from the per-page lines, and heading levels are taken from
+        the index unless the sampled font histogram changed. A missing index, or one
+        made with other settings, means a full extraction.
 
-        for block in blocks:
-            if "lines" not in block:
-                continue
+        The result equals that of extract_text_with_structure; ``stats["pages_processed"]``
+        lists the pages decoded in this run and ``stats["pages_reused"]`` counts the rest.
 
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    if span["text"].strip() and span["size"] > largest_size:
-                        largest_size = span["size"]
-                        largest_text = span["text"].strip()
+        Args:
+            pdf_path (PDFInput): Path to the PDF file, or its contents as bytes, bytearray,
+                memoryview or a binary file object
+            index_path (str): Page index file, created if missing
 
-        return largest_text if largest_text else "Untitled Document"
+        Returns:
+            Dict[str, Any]: Dictionary containing extracted PDF structure
+
+        Raises:
+            PDFFileNotFoundError: If PDF file doesn't exist
+            TypeError: If ``pdf_path`` is not a supported input
+            InvalidPDFError: If PDF file is corrupted
+            PDFProcessingError: If processing fails
+        """
+        check_input(pdf_path)
+
+        start_time = time.time()
+        doc = None
+        self._pages_processed = set()
+        self._reset_page_cache_counts()
+        self._profiler = None
+        key = settings_key(self.config)
+        index = PageIndex.load(index_path, key)
+        known = index.records if index is not None else {}
+
+        try:
+            doc = open_document(pdf_path, self.config.MMAP_FILES)
+            font_digests: Dict[int, bytes] = {}
+            fingerprints = [page_fingerprint(doc, page_num, font_digests) for page_num in range(len(doc))]
+            records: Dict[str, PageRecord] = {}
+            for page_num, fingerprint in enumerate(fingerprints):
+                if fingerprint in records:
+                    continue
+                record = known.get(fingerprint)
+                if record is None:
+                    spans = self._page_spans(doc, page_num, keep = False)
+                    font_counts = defaultdict(int)
+                    self._count_font_sizes(spans, font_counts)
+                    record = PageRecord.from_page(self._page_lines(page_num, spans), font_counts, spans)
+                records[fingerprint] = record
+        except Exception as e:
+            raise self._wrap_error(e)
+        finally:
+            if doc is not None:
+                self._close_document(doc)
+
+        layout = self._template_layout()
+        if layout is not None:
+            font_histogram, heading_levels = layout.font_histogram, layout.heading_levels
+        else:
+            font_histogram = defaultdict(int)
+            for page_num in self._sample_pages(range(len(fingerprints))):
+                for font_size, char_count in records[fingerprints[page_num]].font_counts.items():
+                    font_histogram[font_size] += char_count
+            if index is not None and index.font_histogram == font_histogram:
+                heading_levels = index.heading_levels
+            else:
+                heading_levels = self._assign_heading_levels(font_histogram)
+        title = (records[fingerprints[0]].title_text if fingerprints else "") or DEFAULT_TITLE
+
+        stores = (records[fingerprint].lines(page_num) for page_num, fingerprint in enumerate(fingerprints))
+        sections = list(self._iter_section_dicts(stores, heading_levels))
+        try:
+            PageIndex(key, records, dict(font_histogram), heading_levels).save(index_path)
+        except OSError as e:
+            logger.warning(f"Could not write page index: {str(e)}")
+
+        processing_time = time.time() - start_time
+        logger.info(f"Processing completed in {processing_time:.2f} seconds")
+        stats = {
+            "page_count": len(fingerprints),
+            "pages_processed": sorted(self._pages_processed),
+            "pages_reused": len(fingerprints) - len(self._pages_processed),
+            "processing_time": processing_time,
+            "num_sections": len(sections),
+            "num_headings": sum(1 for section in sections if section.get("level", "").startswith("H")),
+            "num_paragraphs": sum(len(section.get("paragraphs", [])) for section in sections),
+        }
+        if self._page_cache_counts is not None:
+            stats["page_cache"] = dict(self._page_cache_counts)
+        if has_hooks():
+            notify_hooks(describe(pdf_path), stats)
+        return {
+            "title": title,
+            "sections": sections,
+            "font_histogram": {str(k): v for k, v in sorted(font_histogram.items())},
+            "heading_levels": {str(k): v for k, v in heading_levels.items()},
+            "stats": stats,
+        }
+
+
+def _extract_pages(pdf_path: str, config: Config, page_nums: List[int],
+                   count_fonts: bool = False) -> Tuple[List[LineStore], Optional[Dict[float, int]],
+                                                       Optional[Dict[str, Any]], Optional[Dict[str, int]]]:
+    """
+    Process-pool worker: open the document and return the line stores of ``page_nums``,
+    with the font histogram of those pages when ``count_fonts`` is set, the worker's
+    profile when Config.PROFILE is set and its page cache hits and misses when the page
+    cache is enabled.
+    """
+    extractor = PDFStructureExtractor(config)
+    if config.PROFILE:
+        extractor._profiler = Profiler()
+    font_histogram = defaultdict(int) if count_fonts else None
+    doc = open_document(pdf_path, config.MMAP_FILES)
+    try:
+        stores = list(extractor._iter_page_lines(doc, page_nums, font_histogram))
+    finally:
+        close_document(doc)
+    profile = None
+    if extractor._profiler is not None:
+        extractor._profiler.switch(None)
+        profile = extractor._profiler.to_dict()
+    return stores, (dict(font_histogram) if count_fonts else None), profile, extractor._page_cache_counts
@@ -0,0 +1,201 @@
+"""
+Page fingerprints and the page index behind incremental re-extraction.
+
+A page's fingerprint hashes what its text is decoded from: the raw content streams,
+the streams of the form XObjects it draws, its fonts and its geometry. The page index
+stores, per fingerprint, everything extraction derives from decoding that page (its
+line store, font-size character counts and title candidate), so a later run over a
+regenerated or extended document only decodes pages whose fingerprint is new.
+"""
+
+import hashlib
+import json
+import math
+import re
+from typing import Any, Dict, List, Optional, Set
+
+import pymupdf as fitz
+
+from .cache import _atomic_write, _effective_settings
+from .config import Config
+from .lines import LineStore
+
+# Bumped when the index layout or the meaning of its records changes
+INDEX_VERSION = 2
+
+# Indirect reference ("12 0 R") in an object's source
+_REFERENCE = re.compile(rb"(\d+) (\d+) R\b")
+
+
+def _object_digest(doc: fitz.Document, xref: int) -> bytes:
+    """
+    Hash an object with every object it references, streams included, resolved in place.
+
+    Object numbers are replaced by the referenced objects' contents, so the same font
+    embedded in different files hashes the same. An object reached again (a cycle or a
+    shared resource) contributes a marker instead of its contents.
+    """
+    digest = hashlib.blake2b(digest_size = 16)
+    seen: Set[int] = set()
+    stack = [xref]
+    while stack:
+        xref = stack.pop()
+        if xref in seen:
+            digest.update(b"\0seen\0")
+            continue
+        seen.add(xref)
+        source = doc.xref_object(xref, compressed = True).encode()
+        digest.update(_REFERENCE.sub(b"R", source))
+        if doc.xref_is_stream(xref):
+            digest.update(b"\0stream\0")
+            digest.update(doc.xref_stream_raw(xref) or b"")
+        digest.update(b"\0")
+        # Depth-first, in order of appearance
+        stack.extend(int(match.group(1)) for match in reversed(list(_REFERENCE.finditer(source))))
+    return digest.digest()
+
+
+def page_fingerprint(doc: fitz.Document, page_num: int, font_digests: Optional[Dict[int, bytes]] = None) -> str:
+    """
+    Return a hash of the inputs that determine a page's decoded text.
+
+    Streams are hashed as stored, without decompressing them, so this costs a small
+    fraction of decoding the page. Identical pages compressed differently hash
+    differently, which only costs a re-decode. Fonts are hashed with everything they
+    reference (ToUnicode CMap, encoding, widths, embedded font file); pass the same
+    ``font_digests`` dict for the pages of one document to hash each font once. Form
+    XObjects nested inside other form XObjects are not followed.
+    """
+    if font_digests is None:
+        font_digests = {}
+    page = doc[page_num]
+    digest = hashlib.blake2b(digest_size = 16)
+    digest.update(repr((tuple(page.mediabox), tuple(page.cropbox), page.rotation)).encode())
+    for xref in page.get_contents():
+        digest.update(doc.xref_stream_raw(xref) or b"")
+        digest.update(b"\0")
+    for xref, name, *_ in page.get_xobjects():
+        digest.update(name.encode() + b"\0")
+        digest.update(doc.xref_stream_raw(xref) or b"")
+        digest.update(b"\0")
+    # The resource name ties a font to the content stream; its definition decides the text
+    for xref, _, _, _, name, *_ in page.get_fonts():
+        if xref > 0 and xref not in font_digests:
+            font_digests[xref] = _object_digest(doc, xref)
+        digest.update(name.encode() + b"\0" + font_digests.get(xref, b""))
+    return digest.hexdigest()
+
+
+def settings_key(config: Config) -> str:
+    """Return a hash of the output-affecting settings and the library version."""
+    from . import __version__
+
+    settings = json.dumps(_effective_settings(config), sort_keys = True, default = str)
+    return hashlib.blake2b(f"{settings}\0{__version__}".encode(), digest_size = 16).hexdigest()
+
+
+def _nan_to_none(values) -> List[Optional[float]]:
+    """Convert a column with NaN for missing values to a JSON-friendly list."""
+    return [None if math.isnan(value) else value for value in values]
+
+
+class PageRecord:
+    """What extraction derives from decoding one page, independent of its page number."""
+
+    __slots__ = ("texts", "font_sizes", "tops", "bottoms", "font_counts", "title_size", "title_text")
+
+    def __init__(self, texts: List[str], font_sizes: List[float], tops: List[Optional[float]],
+                 bottoms: List[Optional[float]], font_counts: Dict[float, int], title_size: float, title_text: str):
+        self.texts = texts
+        self.font_sizes = font_sizes
+        self.tops = tops
+        self.bottoms = bottoms
+        self.font_counts = font_counts
+        self.title_size = title_size
+        self.title_text = title_text
+
+    @classmethod
+    def from_page(cls, lines: LineStore, font_counts: Dict[float, int], spans) -> "PageRecord":
+        """Build the record of a page from its line store, font-size counts and span table."""
+        # The largest span, as in title detection
+        title_size, title_text = 0, ""
+        for span in spans:
+            if span.font.size > title_size:
+                title_size, title_text = span.font.size, span.text.strip()
+        return cls(lines.texts(), list(lines.font_sizes), _nan_to_none(lines.tops), _nan_to_none(lines.bottoms),
+                   dict(font_counts), title_size, title_text)
+
+    def lines(self, page_num: int) -> LineStore:
+        """Return the page's line store, numbered as page ``page_num``."""
+        return LineStore.from_columns([page_num] * len(self.texts), self.texts, self.font_sizes, self.tops, self.bottoms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as stored in an index file."""
+        return {
+            "texts": self.texts,
+            "font_sizes": self.font_sizes,
+            "tops": self.tops,
+            "bottoms": self.bottoms,
+            "font_counts": {str(size): count for size, count in self.font_counts.items()},
+            "title": [self.title_size, self.title_text],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PageRecord":
+        """Rebuild a record read from an index file."""
+        return cls(data["texts"], data["font_sizes"], data["tops"], data["bottoms"],
+                   {float(size): count for size, count in data["font_counts"].items()}, *data["title"])
+
+
+class PageIndex:
+    """
+    Page records of one document by fingerprint, with the font analysis built on them.
+
+    Index files are JSON, written atomically. An index made with different settings or
+    another library version is ignored rather than reused.
+    """
+
+    def __init__(self, key: str, records: Dict[str, PageRecord], font_histogram: Dict[float, int],
+                 heading_levels: Dict[float, str]):
+        """
+        Initialize the index.
+
+        Args:
+            key (str): settings_key of the configuration the records were made with
+            records (Dict[str, PageRecord]): Page records by fingerprint
+            font_histogram (Dict[float, int]): Sampled font histogram of the document
+            heading_levels (Dict[float, str]): Heading levels derived from the histogram
+        """
+        self.key = key
+        self.records = records
+        self.font_histogram = font_histogram
+        self.heading_levels = heading_levels
+
+    @classmethod
+    def load(cls, path: str, key: str) -> Optional["PageIndex"]:
+        """Return the index stored at ``path``, or None when it is missing, unreadable or made with other settings."""
+        try:
+            with open(path, 'r', encoding = 'utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("key") != key:
+                return None
+            return cls(
+                key,
+                {fingerprint: PageRecord.from_dict(record) for fingerprint, record in data["pages"].items()},
+                {float(size): count for size, count in data["font_histogram"].items()},
+                {float(size): level for size, level in data["heading_levels"].items()},
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: str) -> None:
+        """Write the index to ``path``, replacing any previous one."""
+        data = {
+            "version": INDEX_VERSION,
+            "key": self.key,
+            "font_histogram": {str(size): count for size, count in self.font_histogram.items()},
+            "heading_levels": {str(size): level for size, level in self.heading_levels.items()},
+            "pages": {fingerprint: record.to_dict() for fingerprint, record in self.records.items()},
+        }
+        with _atomic_write(path) as f:
+            json.dump(data, f, ensure_ascii = False, separators = (',', ':'))
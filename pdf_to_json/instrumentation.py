@@ -0,0 +1,145 @@
+"""
+Per-stage timings and counters of an extraction, and hooks to export them.
+
+With Config.PROFILE set, each extraction records where its time went in
+``stats["profile"]``; otherwise the extractor skips all of this bookkeeping. Hooks
+registered with register_hook receive the stats of every completed extraction, with
+or without a profile, e.g. to forward them to a metrics system.
+"""
+
+import logging
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+StatsHook = Callable[[str, Dict[str, Any]], None]
+
+_hooks: List[StatsHook] = []
+
+
+def register_hook(hook: StatsHook) -> None:
+    """
+    Call ``hook(name, stats)`` after every completed extraction.
+
+    ``name`` is the input path (or a placeholder such as ``<12345 bytes>`` for
+    in-memory PDFs) and ``stats`` the result's stats dictionary. Exceptions raised by
+    a hook are logged and do not affect the extraction. Results served from the
+    result cache do not trigger hooks.
+
+    Args:
+        hook (Callable[[str, Dict[str, Any]], None]): Function to call
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def unregister_hook(hook: StatsHook) -> None:
+    """Remove a hook added with register_hook; unknown hooks are ignored."""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def has_hooks() -> bool:
+    """True when at least one hook is registered."""
+    return bool(_hooks)
+
+
+def notify_hooks(name: str, stats: Dict[str, Any]) -> None:
+    """Pass the stats of a completed extraction to every registered hook."""
+    for hook in list(_hooks):
+        try:
+            hook(name, stats)
+        except Exception as e:
+            logger.warning(f"Stats hook {hook!r} failed: {e}")
+
+
+def peak_memory_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process so far, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Profiler:
+    """
+    Stage clock of one extraction.
+
+    Time is charged to one stage at a time: ``switch`` closes the running stage and
+    opens another, returning the previous one so that nested work (say, decoding a
+    page during title detection) can hand the clock back when done. Work in lazy
+    generators is covered by switching at every hand-over between them.
+    """
+
+    __slots__ = ("stages", "worker_stages", "page_decode_times", "spans", "lines", "_stage", "_since")
+
+    def __init__(self, stage: str = "open"):
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.worker_stages: Dict[str, float] = defaultdict(float)
+        self.page_decode_times: Dict[int, float] = {}
+        self.spans = 0
+        self.lines = 0
+        self._stage: Optional[str] = stage
+        self._since = time.perf_counter()
+
+    def switch(self, stage: Optional[str]) -> Optional[str]:
+        """Charge the time since the last switch to the running stage and start ``stage`` (None stops the clock)."""
+        now = time.perf_counter()
+        previous = self._stage
+        if previous is not None:
+            self.stages[previous] += now - self._since
+        self._stage = stage
+        self._since = now
+        return previous
+
+    def stage(self, stage: str) -> "_Stage":
+        """Return a context manager charging the enclosed work to ``stage``; it must not span a yield."""
+        return _Stage(self, stage)
+
+    def record_page(self, page_num: int, seconds: float, span_count: int) -> None:
+        """Record the decode time and span count of one page."""
+        self.page_decode_times[page_num] = seconds
+        self.spans += span_count
+
+    def merge_worker(self, profile: Dict[str, Any]) -> None:
+        """Fold in the profile of a worker process that decoded a range of pages."""
+        for stage, seconds in profile["stages"].items():
+            self.worker_stages[stage] += seconds
+        for page_num, seconds in profile["page_decode_times"].items():
+            self.page_decode_times[int(page_num)] = seconds
+        self.spans += profile["counts"]["spans"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the profile as stored in ``stats["profile"]`` (JSON-compatible)."""
+        profile = {
+            "stages": dict(self.stages),
+            "page_decode_times": {str(page_num): seconds for page_num, seconds in sorted(self.page_decode_times.items())},
+            "counts": {"spans": self.spans, "lines": self.lines},
+            "peak_memory_bytes": peak_memory_bytes(),
+        }
+        if self.worker_stages:
+            profile["worker_stages"] = dict(self.worker_stages)
+        return profile
+
+
+class _Stage:
+    """Context manager returned by Profiler.stage."""
+
+    __slots__ = ("profiler", "stage", "previous")
+
+    def __init__(self, profiler: Profiler, stage: str):
+        self.profiler = profiler
+        self.stage = stage
+        self.previous: Optional[str] = None
+
+    def __enter__(self) -> None:
+        self.previous = self.profiler.switch(self.stage)
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.switch(self.previous)
@@ -0,0 +1,105 @@
+"""
+Layout profiles: a document template's font histogram and the heading levels derived from it.
+
+Heading levels depend only on the body font size and on which larger sizes are
+frequent enough to be headings, so they are the same for every document made from
+one template. A profile can be saved and named in Config.LAYOUT_PROFILE, in which
+case documents made from that template skip font analysis altogether.
+"""
+
+import functools
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+
+def assign_heading_levels(font_histogram: Dict[float, int], min_heading_frequency: float,
+                          max_heading_levels: int) -> Dict[float, str]:
+    """Map font sizes larger than the body size, and frequent enough, to heading levels, largest first."""
+    if not font_histogram:
+        return {}
+    total_chars = sum(font_histogram.values())
+    main_font_size = max(font_histogram.items(), key=lambda x: x[1])[0]
+    heading_sizes = sorted((font_size for font_size, count in font_histogram.items()
+                            if font_size > main_font_size and count > total_chars * min_heading_frequency),
+                           reverse = True)
+    return {font_size: f"H{min(level, max_heading_levels)}" for level, font_size in enumerate(heading_sizes, 1)}
+
+
+class LayoutProfile:
+    """
+    Font histogram of a document (or template) with its heading levels.
+
+    ``heading_levels`` maps rounded font sizes to "H1".."H6" and doubles as the
+    classification table: line font sizes are stored rounded the same way, so a line's
+    level is a single dictionary lookup. Each profile owns its dictionaries.
+    """
+
+    __slots__ = ("font_histogram", "heading_levels")
+
+    def __init__(self, font_histogram: Dict[float, int], heading_levels: Dict[float, str]):
+        """
+        Initialize the profile.
+
+        Args:
+            font_histogram (Dict[float, int]): Characters per rounded font size
+            heading_levels (Dict[float, str]): Heading level per rounded font size
+        """
+        self.font_histogram = font_histogram
+        self.heading_levels = heading_levels
+
+    @classmethod
+    def from_histogram(cls, font_histogram: Dict[float, int], min_heading_frequency: float,
+                       max_heading_levels: int) -> "LayoutProfile":
+        """Return the profile of a histogram, with heading levels assigned by assign_heading_levels."""
+        return cls(dict(font_histogram), assign_heading_levels(font_histogram, min_heading_frequency,
+                                                               max_heading_levels))
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "LayoutProfile":
+        """Return the profile of an extraction result (``font_histogram`` and ``heading_levels``)."""
+        return cls({float(size): count for size, count in result["font_histogram"].items()},
+                   {float(size): level for size, level in result["heading_levels"].items()})
+
+    def level(self, font_size: float) -> Optional[str]:
+        """Return the heading level of a rounded font size, or None for body text."""
+        return self.heading_levels.get(font_size)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the profile in the string-keyed form of extraction results."""
+        return {
+            "font_histogram": {str(size): count for size, count in sorted(self.font_histogram.items())},
+            "heading_levels": {str(size): level for size, level in self.heading_levels.items()},
+        }
+
+    def save(self, path: str) -> None:
+        """Write the profile to a JSON file."""
+        with open(path, 'w', encoding = 'utf-8') as f:
+            json.dump(self.to_dict(), f, indent = 2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "LayoutProfile":
+        """
+        Read a profile saved with save, reusing the parsed profile while the file is unchanged.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a layout profile
+        """
+        stat = os.stat(path)
+        font_histogram, heading_levels = _load_profile(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        return cls(dict(font_histogram), dict(heading_levels))
+
+
+@functools.lru_cache(maxsize = 32)
+def _load_profile(path: str, mtime_ns: int,
+                  size: int) -> Tuple[Tuple[Tuple[float, int], ...], Tuple[Tuple[float, str], ...]]:
+    """Parse a profile file into (histogram, levels) items; the modification time and size key the memo."""
+    with open(path, 'r', encoding = 'utf-8') as f:
+        data = json.load(f)
+    try:
+        profile = LayoutProfile.from_result(data)
+    except (KeyError, TypeError, AttributeError, ValueError):
+        raise ValueError(f"Not a layout profile: {path}") from None
+    return tuple(profile.font_histogram.items()), tuple(profile.heading_levels.items())
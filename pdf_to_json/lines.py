@@ -0,0 +1,215 @@
+"""
+Columnar storage for extracted text lines.
+
+Heading detection and paragraph grouping run as NumPy array operations over a
+store's columns when NumPy is installed and the store is large enough for that to
+pay off, and as plain Python loops otherwise; both produce identical results.
+"""
+
+import functools
+import math
+from array import array
+from itertools import accumulate
+from typing import Collection, Iterable, List, Optional
+
+_MISSING = math.nan
+
+# Below this many lines the per-call overhead of NumPy outweighs the loop it replaces
+VECTORIZE_MIN_LINES = 128
+
+
+@functools.lru_cache(maxsize = None)
+def numpy_module():
+    """Return the numpy module, or None when it is not installed (imported on first use)."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class LineStore:
+    """
+    Table of text lines held column by column.
+
+    Page numbers, font sizes and vertical bounds live in parallel typed arrays and the
+    line texts in a single string addressed by offsets, so a page of lines costs a
+    handful of objects instead of a dict (and its keys and boxed floats) per line.
+    Missing vertical bounds are stored as NaN and reported as None.
+    """
+
+    __slots__ = ("pages", "font_sizes", "tops", "bottoms", "_offsets", "_text", "_pending")
+
+    def __init__(self):
+        self.pages = array('i')
+        self.font_sizes = array('d')
+        self.tops = array('d')
+        self.bottoms = array('d')
+        self._offsets = array('q', [0])
+        self._text = ""
+        self._pending: List[str] = []
+
+    @classmethod
+    def from_columns(cls, pages: Iterable[int], texts: List[str], font_sizes: Iterable[float],
+                     tops: Iterable[Optional[float]], bottoms: Iterable[Optional[float]]) -> "LineStore":
+        """Build a store from per-column sequences of equal length."""
+        store = cls()
+        store.pages = array('i', pages)
+        store.font_sizes = array('d', font_sizes)
+        store.tops = array('d', [_MISSING if v is None else v for v in tops])
+        store.bottoms = array('d', [_MISSING if v is None else v for v in bottoms])
+        store._offsets = array('q', accumulate((len(text) for text in texts), initial = 0))
+        store._text = "".join(texts)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getstate__(self):
+        return (self.pages, self.font_sizes, self.tops, self.bottoms, self._offsets, self._buffer())
+
+    def __setstate__(self, state):
+        self.pages, self.font_sizes, self.tops, self.bottoms, self._offsets, self._text = state
+        self._pending = []
+
+    def _buffer(self) -> str:
+        """Return the text buffer, folding in text appended since the last call."""
+        if self._pending:
+            self._text += "".join(self._pending)
+            self._pending = []
+        return self._text
+
+    def append(self, page: int, text: str, font_size: float,
+               top: Optional[float] = None, bottom: Optional[float] = None) -> None:
+        """Append one line."""
+        self.pages.append(page)
+        self.font_sizes.append(font_size)
+        self.tops.append(_MISSING if top is None else top)
+        self.bottoms.append(_MISSING if bottom is None else bottom)
+        self._offsets.append(self._offsets[-1] + len(text))
+        self._pending.append(text)
+
+    def extend(self, other: "LineStore", start: int = 0, end: Optional[int] = None) -> None:
+        """Append lines ``start:end`` of another store."""
+        if end is None:
+            end = len(other)
+        if start >= end:
+            return
+        self.pages.extend(other.pages[start:end])
+        self.font_sizes.extend(other.font_sizes[start:end])
+        self.tops.extend(other.tops[start:end])
+        self.bottoms.extend(other.bottoms[start:end])
+        first, last = other._offsets[start], other._offsets[end]
+        shift = self._offsets[-1] - first
+        self._offsets.extend(offset + shift for offset in other._offsets[start + 1:end + 1])
+        self._pending.append(other._buffer()[first:last])
+
+    def text(self, index: int) -> str:
+        """Return the text of line ``index``."""
+        return self._buffer()[self._offsets[index]:self._offsets[index + 1]]
+
+    def texts(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Return the texts of lines ``start:end``."""
+        buffer = self._buffer()
+        offsets = self._offsets
+        if end is None:
+            end = len(self)
+        return [buffer[offsets[i]:offsets[i + 1]] for i in range(start, end)]
+
+    def top(self, index: int) -> Optional[float]:
+        """Return the top y-position of line ``index``, or None if unknown."""
+        value = self.tops[index]
+        return None if math.isnan(value) else value
+
+    def bottom(self, index: int) -> Optional[float]:
+        """Return the bottom y-position of line ``index``, or None if unknown."""
+        value = self.bottoms[index]
+        return None if math.isnan(value) else value
+
+    def _columns(self, vectorize: bool):
+        """Return numpy views of the columns when vectorizing this store pays off, else None."""
+        if not vectorize or len(self) < max(VECTORIZE_MIN_LINES, 1):
+            return None
+        np = numpy_module()
+        if np is None:
+            return None
+        return (np, np.frombuffer(self.font_sizes, dtype = np.float64),
+                np.frombuffer(self.tops, dtype = np.float64), np.frombuffer(self.bottoms, dtype = np.float64))
+
+    def heading_indices(self, heading_sizes: Collection[float], vectorize: bool = True) -> List[int]:
+        """
+        Return the indices of lines whose font size is one of ``heading_sizes``.
+
+        Args:
+            heading_sizes (Collection[float]): Heading font sizes, rounded like the stored sizes
+            vectorize (bool): Allow the NumPy path
+
+        Returns:
+            List[int]: Line indices in ascending order
+        """
+        columns = self._columns(vectorize)
+        if columns is None:
+            return [i for i, font_size in enumerate(self.font_sizes) if font_size in heading_sizes]
+        np, font_sizes, _, _ = columns
+        keys = np.fromiter(heading_sizes, dtype = np.float64, count = len(heading_sizes))
+        return np.flatnonzero(np.isin(font_sizes, keys)).tolist()
+
+    def paragraph_ranges(self, gap_multiplier: float = 0.8, vectorize: bool = True) -> List[range]:
+        """
+        Group consecutive lines into paragraphs based on vertical gaps.
+
+        A line starts a new paragraph when its gap to the previous line exceeds
+        ``gap_multiplier`` times its font size (10 when unknown), or when its top is
+        unknown. A line following one whose bottom is unknown also starts a new
+        paragraph, and the lines before it are dropped.
+
+        Args:
+            gap_multiplier (float): Gap threshold as a multiple of the font size
+            vectorize (bool): Allow the NumPy path
+
+        Returns:
+            List[range]: Line index ranges, one per paragraph
+        """
+        columns = self._columns(vectorize)
+        if columns is None:
+            return self._paragraph_ranges_python(gap_multiplier)
+        np, font_sizes, tops, bottoms = columns
+
+        prev_bottoms = bottoms[:-1]
+        reset = np.isnan(prev_bottoms)
+        sizes = font_sizes[1:]
+        thresholds = np.where(sizes == 0, 10.0, sizes) * gap_multiplier
+        with np.errstate(invalid = 'ignore'):
+            gaps = tops[1:] - prev_bottoms
+        breaks = reset | np.isnan(tops[1:]) | (gaps > thresholds)
+
+        bounds = [0] + (np.flatnonzero(breaks) + 1).tolist() + [len(self)]
+        if not reset.any():
+            return list(map(range, bounds[:-1], bounds[1:]))
+        # A paragraph followed by a reset is dropped
+        dropped = set((np.flatnonzero(reset) + 1).tolist())
+        return [range(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end not in dropped]
+
+    def _paragraph_ranges_python(self, gap_multiplier: float) -> List[range]:
+        """Pure-Python paragraph grouping; see paragraph_ranges."""
+        paragraphs: List[range] = []
+        start = None
+
+        # Unknown bounds are NaN, the only value not equal to itself
+        prev_bottom = None
+        for i, (top, bottom, font_size) in enumerate(zip(self.tops, self.bottoms, self.font_sizes)):
+            if prev_bottom is not None:
+                # Heuristic threshold: if the gap is larger than k * font_size, start a new paragraph
+                threshold = (font_size or 10.0) * gap_multiplier
+                gap = (top - prev_bottom) if top == top else threshold + 1
+                if gap > threshold:
+                    paragraphs.append(range(start, i))
+                    start = i
+            else:
+                start = i
+            prev_bottom = bottom if bottom == bottom else None
+
+        if start is not None:
+            paragraphs.append(range(start, len(self)))
+
+        return paragraphs
@@ -0,0 +1,158 @@
+"""
+Incremental JSON and JSONL writers for extraction results.
+
+Writers consume a DocumentStream section by section, so neither the full section
+list nor the full serialized document is held in memory at once. Output formats
+are looked up by name in a registry that extract_pdf_to_file and the CLI share.
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TextIO
+
+from .serialization import Dumps, stdlib_dumps
+
+if TYPE_CHECKING:
+    from .extractor import DocumentStream
+
+
+def _nest(text: str, indent: Optional[int], depth: int) -> str:
+    """Re-indent serialized JSON so it can be placed ``depth`` levels deep in a document."""
+    if not indent or not depth:
+        return text
+    # JSON strings never contain raw newlines, so every newline is structural
+    return text.replace("\n", "\n" + " " * (indent * depth))
+
+
+def dumps_result(result: Dict[str, Any], indent: Optional[int] = 2, dumps: Dumps = stdlib_dumps) -> str:
+    """
+    Serialize an extraction result dictionary.
+
+    The output is identical to ``json.dumps(result, ensure_ascii=False, indent=indent)``,
+    or to the compact ``separators=(',', ':')`` form when ``indent`` is None, whichever
+    backend ``dumps`` is; ``stats`` is always encoded with the stdlib.
+
+    Args:
+        result (Dict[str, Any]): Extraction result
+        indent (int, optional): Indentation width; None for compact output
+        dumps (Callable): JSON backend from pdf_to_json.serialization.get_dumps
+
+    Returns:
+        str: Serialized JSON
+    """
+    if not result:
+        return "{}"
+    newline = "\n" if indent else ""
+    pad = " " * indent if indent else ""
+    key_sep = ": " if indent else ":"
+    fields = [
+        pad + stdlib_dumps(key) + key_sep
+        + _nest((stdlib_dumps if key == "stats" else dumps)(value, indent), indent, 1)
+        for key, value in result.items()
+    ]
+    return "{" + newline + ("," + newline).join(fields) + newline + "}"
+
+
+def write_json(stream: "DocumentStream", fp: TextIO, indent: Optional[int] = 2, dumps: Dumps = stdlib_dumps) -> None:
+    """
+    Write a document as one JSON object, emitting each section as it is extracted.
+
+    The output is identical to ``json.dumps(result, ensure_ascii=False, indent=indent)``,
+    or to the compact ``separators=(',', ':')`` form when ``indent`` is None.
+
+    Args:
+        stream (DocumentStream): Open extraction stream
+        fp (TextIO): Text file object to write to
+        indent (int, optional): Indentation width; None for compact output
+        dumps (Callable): JSON backend from pdf_to_json.serialization.get_dumps
+    """
+    newline = "\n" if indent else ""
+    pad = " " * indent if indent else ""
+    key_sep = ": " if indent else ":"
+
+    fp.write("{" + newline + pad + '"title"' + key_sep + _nest(dumps(stream.title, indent), indent, 1) + ",")
+    fp.write(newline + pad + '"sections"' + key_sep + "[")
+    first = True
+    for section in stream.sections:
+        fp.write(("" if first else ",") + newline + pad * 2 + _nest(dumps(section, indent), indent, 2))
+        first = False
+    if not first:
+        fp.write(newline + pad)
+    fp.write("]")
+
+    for key, value in (("font_histogram", stream.font_histogram),
+                       ("heading_levels", stream.heading_levels)):
+        fp.write("," + newline + pad + '"' + key + '"' + key_sep + _nest(dumps(value, indent), indent, 1))
+    fp.write("," + newline + pad + '"stats"' + key_sep + _nest(stdlib_dumps(stream.stats, indent), indent, 1))
+    fp.write(newline + "}")
+
+
+def write_jsonl(stream: "DocumentStream", fp: TextIO, dumps: Dumps = stdlib_dumps) -> None:
+    """
+    Write a document as JSON Lines, one section per line.
+
+    The first line holds ``title``, ``font_histogram`` and ``heading_levels``; each
+    section follows on its own line; the last line holds ``stats``.
+
+    Args:
+        stream (DocumentStream): Open extraction stream
+        fp (TextIO): Text file object to write to
+        dumps (Callable): JSON backend from pdf_to_json.serialization.get_dumps
+    """
+    header = {
+        "title": stream.title,
+        "font_histogram": stream.font_histogram,
+        "heading_levels": stream.heading_levels,
+    }
+    fp.write(dumps(header, None) + "\n")
+    for section in stream.sections:
+        fp.write(dumps(section, None) + "\n")
+    fp.write(stdlib_dumps({"stats": stream.stats}) + "\n")
+
+
+def write_pretty(stream: "DocumentStream", fp: TextIO, dumps: Dumps = stdlib_dumps) -> None:
+    """Write indented JSON (two spaces), the default output format."""
+    write_json(stream, fp, indent = 2, dumps = dumps)
+
+
+def write_compact(stream: "DocumentStream", fp: TextIO, dumps: Dumps = stdlib_dumps) -> None:
+    """Write JSON without insignificant whitespace."""
+    write_json(stream, fp, indent = None, dumps = dumps)
+
+
+# Writers are called as writer(stream, fp, dumps=...)
+Writer = Callable[..., None]
+
+_WRITERS: Dict[str, Writer] = {
+    "pretty": write_pretty,
+    "compact": write_compact,
+    "jsonl": write_jsonl,
+}
+
+
+def register_format(name: str, writer: Writer) -> None:
+    """
+    Register an output format for extract_pdf_to_file and the CLI's --format option.
+
+    Args:
+        name (str): Format name
+        writer (Callable): Function ``writer(stream, fp, dumps)`` writing a DocumentStream to a
+            text file object, where ``dumps`` is the configured JSON backend
+    """
+    _WRITERS[name] = writer
+
+
+def available_formats() -> List[str]:
+    """Return the names of the registered output formats."""
+    return sorted(_WRITERS)
+
+
+def get_writer(name: str) -> Writer:
+    """
+    Return the writer registered for an output format.
+
+    Raises:
+        ValueError: If no writer is registered under ``name``
+    """
+    try:
+        return _WRITERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown output format: {name}") from None
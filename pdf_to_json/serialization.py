@@ -0,0 +1,95 @@
+"""
+JSON encoding backends.
+
+The stdlib json module is always available; orjson and msgspec are used when they are
+installed and selected, either by name or with "auto". For strings, integers, lists,
+dicts and None the fast backends produce exactly what
+``json.dumps(obj, ensure_ascii=False)`` produces, compact or with an indent of 2.
+They format floats in exponent notation differently (``1e-5`` vs ``1e-05``), so
+callers encode float-bearing values such as ``stats`` with stdlib_dumps.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional
+
+Dumps = Callable[[Any, Optional[int]], str]
+
+JSON_BACKENDS = ("auto", "json", "orjson", "msgspec")
+
+
+def stdlib_dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """Encode with the stdlib json module (compact when ``indent`` is None)."""
+    if indent:
+        return json.dumps(obj, ensure_ascii = False, indent = indent)
+    return json.dumps(obj, ensure_ascii = False, separators = (',', ':'))
+
+
+def _orjson_dumps() -> Dumps:
+    """Return an encoder backed by orjson."""
+    import orjson
+
+    def dumps(obj: Any, indent: Optional[int] = None) -> str:
+        if indent and indent != 2:
+            return stdlib_dumps(obj, indent)
+        try:
+            return orjson.dumps(obj, option = orjson.OPT_INDENT_2 if indent else 0).decode()
+        except TypeError:
+            # Lone surrogates and other input orjson rejects
+            return stdlib_dumps(obj, indent)
+
+    return dumps
+
+
+def _msgspec_dumps() -> Dumps:
+    """Return an encoder backed by msgspec."""
+    import msgspec
+
+    encode = msgspec.json.Encoder().encode
+
+    def dumps(obj: Any, indent: Optional[int] = None) -> str:
+        try:
+            data = encode(obj)
+        except (TypeError, ValueError):
+            # Lone surrogates and other input msgspec rejects
+            return stdlib_dumps(obj, indent)
+        if indent:
+            data = msgspec.json.format(data, indent = indent)
+        return data.decode()
+
+    return dumps
+
+
+_LOADERS: Dict[str, Callable[[], Dumps]] = {
+    "orjson": _orjson_dumps,
+    "msgspec": _msgspec_dumps,
+}
+
+
+def get_dumps(backend: str = "auto") -> Dumps:
+    """
+    Return the encoder for a JSON backend.
+
+    Args:
+        backend (str): "json", "orjson", "msgspec", or "auto" for the fastest installed one
+
+    Returns:
+        Callable: Function ``dumps(obj, indent=None) -> str``
+
+    Raises:
+        ValueError: If the backend is unknown, or was requested by name and is not installed
+    """
+    if backend == "json":
+        return stdlib_dumps
+    if backend == "auto":
+        for loader in _LOADERS.values():
+            try:
+                return loader()
+            except ImportError:
+                continue
+        return stdlib_dumps
+    if backend not in _LOADERS:
+        raise ValueError(f"Unknown JSON backend: {backend} (choose from {', '.join(JSON_BACKENDS)})")
+    try:
+        return _LOADERS[backend]()
+    except ImportError:
+        raise ValueError(f"JSON backend '{backend}' is not installed") from None
@@ -0,0 +1,454 @@
+"""
+Long-running extraction service backed by a pool of warm worker processes.
+
+``pdf_to_json serve`` answers HTTP requests on localhost or on a Unix socket. The
+worker processes import PyMuPDF and this library and run one throwaway extraction
+when they start, so each request pays only for its own document instead of an
+interpreter start-up, imports and MuPDF's font initialisation.
+
+Endpoints:
+    POST /extract   Body: ``{"path": "..."}`` (Content-Type: application/json) or
+                    the raw PDF bytes. Query parameters: ``pages`` (1-based, e.g.
+                    ``1-5,8``), ``max_sections``, ``stop_after_heading`` and
+                    ``outline=1``. Responds with the compact JSON result.
+    GET /health     Worker count and the number of requests in progress.
+
+Errors are reported as ``{"error": "..."}`` with status 400 (bad request), 404
+(file not found), 413 (upload too large), 422 (invalid PDF), 500 (processing
+failure), 503 (queue full; retry later) or 504 (request timed out).
+"""
+
+import argparse
+import http.server
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import socketserver
+import stat
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pymupdf as fitz
+
+from . import __version__
+from .batch import _pool_workers
+from .cli import parse_page_spec
+from .config import Config
+from .exceptions import (
+    ExtractionTimeoutError,
+    InvalidPDFError,
+    PageRangeError,
+    PDFFileNotFoundError,
+    PDFProcessingError,
+    PdfToJsonError,
+    ServerBusyError,
+)
+from .extractor import PDFStructureExtractor
+from .output import dumps_result
+from .serialization import get_dumps, stdlib_dumps
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _warm_up(extractor: PDFStructureExtractor) -> None:
+    """Extract a one-line in-memory page so MuPDF loads its fonts before the first request."""
+    doc = fitz.open()
+    try:
+        page = doc.new_page()
+        page.insert_text((50, 60), "pdf_to_json", fontsize = 11)
+        extractor._parse_page(page)
+    finally:
+        doc.close()
+
+
+def _run_job(extractor: PDFStructureExtractor, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one extraction job as sent by WorkerPool.run."""
+    if job.get("outline"):
+        return extractor.extract_outline(job["source"])
+    return extractor.extract_text_with_structure(job["source"], **job.get("options", {}))
+
+
+def _worker_main(conn, config: Config) -> None:
+    """Worker process loop: answer jobs received on ``conn`` until it is closed."""
+    # Interrupts go to the server process, which shuts the workers down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.disable(logging.INFO)
+    extractor = PDFStructureExtractor(config)
+    dumps = get_dumps(config.JSON_BACKEND)
+    _warm_up(extractor)
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        try:
+            reply = (200, dumps_result(_run_job(extractor, job), None, dumps))
+        except PDFFileNotFoundError as e:
+            reply = (404, str(e))
+        except InvalidPDFError as e:
+            reply = (422, str(e))
+        except (ValueError, PageRangeError) as e:
+            reply = (400, str(e))
+        except PdfToJsonError as e:
+            reply = (500, str(e))
+        except Exception as e:
+            reply = (500, f"Unexpected error: {e}")
+        try:
+            conn.send(reply)
+        except (BrokenPipeError, OSError):
+            return
+
+
+class WorkerPool:
+    """
+    Fixed set of warm extraction processes shared by request threads.
+
+    Idle workers wait in a queue; a request takes one, sends it the job over a pipe
+    and waits for the reply. Up to ``max_queue`` requests beyond the pool size wait
+    for a worker to become free and any more are refused at once. A worker that
+    overruns the request timeout is killed and replaced, so a pathological document
+    cannot hold on to it.
+    """
+
+    def __init__(self, size: int, config: Config, max_queue: int = 32):
+        self.size = size
+        self.config = config
+        # Workers are also started from request threads, where forking is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[Tuple[Any, Any]]" = queue.Queue()
+        self._slots = threading.BoundedSemaphore(size + max_queue)
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._pending = 0
+        for _ in range(size):
+            self._idle.put(self._start_worker())
+
+    @property
+    def pending(self) -> int:
+        """Number of requests running or waiting for a worker."""
+        return self._pending
+
+    def _start_worker(self) -> Tuple[Any, Any]:
+        """Start a worker process and return it with the parent end of its pipe."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target = _worker_main, args = (child_conn, self.config), daemon = True)
+        process.start()
+        child_conn.close()
+        with self._lock:
+            self._workers.add((process, parent_conn))
+        return process, parent_conn
+
+    def _replace_worker(self, worker: Tuple[Any, Any]) -> Tuple[Any, Any]:
+        """Kill a worker and return a freshly started one."""
+        process, conn = worker
+        with self._lock:
+            self._workers.discard(worker)
+        process.kill()
+        process.join()
+        conn.close()
+        return self._start_worker()
+
+    def run(self, job: Dict[str, Any], timeout: float) -> Tuple[int, str]:
+        """
+        Run a job on the next free worker.
+
+        Args:
+            job (Dict[str, Any]): ``{"source": path or PDF bytes, "outline": bool, "options": {...}}``
+            timeout (float): Seconds allowed for waiting plus extraction
+
+        Returns:
+            Tuple[int, str]: HTTP status and the JSON result (or error message)
+
+        Raises:
+            ServerBusyError: If the queue of waiting requests is full
+            ExtractionTimeoutError: If the request does not finish within ``timeout``
+            PDFProcessingError: If the worker process dies while extracting
+        """
+        if not self._slots.acquire(blocking = False):
+            raise ServerBusyError("Server is busy; retry later")
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self._pending += 1
+        try:
+            try:
+                worker = self._idle.get(timeout = timeout)
+            except queue.Empty:
+                raise ExtractionTimeoutError(f"No worker became free within {timeout:g} seconds") from None
+            try:
+                conn = worker[1]
+                conn.send(job)
+                if not conn.poll(max(deadline - time.monotonic(), 0.0)):
+                    worker = self._replace_worker(worker)
+                    raise ExtractionTimeoutError(f"Extraction exceeded {timeout:g} seconds")
+                return conn.recv()
+            except (EOFError, OSError):
+                worker = self._replace_worker(worker)
+                raise PDFProcessingError("Worker process exited unexpectedly") from None
+            finally:
+                self._idle.put(worker)
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def close(self) -> None:
+        """Stop all worker processes."""
+        with self._lock:
+            workers, self._workers = self._workers, set()
+        for process, conn in workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process, conn in workers:
+            process.join(timeout = 1)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            conn.close()
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    """HTTP front end of the extraction service."""
+
+    server_version = f"pdf_to_json/{__version__}"
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: int, body: str, headers: Optional[Dict[str, str]] = None) -> None:
+        """Send a JSON response."""
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        """Send an ``{"error": ...}`` response."""
+        self._send(status, stdlib_dumps({"error": message}), headers)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/health":
+            self._send_error(404, "Not found")
+            return
+        pool = self.server.pool
+        self._send(200, stdlib_dumps({"status": "ok", "workers": pool.size, "pending": pool.pending}))
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/extract":
+            self.close_connection = True
+            self._send_error(404, "Not found")
+            return
+        # The body is only read once its length is known to be within bounds; a missing,
+        # negative or malformed length would otherwise read until the client disconnects
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_error(400, "Missing or invalid Content-Length")
+            return
+        if length > self.server.max_upload_bytes:
+            self.close_connection = True
+            self._send_error(413, "Request body too large")
+            return
+        body = self.rfile.read(length)
+
+        try:
+            job = _parse_query(url.query)
+        except (ValueError, argparse.ArgumentTypeError) as e:
+            self._send_error(400, str(e))
+            return
+
+        if self.headers.get_content_type() == "application/json":
+            try:
+                job["source"] = os.path.abspath(json.loads(body)["path"])
+            except (ValueError, KeyError, TypeError):
+                self._send_error(400, 'Expected a JSON body of the form {"path": "..."}')
+                return
+        elif body:
+            job["source"] = body
+        else:
+            self._send_error(400, "Empty request body")
+            return
+
+        try:
+            status, text = self.server.pool.run(job, self.server.request_timeout)
+        except ServerBusyError as e:
+            self._send_error(503, str(e), {"Retry-After": "1"})
+            return
+        except ExtractionTimeoutError as e:
+            self._send_error(504, str(e))
+            return
+        except PdfToJsonError as e:
+            self._send_error(500, str(e))
+            return
+
+        if status == 200:
+            self._send(200, text)
+        else:
+            self._send_error(status, text)
+
+
+def _parse_query(query: str) -> Dict[str, Any]:
+    """Translate /extract query parameters into a worker job."""
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    unknown = set(params) - {"pages", "max_sections", "stop_after_heading", "outline"}
+    if unknown:
+        raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+
+    options = {}
+    if "pages" in params:
+        options["pages"] = parse_page_spec(params["pages"])
+    if "max_sections" in params:
+        options["max_sections"] = int(params["max_sections"])
+    if "stop_after_heading" in params:
+        options["stop_after_heading"] = params["stop_after_heading"]
+    outline = params.get("outline", "0").lower() in ("1", "true", "yes")
+    if outline and options:
+        raise ValueError("outline does not take page or stop options")
+    return {"outline": outline, "options": options}
+
+
+class _ServiceMixin:
+    """Pool ownership and limits shared by the TCP and Unix socket servers."""
+
+    daemon_threads = True
+
+    def _setup_service(self, pool: WorkerPool, request_timeout: float, max_upload_bytes: int) -> None:
+        self.pool = pool
+        self.request_timeout = request_timeout
+        self.max_upload_bytes = max_upload_bytes
+
+    def close(self) -> None:
+        """Stop accepting requests and shut down the worker pool."""
+        self.server_close()
+        self.pool.close()
+
+
+class ExtractionServer(_ServiceMixin, socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """Extraction service listening on a TCP address."""
+
+
+def _socket_identity(path: str) -> Optional[Tuple[int, int]]:
+    """Return (device, inode) of the Unix socket at ``path``, or None when there is none."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISSOCK(st.st_mode):
+        raise ValueError(f"Cannot listen on '{path}': path exists and is not a socket")
+    return st.st_dev, st.st_ino
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class UnixExtractionServer(_ServiceMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Extraction service listening on a Unix domain socket."""
+
+        _bound: Optional[Tuple[int, int]] = None
+
+        def server_bind(self) -> None:
+            super().server_bind()
+            self._bound = _socket_identity(self.server_address)
+
+        def server_close(self) -> None:
+            super().server_close()
+            # Remove the socket file only if it is still the one this server created
+            try:
+                bound = _socket_identity(self.server_address)
+            except ValueError:
+                return
+            if bound is not None and bound == self._bound:
+                os.unlink(self.server_address)
+                self._bound = None
+
+
+def create_server(config: Optional[Config] = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  socket_path: Optional[str] = None, workers: Optional[int] = None):
+    """
+    Start a worker pool and bind an extraction server to it (without serving yet).
+
+    Call ``serve_forever()`` on the result to handle requests and ``close()`` to
+    release the socket and stop the workers.
+
+    Args:
+        config (Config, optional): Configuration for the workers and service limits
+        host (str): Interface to listen on; the service has no authentication, so keep it local
+        port (int): TCP port (0 picks a free one)
+        socket_path (str, optional): Listen on this Unix socket instead of TCP. A stale
+            socket at that path is replaced; any other file is left alone.
+        workers (int, optional): Number of worker processes. Defaults to one per CPU.
+
+    Returns:
+        ExtractionServer or UnixExtractionServer: The bound server
+
+    Raises:
+        ValueError: If ``socket_path`` exists and is not a socket, or the platform has
+            no Unix domain sockets
+    """
+    workers, config = _pool_workers(config, workers)
+    # Worker processes are daemonic and cannot start a page pool of their own
+    config.WORKERS = 1
+
+    if socket_path:
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix domain sockets are not available on this platform; use --host/--port")
+        if _socket_identity(socket_path) is not None:
+            os.unlink(socket_path)
+        server = UnixExtractionServer(socket_path, _RequestHandler)
+    else:
+        server = ExtractionServer((host, port), _RequestHandler)
+    try:
+        pool = WorkerPool(workers, config, max_queue = config.SERVE_MAX_QUEUE)
+    except BaseException:
+        server.server_close()
+        raise
+    server._setup_service(pool, config.SERVE_TIMEOUT, int(config.SERVE_MAX_UPLOAD_MB * 1024 * 1024))
+    return server
+
+
+def serve(config: Optional[Config] = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          socket_path: Optional[str] = None, workers: Optional[int] = None) -> None:
+    """
+    Run the extraction service until interrupted.
+
+    Args:
+        config (Config, optional): Configuration for the workers and service limits
+        host (str): Interface to listen on
+        port (int): TCP port
+        socket_path (str, optional): Listen on this Unix socket instead of TCP
+        workers (int, optional): Number of worker processes (see create_server)
+    """
+    server = create_server(config, host, port, socket_path, workers)
+    address = socket_path or "http://%s:%d" % server.server_address[:2]
+    logger.info(f"Serving on {address} with {server.pool.size} worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
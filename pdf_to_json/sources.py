@@ -0,0 +1,155 @@
+"""
+Opening PDFs given as paths, bytes-like objects or binary files.
+
+In-memory PDFs are handed to MuPDF as buffers without copying them. Files on disk
+(and file objects backed by one) are memory-mapped when Config.MMAP_FILES is set, so
+MuPDF reads straight from the page cache instead of through buffered file reads.
+"""
+
+import io
+import mmap
+import os
+from typing import BinaryIO, Optional, Tuple, Union
+
+import pymupdf as fitz
+
+from .exceptions import PDFFileNotFoundError
+
+# Everything the extractor accepts as a PDF
+PDFInput = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, BinaryIO]
+
+
+# Attribute holding the views and mappings created for a document
+_OWNED_ATTR = "_pdf_to_json_buffers"
+
+
+def is_path(pdf) -> bool:
+    """True when ``pdf`` names a file rather than holding the PDF's contents."""
+    return isinstance(pdf, (str, os.PathLike))
+
+
+def check_input(pdf) -> None:
+    """
+    Validate a PDF input before opening it.
+
+    Raises:
+        PDFFileNotFoundError: If ``pdf`` is a path that does not exist
+        TypeError: If ``pdf`` is neither a path, a bytes-like object nor a binary file
+    """
+    if is_path(pdf):
+        if not os.path.exists(pdf):
+            raise PDFFileNotFoundError(f"PDF file not found: {os.fspath(pdf)}")
+    elif not isinstance(pdf, (bytes, bytearray, memoryview)) and not hasattr(pdf, "read"):
+        raise TypeError(f"Expected a path, bytes-like object or binary file, got {type(pdf).__name__}")
+
+
+def describe(pdf) -> str:
+    """Return a short name for ``pdf`` in log messages."""
+    if is_path(pdf):
+        return os.fspath(pdf)
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        return f"<{memoryview(pdf).nbytes} bytes>"
+    return getattr(pdf, "name", None) or f"<{type(pdf).__name__}>"
+
+
+def _release(owned: tuple) -> None:
+    """Release views and mappings created for a document, views first."""
+    for obj in owned:
+        if isinstance(obj, memoryview):
+            obj.release()
+        else:
+            obj.close()
+
+
+def _map_file(f, offset: int = 0) -> Optional[Tuple[memoryview, tuple]]:
+    """Memory-map an open file read-only from ``offset``, or return None when it cannot be mapped."""
+    try:
+        mapping = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        # Empty files, pipes and sockets, or no file descriptor at all
+        return None
+    base = memoryview(mapping)
+    view = base[offset:]
+    return view, (view, base, mapping)
+
+
+def _buffer(pdf, mmap_files: bool) -> Tuple[Union[bytes, memoryview], tuple]:
+    """Return the PDF contents as a buffer, with the objects created for it that must be released."""
+    if isinstance(pdf, bytes):
+        return pdf, ()
+    if isinstance(pdf, (bytearray, memoryview)):
+        view = memoryview(pdf)
+        if not view.contiguous:
+            return view.tobytes(), ()
+        # A byte view also keeps a bytearray from being resized while MuPDF reads it
+        flat = view.cast("B")
+        return flat, (flat, view)
+    if isinstance(pdf, io.BytesIO):
+        view = pdf.getbuffer()[pdf.tell():]
+        return view, (view,)
+    if mmap_files:
+        try:
+            offset = pdf.tell()
+        except (OSError, AttributeError, io.UnsupportedOperation):
+            offset = None
+        if offset is not None:
+            mapped = _map_file(pdf, offset)
+            if mapped is not None:
+                return mapped
+    data = pdf.read()
+    if not isinstance(data, (bytes, bytearray)):
+        raise TypeError(f"Expected a binary file, but read() returned {type(data).__name__}")
+    return bytes(data), ()
+
+
+def open_document(pdf: PDFInput, mmap_files: bool = True) -> fitz.Document:
+    """
+    Open a PDF from a path, bytes-like object or binary file.
+
+    Bytes-like inputs are used in place; file objects are read (or mapped) from their
+    current position. Paths keep their name on the document, so parallel workers can
+    reopen it.
+
+    Args:
+        pdf (PDFInput): The PDF to open
+        mmap_files (bool): Memory-map files on disk when possible
+
+    Returns:
+        fitz.Document: The open document, to be closed with close_document
+
+    Raises:
+        fitz.FileDataError: If the data is not a readable PDF
+        TypeError: If ``pdf`` is not a supported input
+    """
+    if is_path(pdf):
+        path = os.fspath(pdf)
+        if mmap_files:
+            with open(path, "rb") as f:
+                mapped = _map_file(f)
+            if mapped is not None:
+                return _open_buffer(path, *mapped)
+        return fitz.open(path)
+    return _open_buffer(None, *_buffer(pdf, mmap_files))
+
+
+def _open_buffer(filename: Optional[str], buffer, owned: tuple) -> fitz.Document:
+    """Open a document over ``buffer``, remembering ``owned`` for close_document."""
+    try:
+        doc = fitz.open(filename, stream = buffer, filetype = "pdf")
+    except BaseException:
+        _release(owned)
+        raise
+    if owned:
+        setattr(doc, _OWNED_ATTR, owned)
+    return doc
+
+
+def close_document(doc: fitz.Document) -> None:
+    """Close a document from open_document and release the buffers mapped for it; safe to call twice."""
+    if not doc.is_closed:
+        doc.close()
+    owned = vars(doc).pop(_OWNED_ATTR, ())
+    if owned:
+        # The document keeps a reference to its stream, which would block the release
+        doc.stream = None
+        _release(owned)
@@ -59,6 +59,11 @@ setup(
     python_requires=">=3.8",
     install_requires=read_requirements(),
     extras_require={
+        "fast": [
+            "orjson>=3.9",
+            "msgspec>=0.18",
+            "numpy>=1.20",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
@@ -1,14 +1,53 @@
 """
-Pytest configuration and fixtures for pdf_to_json tests.
+Pytest configuration, fixtures and shared helpers for pdf_to_json tests.
 """
 
 import os
 import tempfile
 from unittest.mock import Mock
 
+import pymupdf as fitz
 import pytest
 
 
+def pdf_bytes(pages):
+    """
+    Build a PDF with one page per entry of ``pages``.
+
+    Each page is ``(heading, *body_lines)``: the heading is set at 18pt, the body lines
+    at 11pt below it. A heading of None leaves the page with body text only.
+    """
+    doc = fitz.open()
+    for heading, *body_lines in pages:
+        page = doc.new_page()
+        if heading is not None:
+            page.insert_text((50, 60), heading, fontsize = 18)
+        for n, text in enumerate(body_lines):
+            page.insert_text((50, 100 + 14 * n), text, fontsize = 11)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def write_pdf(path, pages):
+    """Write the PDF built by pdf_bytes to ``path``."""
+    with open(path, "wb") as f:
+        f.write(pdf_bytes(pages))
+
+
+def titled_pages(title):
+    """Pages of a two-page document: a titled first page and an untitled second one."""
+    return [(title, "Body text"), (None, "Second page")]
+
+
+def without_timing(result, *stats):
+    """Return ``result`` without the timing stats, and without ``stats`` if given."""
+    dropped = {"processing_time", *stats}
+    result = dict(result)
+    result["stats"] = {k: v for k, v in result["stats"].items() if k not in dropped}
+    return result
+
+
 @pytest.fixture
 def sample_pdf():
     """Create a temporary PDF file for testing."""
@@ -0,0 +1,131 @@
+"""
+Unit tests for the pdf_to_json asyncio interface.
+"""
+
+import asyncio
+
+import pytest
+
+import pdf_to_json
+from pdf_to_json import AsyncExtractor, PDFStructureExtractor, aextract_many, aextract_pdf_to_dict
+from pdf_to_json.exceptions import PDFFileNotFoundError
+
+from .conftest import titled_pages, without_timing, write_pdf
+
+
+class _AsyncStream:
+    """Minimal async binary stream, like aiofiles or a request body."""
+
+    def __init__(self, data):
+        self.data = data
+
+    async def read(self):
+        await asyncio.sleep(0)
+        return self.data
+
+
+class TestAsyncAPI:
+    """Test cases for aextract_pdf_to_dict, aextract_many and AsyncExtractor."""
+
+    def test_exports(self):
+        """Test that the async API is exported from the package."""
+        for name in ["aextract_pdf_to_dict", "aextract_many", "AsyncExtractor"]:
+            assert name in pdf_to_json.__all__
+
+    def test_aextract_sources_match_sync(self, tmp_path):
+        """Test that paths, bytes and async streams give the synchronous result."""
+        pdf_path = tmp_path / "doc.pdf"
+        write_pdf(str(pdf_path), titled_pages("Async Title"))
+        data = pdf_path.read_bytes()
+        expected = without_timing(PDFStructureExtractor().extract_text_with_structure(str(pdf_path)))
+
+        async def run():
+            return await asyncio.gather(
+                aextract_pdf_to_dict(str(pdf_path)),
+                aextract_pdf_to_dict(pdf_path),
+                aextract_pdf_to_dict(data),
+                aextract_pdf_to_dict(memoryview(data)),
+                aextract_pdf_to_dict(_AsyncStream(data)),
+            )
+
+        for result in asyncio.run(run()):
+            assert without_timing(result) == expected
+
+    def test_aextract_options_and_errors(self, tmp_path):
+        """Test that options are forwarded and failures are raised to the caller."""
+        pdf_path = str(tmp_path / "doc.pdf")
+        write_pdf(pdf_path, titled_pages("Options"))
+
+        result = asyncio.run(aextract_pdf_to_dict(pdf_path, pages = [1]))
+        assert result["stats"]["pages_processed"] == [1]
+
+        with pytest.raises(PDFFileNotFoundError):
+            asyncio.run(aextract_pdf_to_dict(str(tmp_path / "missing.pdf")))
+        with pytest.raises(TypeError):
+            asyncio.run(aextract_pdf_to_dict(42))
+
+    def test_event_loop_stays_responsive(self, tmp_path):
+        """Test that extraction runs off the event loop thread."""
+        pdf_path = str(tmp_path / "doc.pdf")
+        write_pdf(pdf_path, titled_pages("Responsive"))
+
+        async def run():
+            task = asyncio.ensure_future(aextract_pdf_to_dict(pdf_path))
+            ticks = 0
+            while not task.done():
+                ticks += 1
+                await asyncio.sleep(0)
+            return ticks, await task
+
+        ticks, result = asyncio.run(run())
+        assert ticks > 1
+        assert result["title"] == "Responsive"
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_aextract_many(self, tmp_path, workers):
+        """Test the async batch with mixed sources and a failing input."""
+        paths = [str(tmp_path / f"doc{i}.pdf") for i in range(3)]
+        for i, path in enumerate(paths):
+            write_pdf(path, titled_pages(f"Document {i}"))
+        with open(paths[0], "rb") as f:
+            data = f.read()
+
+        async def sources():
+            for path in paths:
+                yield path
+            yield data
+            yield b"not a pdf"
+
+        async def run():
+            return [item async for item in aextract_many(sources(), workers = workers, max_concurrency = 2)]
+
+        results = {item.path: item for item in asyncio.run(run())}
+
+        assert set(results) == set(paths) | {"<input 3>", "<input 4>"}
+        for i, path in enumerate(paths):
+            assert results[path].ok
+            assert results[path].result["title"] == f"Document {i}"
+        assert results["<input 3>"].result["title"] == "Document 0"
+        assert not results["<input 4>"].ok
+
+    def test_cancellation_withdraws_queued_work(self, tmp_path):
+        """Test that cancelling a waiting call keeps it from being extracted."""
+        pdf_path = str(tmp_path / "doc.pdf")
+        write_pdf(pdf_path, titled_pages("Cancelled"))
+
+        async def run():
+            async with AsyncExtractor(workers = 1, max_concurrency = 1) as extractor:
+                first = asyncio.ensure_future(extractor.extract(pdf_path))
+                second = asyncio.ensure_future(extractor.extract(pdf_path))
+                await asyncio.sleep(0)
+                second.cancel()
+                result = await first
+                with pytest.raises(asyncio.CancelledError):
+                    await second
+                return result
+
+        assert asyncio.run(run())["title"] == "Cancelled"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -2,6 +2,7 @@
 Unit tests for pdf_to_json API functions.
 """
 
+import io
 import json
 import os
 import tempfile
@@ -9,7 +10,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from pdf_to_json import extract_pdf_to_dict, extract_pdf_to_json
+from pdf_to_json import DocumentStream, extract_pdf_to_dict, extract_pdf_to_file, extract_pdf_to_json, iter_sections
 from pdf_to_json.exceptions import PDFFileNotFoundError, PDFProcessingError
 
 
@@ -93,12 +94,14 @@ class TestAPI:
         mock_result = {
             "title": "Test Document",
             "sections": [{"level": "H1", "title": "Introduction", "paragraphs": ["Content"]}],
+            "font_histogram": {"12.0": 100},
+            "heading_levels": {"16.0": "H1"},
             "stats": {"page_count": 1, "processing_time": 1.0}
         }
 
         with patch('pdf_to_json.PDFStructureExtractor') as mock_extractor_class:
             mock_extractor = Mock()
-            mock_extractor.extract_text_with_structure.return_value = mock_result
+            mock_extractor.open_stream.return_value = DocumentStream.from_result(mock_result)
             mock_extractor_class.return_value = mock_extractor
 
             with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_pdf:
@@ -112,14 +115,67 @@ class TestAPI:
                 result_path = extract_pdf_to_json(pdf_path, json_path)
                 assert result_path == json_path
 
-                # Verify file was written
+                # Verify file was written, formatted exactly as the in-memory path would
                 with open(json_path, 'r', encoding='utf-8') as f:
-                    saved_result = json.load(f)
-                assert saved_result == mock_result
+                    saved = f.read()
+                assert json.loads(saved) == mock_result
+                assert saved == json.dumps(mock_result, ensure_ascii=False, indent=2)
             finally:
                 os.unlink(pdf_path)
                 os.unlink(json_path)
 
+    def test_extract_pdf_to_file_jsonl(self):
+        """Test JSONL output: header line, one line per section, stats line."""
+        mock_result = {
+            "title": "Test Document",
+            "sections": [
+                {"level": "H1", "title": "Introduction", "paragraphs": ["Content"]},
+                {"level": "H2", "title": "Details", "paragraphs": []}
+            ],
+            "font_histogram": {"12.0": 100},
+            "heading_levels": {"16.0": "H1"},
+            "stats": {"page_count": 1, "processing_time": 1.0}
+        }
+
+        with patch('pdf_to_json.PDFStructureExtractor') as mock_extractor_class:
+            mock_extractor = Mock()
+            mock_extractor.open_stream.return_value = DocumentStream.from_result(mock_result)
+            mock_extractor_class.return_value = mock_extractor
+
+            buffer = io.StringIO()
+            extract_pdf_to_file("document.pdf", buffer, output_format="jsonl")
+
+        records = [json.loads(line) for line in buffer.getvalue().splitlines()]
+        assert records[0] == {"title": "Test Document", "font_histogram": {"12.0": 100},
+                              "heading_levels": {"16.0": "H1"}}
+        assert records[1:3] == mock_result["sections"]
+        assert records[3] == {"stats": mock_result["stats"]}
+
+    def test_extract_pdf_to_file_failure_keeps_previous_file(self, tmp_path):
+        """Test that a failed extraction leaves the previous output file and no temporary file."""
+        def sections():
+            yield {"level": "H1", "title": "Introduction", "paragraphs": ["Content"]}
+            raise PDFProcessingError("Processing failed")
+
+        output_path = tmp_path / "output.json"
+        output_path.write_text('{"title": "Previous"}', encoding = "utf-8")
+
+        with patch('pdf_to_json.PDFStructureExtractor') as mock_extractor_class:
+            mock_extractor = Mock()
+            mock_extractor.open_stream.return_value = DocumentStream("Test Document", {}, {}, sections(), 1, 0.0)
+            mock_extractor_class.return_value = mock_extractor
+
+            with pytest.raises(PDFProcessingError):
+                extract_pdf_to_file("document.pdf", str(output_path))
+
+        assert output_path.read_text(encoding = "utf-8") == '{"title": "Previous"}'
+        assert os.listdir(tmp_path) == ["output.json"]
+
+    def test_extract_pdf_to_file_unknown_format(self):
+        """Test that an unknown output format is rejected."""
+        with pytest.raises(ValueError):
+            extract_pdf_to_file("document.pdf", io.StringIO(), output_format="xml")
+
     def test_extract_pdf_to_json_processing_error(self):
         """Test error handling for processing errors in JSON extraction."""
         with patch('pdf_to_json.PDFStructureExtractor') as mock_extractor_class:
@@ -137,6 +193,32 @@ class TestAPI:
             finally:
                 os.unlink(tmp_path)
 
+    def test_iter_sections(self):
+        """Test that iter_sections delegates to the extractor's generator."""
+        sections = [{"level": "H1", "title": "Introduction", "paragraphs": ["Content"]}]
+
+        with patch('pdf_to_json.PDFStructureExtractor') as mock_extractor_class:
+            mock_extractor = Mock()
+            mock_extractor.iter_sections.return_value = iter(sections)
+            mock_extractor_class.return_value = mock_extractor
+
+            assert list(iter_sections("document.pdf")) == sections
+            mock_extractor.iter_sections.assert_called_once_with("document.pdf")
+
+    def test_page_and_early_stop_options_forwarded(self):
+        """Test that page-range and early-stop options reach the extractor."""
+        with patch('pdf_to_json.PDFStructureExtractor') as mock_extractor_class:
+            mock_extractor = Mock()
+            mock_extractor.extract_text_with_structure.return_value = {"title": "T", "sections": []}
+            mock_extractor_class.return_value = mock_extractor
+
+            extract_pdf_to_dict("document.pdf", pages = range(2), max_sections = 3)
+            mock_extractor.extract_text_with_structure.assert_called_once_with(
+                "document.pdf", pages = range(2), max_sections = 3)
+
+            iter_sections("document.pdf", stop_after_heading = "Results")
+            mock_extractor.iter_sections.assert_called_once_with("document.pdf", stop_after_heading = "Results")
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
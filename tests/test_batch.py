@@ -0,0 +1,87 @@
+"""
+Unit tests for pdf_to_json batch extraction.
+"""
+
+import os
+
+import pytest
+
+from pdf_to_json import BatchResult, Config, batch, extract_many
+from pdf_to_json.batch import _pool_workers, find_pdf_paths
+
+from .conftest import write_pdf
+
+
+def _crash_on_broken(pdf_path, config):
+    """Stand-in for _extract_one whose worker process dies on broken.pdf."""
+    if pdf_path.endswith("broken.pdf"):
+        os._exit(1)
+    return BatchResult(pdf_path, result = {})
+
+
+class TestBatch:
+    """Test cases for extract_many and path discovery."""
+
+    def test_find_pdf_paths_directory(self, tmp_path):
+        """Test that a directory resolves to its PDF files, sorted."""
+        for name in ["b.pdf", "a.PDF", "notes.txt"]:
+            (tmp_path / name).write_bytes(b"x")
+
+        paths = find_pdf_paths(str(tmp_path))
+        assert [os.path.basename(p) for p in paths] == ["a.PDF", "b.pdf"]
+
+    def test_find_pdf_paths_glob(self, tmp_path):
+        """Test glob pattern resolution."""
+        (tmp_path / "one.pdf").write_bytes(b"x")
+        (tmp_path / "two.pdf").write_bytes(b"x")
+
+        paths = find_pdf_paths(str(tmp_path / "o*.pdf"))
+        assert [os.path.basename(p) for p in paths] == ["one.pdf"]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_extract_many_isolates_failures(self, tmp_path, workers):
+        """Test that a broken file is reported without stopping the batch."""
+        good = [str(tmp_path / f"doc{i}.pdf") for i in range(3)]
+        for i, path in enumerate(good):
+            write_pdf(path, [(f"Document {i}", "Body text")])
+        broken = str(tmp_path / "broken.pdf")
+        with open(broken, "wb") as f:
+            f.write(b"not a pdf")
+
+        results = list(extract_many(good + [broken], workers = workers))
+
+        assert len(results) == 4
+        assert all(isinstance(r, BatchResult) for r in results)
+        by_path = {r.path: r for r in results}
+        assert not by_path[broken].ok
+        assert by_path[broken].to_dict()["error"]
+        for i, path in enumerate(good):
+            assert by_path[path].ok
+            assert by_path[path].result["title"] == f"Document {i}"
+
+    def test_extract_many_survives_worker_crash(self, tmp_path, monkeypatch):
+        """Test that a dead worker is reported per file instead of aborting the batch."""
+        monkeypatch.setattr(batch, "_extract_one", _crash_on_broken)
+        paths = [str(tmp_path / name) for name in ["a.pdf", "broken.pdf", "b.pdf"]]
+
+        results = list(extract_many(paths, workers = 2))
+
+        assert sorted(r.path for r in results) == sorted(paths)
+        by_path = {r.path: r for r in results}
+        assert "Worker failed" in by_path[paths[1]].error
+
+    def test_pool_workers(self, monkeypatch):
+        """Test that pools default to one worker per CPU and keep Config.WORKERS only when run in-process."""
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        config = Config()
+        config.WORKERS = 3
+
+        workers, per_document = _pool_workers(config, None)
+        assert (workers, per_document.WORKERS) == (4, 1)
+        assert config.WORKERS == 3
+        workers, per_document = _pool_workers(config, 1)
+        assert (workers, per_document.WORKERS) == (1, 3)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,200 @@
+"""
+Unit tests for the pdf_to_json result and page caches.
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pymupdf as fitz
+import pytest
+
+from pdf_to_json.cache import PageCache, ResultCache
+from pdf_to_json.config import Config
+from pdf_to_json.extractor import PDFStructureExtractor
+
+from .conftest import write_pdf
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def test_key_depends_on_content_and_config(self, tmp_path):
+        """Test that the key changes with file bytes and output-affecting settings only."""
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"first version")
+        config = Config()
+        key = ResultCache.key_for(str(pdf_path), config)
+
+        assert ResultCache.key_for(str(pdf_path), Config()) == key
+
+        config.WORKERS = 8
+        assert ResultCache.key_for(str(pdf_path), config) == key
+
+        config.MIN_HEADING_FREQUENCY = 0.5
+        assert ResultCache.key_for(str(pdf_path), config) != key
+
+        pdf_path.write_bytes(b"second version")
+        assert ResultCache.key_for(str(pdf_path), Config()) != key
+
+    def test_key_accepts_non_contiguous_memoryview(self):
+        """Test that a strided memoryview hashes like the bytes it views."""
+        data = b"%PDF-1.7 strided"
+        view = memoryview(data * 2)[::2]
+        assert not view.c_contiguous
+
+        assert ResultCache.key_for(view, Config()) == ResultCache.key_for(view.tobytes(), Config())
+
+    def test_put_get_roundtrip(self, tmp_path):
+        """Test storing and loading a result."""
+        cache = ResultCache(str(tmp_path / "cache"), 1024 * 1024)
+        result = {"title": "Überschrift", "sections": []}
+
+        assert cache.get("abc") is None
+        cache.put("abc", result)
+        assert cache.get("abc") == result
+        assert not [name for name in os.listdir(cache.directory) if name.endswith(".tmp")]
+
+    def test_failed_put_keeps_previous_entry(self, tmp_path):
+        """Test that an entry that cannot be serialized leaves the previous one and no temporary file."""
+        cache = ResultCache(str(tmp_path / "cache"), 1024 * 1024)
+        cache.put("abc", {"title": "First"})
+
+        with pytest.raises(TypeError):
+            cache.put("abc", {"title": object()})
+
+        assert cache.get("abc") == {"title": "First"}
+        assert os.listdir(cache.directory) == ["abc.json"]
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entries are evicted first."""
+        cache = ResultCache(str(tmp_path / "cache"), 0)
+        payload = {"text": "x" * 100}
+        for key in ["a", "b", "c"]:
+            cache.put(key, payload)
+        now = time.time()
+        for age, key in [(30, "a"), (20, "b"), (10, "c")]:
+            os.utime(cache._path(key), (now - age, now - age))
+
+        cache.get("a")
+        cache.max_bytes = 2 * os.path.getsize(cache._path("a"))
+        cache.evict()
+
+        assert cache.get("a") == payload
+        assert cache.get("b") is None
+        assert cache.get("c") == payload
+
+    def test_extractor_uses_cache(self, tmp_path):
+        """Test that a repeated extraction is served from the cache."""
+        pdf_path = str(tmp_path / "doc.pdf")
+        write_pdf(pdf_path, [("Cached Title",)])
+
+        config = Config()
+        config.CACHE_DIR = str(tmp_path / "cache")
+        first = PDFStructureExtractor(config).extract_text_with_structure(pdf_path)
+
+        with patch('pdf_to_json.extractor.fitz.open') as mock_fitz_open:
+            second = PDFStructureExtractor(config).extract_text_with_structure(pdf_path)
+            mock_fitz_open.assert_not_called()
+
+        assert second == first
+        assert second["title"] == "Cached Title"
+
+
+
+def _write_remapped_pdf(path, text, shift):
+    """Write a one-page PDF whose font maps each character code to the character ``shift`` places on."""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 60), text, fontsize = 18)
+    if shift:
+        mappings = "\n".join(f"<{code:02X}> <{code + shift:04X}>" for code in range(32, 127))
+        cmap = (f"begincmap\n1 begincodespacerange\n<00> <FF>\nendcodespacerange\n"
+                f"95 beginbfchar\n{mappings}\nendbfchar\nendcmap")
+        cmap_xref = doc.get_new_xref()
+        doc.update_object(cmap_xref, "<<>>")
+        doc.update_stream(cmap_xref, cmap.encode())
+        doc.xref_set_key(page.get_fonts()[0][0], "ToUnicode", f"{cmap_xref} 0 R")
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture
+def page_cache_config():
+    """Config with the page cache on, starting from an empty process-wide cache."""
+    config = Config()
+    config.PAGE_CACHE_MB = 16
+    cache = PageCache.from_config(config)
+    cache.clear()
+    yield config
+    cache.clear()
+
+
+class TestPageCache:
+    """Test cases for PageCache."""
+
+    def test_lru_eviction_by_size(self):
+        """Test that the least recently used pages are evicted once the size bound is exceeded."""
+        spans = [(0, "x" * 50, 11.0, 0.0, 10.0)]
+        cache = PageCache(3 * 250)
+        for key in ["a", "b", "c"]:
+            cache.put((key, 0), spans)
+
+        assert cache.get(("a", 0)) is spans
+        cache.put(("d", 0), spans)
+
+        assert cache.get(("b", 0)) is None
+        assert [cache.get((key, 0)) is not None for key in "acd"] == [True, True, True]
+        assert cache.size == 3 * 250
+
+        cache.resize(250)
+        assert len(cache) == 1
+        assert cache.get(("d", 0)) is spans
+
+    def test_from_config_shares_one_cache(self):
+        """Test that extractors in a process share one cache, and a zero size disables it."""
+        config = Config()
+        config.PAGE_CACHE_MB = 1
+        shared = PageCache.from_config(config)
+        assert PageCache.from_config(config) is shared
+        config.PAGE_CACHE_MB = 0
+        assert PageCache.from_config(config) is None
+
+    def test_identical_pages_across_documents(self, tmp_path, page_cache_config):
+        """Test that pages shared by two documents are decoded once, with unchanged output."""
+        cover = ("Standard Terms", "Boilerplate shared by every contract")
+        first_path, second_path = str(tmp_path / "first.pdf"), str(tmp_path / "second.pdf")
+        write_pdf(first_path, [cover, ("Contract A", "Parties of A")])
+        write_pdf(second_path, [("Contract B", "Parties of B"), cover])
+
+        first = PDFStructureExtractor(page_cache_config).extract_text_with_structure(second_path)
+        assert first["stats"]["page_cache"] == {"hits": 0, "misses": 2}
+
+        with patch.object(PDFStructureExtractor, "_parse_page", autospec = True,
+                          side_effect = PDFStructureExtractor._parse_page) as parse_page:
+            result = PDFStructureExtractor(page_cache_config).extract_text_with_structure(first_path)
+        assert parse_page.call_count == 1
+        assert result["stats"]["page_cache"] == {"hits": 1, "misses": 1}
+
+        expected = PDFStructureExtractor().extract_text_with_structure(first_path)
+        for stats in (result["stats"], expected["stats"]):
+            stats.pop("processing_time")
+            stats.pop("page_cache", None)
+        assert result == expected
+
+    def test_font_mapping_distinguishes_pages(self, tmp_path, page_cache_config):
+        """Test that pages with the same content stream but another ToUnicode CMap are not shared."""
+        plain_path, remapped_path = str(tmp_path / "plain.pdf"), str(tmp_path / "remapped.pdf")
+        _write_remapped_pdf(plain_path, "Cover Page Alpha", 0)
+        _write_remapped_pdf(remapped_path, "Cover Page Alpha", 1)
+
+        assert PDFStructureExtractor(page_cache_config).extract_text_with_structure(plain_path)["title"] == \
+            "Cover Page Alpha"
+        result = PDFStructureExtractor(page_cache_config).extract_text_with_structure(remapped_path)
+
+        assert result["title"] == "Dpwfs!Qbhf!Bmqib"
+        assert result["stats"]["page_cache"] == {"hits": 0, "misses": 1}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -2,6 +2,7 @@
 Unit tests for pdf_to_json CLI.
 """
 
+import io
 import json
 import os
 import tempfile
@@ -9,8 +10,24 @@ from unittest.mock import patch
 
 import pytest
 
-from pdf_to_json.cli import main
+from pdf_to_json.cli import main, parse_page_spec
 from pdf_to_json.exceptions import PdfToJsonError
+from pdf_to_json.extractor import DocumentStream
+
+MOCK_RESULT = {
+    "title": "Test Document",
+    "sections": [{"level": "H1", "title": "Introduction", "paragraphs": ["Content"]}],
+    "font_histogram": {"12.0": 100, "16.0": 20},
+    "heading_levels": {"16.0": "H1"},
+    "stats": {"page_count": 1, "processing_time": 1.0}
+}
+
+
+def _mock_extractor(mock_extractor_class):
+    """Make the patched extractor class return streams replaying MOCK_RESULT."""
+    mock_extractor = mock_extractor_class.return_value
+    mock_extractor.open_stream.side_effect = lambda pdf_path: DocumentStream.from_result(json.loads(json.dumps(MOCK_RESULT)))
+    return mock_extractor
 
 
 class TestCLI:
@@ -24,35 +41,27 @@ class TestCLI:
         # This would normally be called with --help, but we're testing the argument parsing
         # The actual help test would require modifying sys.argv
 
-    @patch('pdf_to_json.cli.extract_pdf_to_json')
-    def test_cli_success_stdout(self, mock_extract):
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_success_stdout(self, mock_extractor_class, capsys):
         """Test successful CLI execution with stdout output."""
-        mock_result = '{"title": "Test Document", "sections": []}'
-        mock_extract.return_value = mock_result
+        mock_extractor = _mock_extractor(mock_extractor_class)
 
         with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
             tmp.write(b"pdf content")
             tmp_path = tmp.name
 
         try:
-            # Mock sys.argv to simulate command line arguments
-            with patch('sys.argv', ['pdf_to_json', tmp_path]):
-                with patch('sys.stdout') as mock_stdout:
-                    main()
-                    # Verify that JSON was written to stdout
-                    mock_stdout.write.assert_called()
+            main([tmp_path])
+            # Verify that pretty JSON was written to stdout
+            assert capsys.readouterr().out == json.dumps(MOCK_RESULT, ensure_ascii=False, indent=2) + "\n"
+            mock_extractor.open_stream.assert_called_once_with(tmp_path)
         finally:
             os.unlink(tmp_path)
 
-    @patch('pdf_to_json.cli.extract_pdf_to_dict')
-    def test_cli_success_file_output(self, mock_extract):
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_success_file_output(self, mock_extractor_class):
         """Test successful CLI execution with file output."""
-        mock_result = {
-            "title": "Test Document",
-            "sections": [{"level": "H1", "title": "Introduction", "paragraphs": ["Content"]}],
-            "stats": {"page_count": 1, "processing_time": 1.0}
-        }
-        mock_extract.return_value = mock_result
+        _mock_extractor(mock_extractor_class)
 
         with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_pdf:
             tmp_pdf.write(b"pdf content")
@@ -72,10 +81,11 @@ class TestCLI:
                     # Verify that JSON was written to file
                     with open(json_path, 'r', encoding='utf-8') as f:
                         saved_result = json.load(f)
-                    assert saved_result == mock_result
+                    assert saved_result == MOCK_RESULT
         finally:
             os.unlink(pdf_path)
-            os.unlink(json_path)
+            if os.path.exists(json_path):
+                os.unlink(json_path)
 
     def test_cli_file_not_found(self):
         """Test CLI error handling for non-existent file."""
@@ -86,10 +96,10 @@ class TestCLI:
                 # Verify error message was written to stderr
                 mock_stderr.write.assert_called()
 
-    @patch('pdf_to_json.cli.extract_pdf_to_dict')
-    def test_cli_processing_error(self, mock_extract):
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_processing_error(self, mock_extractor_class):
         """Test CLI error handling for processing errors."""
-        mock_extract.side_effect = PdfToJsonError("Processing failed")
+        mock_extractor_class.return_value.open_stream.side_effect = PdfToJsonError("Processing failed")
 
         with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
             tmp.write(b"pdf content")
@@ -105,32 +115,42 @@ class TestCLI:
         finally:
             os.unlink(tmp_path)
 
-    @patch('pdf_to_json.cli.extract_pdf_to_dict')
-    @patch('pdf_to_json.cli.extract_pdf_to_json')
-    def test_cli_compact_output(self, mock_extract_json, mock_extract_dict):
+    @pytest.mark.parametrize("flags", [['--compact'], ['--compact', '-o'], ['-f', 'jsonl'], ['--pretty']])
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_extracts_once(self, mock_extractor_class, flags, tmp_path, capsys):
+        """Test that every output mode runs exactly one extraction."""
+        mock_extractor = _mock_extractor(mock_extractor_class)
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"pdf content")
+        if flags[-1] == '-o':
+            flags = flags + [str(tmp_path / "out.json")]
+
+        main([str(pdf_path)] + flags)
+
+        mock_extractor.open_stream.assert_called_once_with(str(pdf_path))
+        mock_extractor.extract_text_with_structure.assert_not_called()
+
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_compact_output(self, mock_extractor_class, capsys):
         """Test CLI compact output option."""
-        mock_result = {"title": "Test", "sections": []}
-        mock_extract_dict.return_value = mock_result
-        mock_extract_json.return_value = '{"title": "Test", "sections": []}'
+        _mock_extractor(mock_extractor_class)
 
         with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
             tmp.write(b"pdf content")
             tmp_path = tmp.name
 
         try:
-            with patch('sys.argv', ['pdf_to_json', tmp_path, '--compact']):
-                with patch('sys.stdout') as mock_stdout:
-                    main()
-                    # Verify that JSON was written to stdout
-                    mock_stdout.write.assert_called()
+            main([tmp_path, '--compact'])
+            # Verify that compact JSON was written to stdout
+            expected = json.dumps(MOCK_RESULT, ensure_ascii=False, separators=(',', ':'))
+            assert capsys.readouterr().out == expected + "\n"
         finally:
             os.unlink(tmp_path)
 
-    @patch('pdf_to_json.cli.extract_pdf_to_json')
-    def test_cli_pretty_output(self, mock_extract):
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_pretty_output(self, mock_extractor_class):
         """Test CLI pretty output option."""
-        mock_result = '{"title": "Test", "sections": []}'
-        mock_extract.return_value = mock_result
+        _mock_extractor(mock_extractor_class)
 
         with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
             tmp.write(b"pdf content")
@@ -145,6 +165,146 @@ class TestCLI:
         finally:
             os.unlink(tmp_path)
 
+    def test_parse_page_spec(self):
+        """Test that 1-based page specifications become 0-based pages and slices."""
+        import argparse
+
+        assert parse_page_spec("3") == [2]
+        assert parse_page_spec("1-5,8") == [slice(0, 5), 7]
+        assert parse_page_spec("10-") == [slice(9, None)]
+        for spec in ["", "0", "5-2", "a-b", "-3"]:
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_page_spec(spec)
+
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_page_and_early_stop_options(self, mock_extractor_class, tmp_path, capsys):
+        """Test that --pages, --max-sections and --stop-after-heading reach the extractor."""
+        mock_extractor = mock_extractor_class.return_value
+        mock_extractor.open_stream.side_effect = lambda pdf_path, **options: DocumentStream.from_result(dict(MOCK_RESULT))
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"pdf content")
+
+        main([str(pdf_path), '--pages', '2-4', '--max-sections', '1', '--stop-after-heading', 'Intro'])
+
+        mock_extractor.open_stream.assert_called_once_with(
+            str(pdf_path), pages = [slice(1, 4)], max_sections = 1, stop_after_heading = "Intro")
+
+    @patch('pdf_to_json.cli.extract_outline')
+    def test_cli_outline(self, mock_extract_outline, tmp_path, capsys):
+        """Test that --outline prints the outline without a full extraction."""
+        outline = {"title": "T", "outline": [{"level": "H1", "title": "Intro", "page": 0}], "source": "toc"}
+        mock_extract_outline.return_value = outline
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"pdf content")
+
+        main([str(pdf_path), '--outline', '--compact'])
+
+        assert capsys.readouterr().out == json.dumps(outline, separators=(',', ':')) + "\n"
+        mock_extract_outline.assert_called_once()
+
+        with pytest.raises(SystemExit):
+            main([str(pdf_path), '--outline', '-f', 'jsonl'])
+
+    @patch('pdf_to_json.cli.extract_incremental')
+    def test_cli_incremental_index(self, mock_extract_incremental, tmp_path):
+        """Test that --index runs an incremental extraction with the given index file."""
+        mock_extract_incremental.return_value = MOCK_RESULT
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"pdf content")
+        output_path = tmp_path / "out.json"
+        index_path = str(tmp_path / "out.index")
+
+        main([str(pdf_path), '-o', str(output_path), '--index', index_path])
+
+        assert mock_extract_incremental.call_args.args[:2] == (str(pdf_path), index_path)
+        assert json.loads(output_path.read_text()) == MOCK_RESULT
+        with pytest.raises(SystemExit):
+            main([str(pdf_path), '--index', index_path, '--pages', '1'])
+
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_layout_profile(self, mock_extractor_class, tmp_path):
+        """Test that --save-layout saves the profile and --layout sets it in the configuration."""
+        mock_extractor = _mock_extractor(mock_extractor_class)
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"pdf content")
+        layout_path = str(tmp_path / "doc.layout")
+
+        main([str(pdf_path), '--save-layout', layout_path])
+        mock_extractor.extract_layout_profile.return_value.save.assert_called_once_with(layout_path)
+        mock_extractor.open_stream.assert_not_called()
+
+        main([str(pdf_path), '-o', str(tmp_path / "out.json"), '--layout', layout_path])
+        assert mock_extractor_class.call_args.args[0].LAYOUT_PROFILE == layout_path
+
+    @patch('pdf_to_json.PDFStructureExtractor')
+    def test_cli_reads_stdin(self, mock_extractor_class, capsys):
+        """Test that '-' extracts the PDF piped to standard input."""
+        mock_extractor = _mock_extractor(mock_extractor_class)
+        stdin = io.TextIOWrapper(io.BytesIO(b"pdf content"))
+
+        with patch('sys.stdin', stdin):
+            main(['-', '--compact'])
+
+        mock_extractor.open_stream.assert_called_once_with(stdin.buffer)
+        assert json.loads(capsys.readouterr().out) == MOCK_RESULT
+
+    @patch('pdf_to_json.cli.extract_many')
+    def test_cli_batch_jsonl_and_output_dir(self, mock_extract_many, tmp_path):
+        """Test the batch subcommand in JSONL and per-file output modes."""
+        from pdf_to_json.batch import BatchResult
+
+        for name in ["a.pdf", "b.pdf"]:
+            (tmp_path / name).write_bytes(b"pdf content")
+        a_path, b_path = str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")
+        mock_extract_many.side_effect = lambda paths, workers, config: iter([
+            BatchResult(a_path, result = {"title": "A", "sections": []}),
+            BatchResult(b_path, error = "Invalid PDF"),
+        ])
+
+        jsonl_path = tmp_path / "out.jsonl"
+        with pytest.raises(SystemExit):
+            main(['batch', str(tmp_path), '--jsonl', str(jsonl_path), '-j', '2'])
+        records = [json.loads(line) for line in jsonl_path.read_text(encoding='utf-8').splitlines()]
+        assert records == [
+            {"path": a_path, "result": {"title": "A", "sections": []}},
+            {"path": b_path, "error": "Invalid PDF"},
+        ]
+        assert mock_extract_many.call_args.kwargs["workers"] == 2
+
+        out_dir = tmp_path / "out"
+        with pytest.raises(SystemExit):
+            main(['batch', str(tmp_path / "*.pdf"), '-o', str(out_dir)])
+        assert os.listdir(out_dir) == ["a.json"]
+        with open(out_dir / "a.json", 'r', encoding='utf-8') as f:
+            assert json.load(f) == {"title": "A", "sections": []}
+
+    @patch('pdf_to_json.cli.extract_many')
+    def test_cli_batch_output_dir_mirrors_subdirectories(self, mock_extract_many, tmp_path):
+        """Test that inputs sharing a base name in different directories get separate output files."""
+        from pdf_to_json.batch import BatchResult
+
+        paths = []
+        for subdir in ["x", "y"]:
+            (tmp_path / "in" / subdir).mkdir(parents = True)
+            (tmp_path / "in" / subdir / "report.pdf").write_bytes(b"pdf content")
+            paths.append(str(tmp_path / "in" / subdir / "report.pdf"))
+        mock_extract_many.side_effect = lambda paths, workers, config: iter(
+            BatchResult(path, result = {"title": path, "sections": []}) for path in paths)
+        out_dir = tmp_path / "out"
+
+        main(['batch', str(tmp_path / "in" / "**" / "*.pdf"), '-o', str(out_dir)])
+
+        for subdir, path in zip(["x", "y"], paths):
+            with open(out_dir / subdir / "report.json", 'r', encoding='utf-8') as f:
+                assert json.load(f)["title"] == path
+
+        # Names that would still collide are refused before anything is extracted
+        (tmp_path / "in" / "x" / "report.PDF").write_bytes(b"pdf content")
+        mock_extract_many.reset_mock()
+        with pytest.raises(SystemExit):
+            main(['batch', str(tmp_path / "in" / "x"), '-o', str(out_dir)])
+        mock_extract_many.assert_not_called()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -6,11 +6,13 @@ import os
 import tempfile
 from unittest.mock import Mock, patch
 
+import pymupdf as fitz
 import pytest
 
 from pdf_to_json.config import Config
 from pdf_to_json.exceptions import PDFFileNotFoundError, PDFProcessingError
-from pdf_to_json.extractor import PDFStructureExtractor
+from pdf_to_json.extractor import FontInfo, PDFStructureExtractor
+from pdf_to_json.lines import LineStore
 
 
 class TestPDFStructureExtractor:
@@ -102,6 +104,320 @@ class TestPDFStructureExtractor:
         finally:
             os.unlink(tmp_path)
 
+    @patch('pdf_to_json.extractor.fitz.open')
+    def test_extract_text_with_structure_decodes_each_page_once(self, mock_fitz_open):
+        """Test that font analysis, title detection and line iteration share one decode per page."""
+        pages = []
+        for _ in range(3):
+            page = Mock()
+            page.get_text.return_value = {
+                "blocks": [{"lines": [{"spans": [{"text": "Title", "size": 16.0, "bbox": [0, 0, 100, 20]}]}]}]
+            }
+            pages.append(page)
+
+        mock_doc = Mock()
+        mock_doc.__len__ = Mock(return_value=len(pages))
+        mock_doc.__getitem__ = Mock(side_effect=lambda index: pages[index])
+        mock_fitz_open.return_value = mock_doc
+
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+            tmp.write(b"valid pdf content")
+            tmp_path = tmp.name
+
+        try:
+            result = self.extractor.extract_text_with_structure(tmp_path)
+            assert result["title"] == "Title"
+            for page in pages:
+                assert page.get_text.call_count == 1
+            assert self.extractor._span_tables == {}
+        finally:
+            os.unlink(tmp_path)
+
+    def test_parse_page_pools_fonts(self):
+        """Test that spans set in the same font share one FontInfo, and lines use its rounded size."""
+        page = Mock()
+        page.get_text.return_value = {"blocks": [{"lines": [
+            {"spans": [{"text": "Body", "size": 10.96, "font": "Times", "flags": 0, "bbox": [0, 0, 20, 10]},
+                       {"text": " text", "size": 10.96, "font": "Times", "flags": 0, "bbox": [20, 0, 40, 10]}]},
+            {"spans": [{"text": "More", "size": 10.96, "font": "Times", "flags": 0, "bbox": [0, 12, 20, 22]}]},
+        ]}]}
+
+        spans = self.extractor._parse_page(page)
+
+        assert [span.line for span in spans] == [0, 0, 1]
+        assert spans[0].font is spans[1].font is spans[2].font
+        assert spans[0].font == FontInfo(10.96, "Times", 0, 11.0)
+        lines = self.extractor._page_lines(0, spans)
+        assert lines.texts() == ["Body text", "More"]
+        assert list(lines.font_sizes) == [11.0, 11.0]
+
+    def test_worker_count(self):
+        """Test that parallel extraction only engages for large enough documents."""
+        config = Config()
+        config.WORKERS = 4
+        config.PARALLEL_MIN_PAGES = 10
+        extractor = PDFStructureExtractor(config)
+
+        assert extractor._worker_count(5) == 1
+        assert extractor._worker_count(10) == 4
+        config.WORKERS = 1
+        assert extractor._worker_count(1000) == 1
+
+    @pytest.mark.parametrize("font_sampling", ["first", "stratified", "full"])
+    def test_parallel_extraction_matches_serial(self, tmp_path, font_sampling):
+        """Test that the process-pool path produces the same output as the serial path."""
+        pdf_path = str(tmp_path / "multi.pdf")
+        doc = fitz.open()
+        for page_num in range(6):
+            page = doc.new_page()
+            page.insert_text((50, 60), f"Heading {page_num}", fontsize = 18)
+            page.insert_text((50, 100), f"Body text on page {page_num}", fontsize = 11)
+            page.insert_text((50, 114), "continued body text", fontsize = 11)
+        doc.save(pdf_path)
+        doc.close()
+
+        config = Config()
+        config.MAX_PAGES_FOR_FONT_ANALYSIS = 2
+        config.FONT_SAMPLING = font_sampling
+        serial = PDFStructureExtractor(config).extract_text_with_structure(pdf_path)
+
+        config.WORKERS = 2
+        config.PARALLEL_MIN_PAGES = 1
+        parallel = PDFStructureExtractor(config).extract_text_with_structure(pdf_path)
+
+        serial.pop("stats")
+        parallel.pop("stats")
+        assert parallel == serial
+
+    def test_chunked_processing_releases_store(self, tmp_path):
+        """Test that chunk mode empties the MuPDF store after every CHUNK_SIZE pages."""
+        pdf_path = str(tmp_path / "chunked.pdf")
+        doc = fitz.open()
+        for page_num in range(5):
+            doc.new_page().insert_text((50, 60), f"Page {page_num}", fontsize = 11)
+        doc.save(pdf_path)
+        doc.close()
+
+        config = Config()
+        config.PROCESS_PAGES_IN_CHUNKS = True
+        config.CHUNK_SIZE = 2
+        extractor = PDFStructureExtractor(config)
+        expected = PDFStructureExtractor().extract_text_with_structure(pdf_path)
+
+        with patch.object(fitz.TOOLS, 'store_shrink') as mock_shrink:
+            result = extractor.extract_text_with_structure(pdf_path)
+
+        assert mock_shrink.call_count == 2
+        assert result["sections"] == expected["sections"]
+
+    def test_iter_sections_matches_extract(self, tmp_path):
+        """Test that streamed sections equal the sections of a full extraction."""
+        pdf_path = str(tmp_path / "stream.pdf")
+        doc = fitz.open()
+        for page_num in range(3):
+            page = doc.new_page()
+            page.insert_text((50, 40), "Preamble text", fontsize = 11)
+            page.insert_text((50, 80), f"Heading {page_num}", fontsize = 18)
+            page.insert_text((50, 120), f"Body text on page {page_num}", fontsize = 11)
+        doc.save(pdf_path)
+        doc.close()
+
+        sections = self.extractor.iter_sections(pdf_path)
+        first = next(sections)
+        assert first == {"level": "content", "title": None, "paragraphs": ["Preamble text"]}
+
+        streamed = [first] + list(sections)
+        assert streamed == self.extractor.extract_text_with_structure(pdf_path)["sections"]
+
+    def test_open_stream_stats_after_exhaustion(self, tmp_path):
+        """Test that a stream exposes the header up front and stats once consumed."""
+        pdf_path = str(tmp_path / "stream.pdf")
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((50, 60), "Heading", fontsize = 18)
+        page.insert_text((50, 100), "Body text", fontsize = 11)
+        doc.save(pdf_path)
+        doc.close()
+
+        expected = self.extractor.extract_text_with_structure(pdf_path)
+        with self.extractor.open_stream(pdf_path) as stream:
+            assert stream.title == expected["title"]
+            assert stream.heading_levels == expected["heading_levels"]
+            assert stream.stats is None
+            sections = list(stream.sections)
+
+        result = stream.to_dict(sections)
+        result["stats"].pop("processing_time")
+        expected["stats"].pop("processing_time")
+        assert result == expected
+
+    @staticmethod
+    def _heading_per_page_pdf(path, page_count):
+        """Write a PDF with one heading and one body line per page."""
+        doc = fitz.open()
+        for page_num in range(page_count):
+            page = doc.new_page()
+            page.insert_text((50, 60), f"Heading {page_num}", fontsize = 18)
+            page.insert_text((50, 100), f"Body text on page {page_num}", fontsize = 11)
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_page_selection_decodes_only_selected_pages(self, tmp_path):
+        """Test that pages outside the selection are never decoded."""
+        pdf_path = self._heading_per_page_pdf(str(tmp_path / "pages.pdf"), 6)
+
+        parse_page = PDFStructureExtractor._parse_page
+        decoded = []
+
+        def record_parse(extractor, page):
+            decoded.append(page.number)
+            return parse_page(extractor, page)
+
+        with patch.object(PDFStructureExtractor, '_parse_page', record_parse):
+            result = self.extractor.extract_text_with_structure(pdf_path, pages = [4, 1, slice(5, None)])
+
+        assert sorted(decoded) == [1, 4, 5]
+        assert [section["title"] for section in result["sections"]] == ["Heading 1", "Heading 4", "Heading 5"]
+        assert result["title"] == "Heading 1"
+        assert result["stats"]["pages_processed"] == [1, 4, 5]
+
+        decoded.clear()
+        with patch.object(PDFStructureExtractor, '_parse_page', record_parse):
+            result = self.extractor.extract_text_with_structure(pdf_path, pages = [])
+        assert decoded == []
+        assert result["title"] == "Untitled Document"
+        assert result["sections"] == []
+        assert result["stats"]["pages_processed"] == []
+
+        with pytest.raises(PDFProcessingError):
+            self.extractor.extract_text_with_structure(pdf_path, pages = [6])
+
+    def test_early_stop_skips_remaining_pages(self, tmp_path):
+        """Test that max_sections and stop_after_heading stop before later pages are read."""
+        pdf_path = self._heading_per_page_pdf(str(tmp_path / "stop.pdf"), 6)
+        self.extractor.config.MAX_PAGES_FOR_FONT_ANALYSIS = 1
+
+        result = self.extractor.extract_text_with_structure(pdf_path, max_sections = 2)
+        assert [section["title"] for section in result["sections"]] == ["Heading 0", "Heading 1"]
+        # The page after the last section is read to find where that section ends
+        assert result["stats"]["pages_processed"] == [0, 1, 2]
+
+        sections = list(self.extractor.iter_sections(pdf_path, stop_after_heading = "heading 3"))
+        assert [section["title"] for section in sections] == ["Heading 0", "Heading 1", "Heading 2", "Heading 3"]
+        assert self.extractor._pages_processed == {0, 1, 2, 3, 4}
+
+    def test_extract_outline_from_toc(self, tmp_path):
+        """Test that an embedded outline is used without decoding pages beyond the title page."""
+        pdf_path = str(tmp_path / "toc.pdf")
+        doc = fitz.open()
+        for page_num in range(4):
+            doc.new_page().insert_text((50, 60), f"Page {page_num}", fontsize = 11)
+        doc.set_toc([[1, "Introduction", 1], [2, "Scope", 2], [1, "Results", 4]])
+        doc.set_metadata({"title": "Annual Report"})
+        doc.save(pdf_path)
+        doc.close()
+
+        result = self.extractor.extract_outline(pdf_path)
+
+        assert result["title"] == "Annual Report"
+        assert result["source"] == "toc"
+        assert result["outline"] == [
+            {"level": "H1", "title": "Introduction", "page": 0},
+            {"level": "H2", "title": "Scope", "page": 1},
+            {"level": "H1", "title": "Results", "page": 3},
+        ]
+        assert result["stats"]["pages_processed"] == []
+
+    def test_extract_outline_font_fallback_matches_sections(self, tmp_path):
+        """Test that without bookmarks the outline lists the headings of a full extraction."""
+        pdf_path = self._heading_per_page_pdf(str(tmp_path / "fonts.pdf"), 3)
+
+        result = self.extractor.extract_outline(pdf_path)
+        full = self.extractor.extract_text_with_structure(pdf_path)
+
+        assert result["source"] == "fonts"
+        assert result["title"] == full["title"]
+        assert [(entry["level"], entry["title"]) for entry in result["outline"]] == [
+            (section["level"], section["title"]) for section in full["sections"] if section["level"] != "content"
+        ]
+        assert [entry["page"] for entry in result["outline"]] == [0, 1, 2]
+
+    def test_text_extraction_modes_match(self, tmp_path):
+        """Test that skipping image blocks leaves the extracted structure unchanged."""
+        pdf_path = str(tmp_path / "image.pdf")
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((50, 60), "Figure heading", fontsize = 18)
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+        pixmap.clear_with(128)
+        page.insert_image(fitz.Rect(50, 80, 250, 280), pixmap = pixmap)
+        page.insert_text((50, 300), "Caption text below the image", fontsize = 11)
+        doc.save(pdf_path)
+        doc.close()
+
+        self.config.TEXT_EXTRACTION = "dict"
+        full = self.extractor.extract_text_with_structure(pdf_path)
+        self.config.TEXT_EXTRACTION = "text"
+        with patch.object(fitz.Page, 'get_text', autospec = True, side_effect = fitz.Page.get_text) as mock_get_text:
+            text_only = self.extractor.extract_text_with_structure(pdf_path)
+
+        assert not mock_get_text.call_args.kwargs["flags"] & fitz.TEXT_PRESERVE_IMAGES
+        full.pop("stats")
+        text_only.pop("stats")
+        assert text_only == full
+
+        self.config.TEXT_EXTRACTION = "rawdict"
+        with pytest.raises(PDFProcessingError, match = "Unknown text extraction mode"):
+            self.extractor.extract_text_with_structure(pdf_path)
+
+    def test_sample_pages(self):
+        """Test the page samples chosen by each font sampling mode."""
+        self.config.MAX_PAGES_FOR_FONT_ANALYSIS = 4
+        pages = list(range(10, 20))
+
+        self.config.FONT_SAMPLING = "first"
+        assert list(self.extractor._sample_pages(pages)) == [10, 11, 12, 13]
+        self.config.FONT_SAMPLING = "stratified"
+        assert list(self.extractor._sample_pages(pages)) == [10, 13, 16, 19]
+        assert list(self.extractor._sample_pages(pages[:3])) == [10, 11, 12]
+        self.config.FONT_SAMPLING = "full"
+        assert list(self.extractor._sample_pages(pages)) == pages
+        self.config.FONT_SAMPLING = "middle"
+        with pytest.raises(ValueError):
+            self.extractor._sample_pages(pages)
+
+    def test_full_font_sampling_finds_late_headings(self, tmp_path):
+        """Test that "full" sampling sees headings past the sample limit without decoding twice."""
+        pdf_path = str(tmp_path / "late.pdf")
+        doc = fitz.open()
+        for page_num in range(6):
+            page = doc.new_page()
+            if page_num >= 4:
+                page.insert_text((50, 60), f"Late heading {page_num}", fontsize = 18)
+            page.insert_text((50, 100), f"Body text on page {page_num} " * 3, fontsize = 11)
+        doc.save(pdf_path)
+        doc.close()
+        self.config.MAX_PAGES_FOR_FONT_ANALYSIS = 2
+
+        first = self.extractor.extract_text_with_structure(pdf_path)
+        assert first["heading_levels"] == {}
+
+        self.config.FONT_SAMPLING = "full"
+        get_text = fitz.Page.get_text
+        with patch.object(fitz.Page, 'get_text', autospec = True, side_effect = get_text) as mock_get_text:
+            full = self.extractor.extract_text_with_structure(pdf_path)
+
+        assert mock_get_text.call_count == 6
+        assert full["heading_levels"] == {"18.0": "H1"}
+        assert [section["title"] for section in full["sections"]] == [None, "Late heading 4", "Late heading 5"]
+        assert full["font_histogram"].keys() == {"11.0", "18.0"}
+
+    def test_iter_sections_file_not_found(self):
+        """Test that a missing file is reported before iteration starts."""
+        with pytest.raises(PDFFileNotFoundError):
+            self.extractor.iter_sections("nonexistent.pdf")
+
     def test_analyze_font_sizes(self):
         """Test font size analysis."""
         mock_doc = Mock()
@@ -142,18 +458,18 @@ class TestPDFStructureExtractor:
 
     def test_group_paragraphs(self):
         """Test paragraph grouping."""
-        lines = [
-            {"text": "Line 1", "font_size": 12.0, "top": 100, "bottom": 110},
-            {"text": "Line 2", "font_size": 12.0, "top": 115, "bottom": 125},
-            {"text": "Line 3", "font_size": 12.0, "top": 200, "bottom": 210},  # Large gap
-            {"text": "Line 4", "font_size": 12.0, "top": 215, "bottom": 225}
-        ]
+        lines = LineStore()
+        lines.append(0, "Line 1", 12.0, 100, 110)
+        lines.append(0, "Line 2", 12.0, 115, 125)
+        lines.append(0, "Line 3", 12.0, 200, 210)  # Large gap
+        lines.append(0, "Line 4", 12.0, 215, 225)
 
         paragraphs = self.extractor._group_paragraphs(lines)
 
         assert len(paragraphs) == 2  # Should be grouped into 2 paragraphs
         assert len(paragraphs[0]) == 2  # First paragraph has 2 lines
         assert len(paragraphs[1]) == 2  # Second paragraph has 2 lines
+        assert self.extractor._paragraph_texts(lines) == ["Line 1 Line 2", "Line 3 Line 4"]
 
     def test_extract_title(self):
         """Test title extraction."""
@@ -218,6 +534,13 @@ class TestConfig:
         assert config.DEFAULT_ENCODING == "utf-8"
         assert config.PROCESS_PAGES_IN_CHUNKS is False
         assert config.CHUNK_SIZE == 10
+        assert config.WORKERS == 1
+        assert config.PARALLEL_MIN_PAGES == 50
+        assert config.VECTORIZE is True
+        assert config.TEXT_EXTRACTION == "text"
+        assert config.FONT_SAMPLING == "first"
+        assert config.CACHE_DIR == ""
+        assert config.CACHE_MAX_MB == 512
         assert config.DEBUG_MODE is False
         assert config.LOG_LEVEL == "INFO"
 
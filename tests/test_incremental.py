@@ -0,0 +1,134 @@
+"""
+Unit tests for incremental re-extraction with a page index.
+"""
+
+from unittest.mock import patch
+
+import pymupdf as fitz
+import pytest
+
+from pdf_to_json import Config, PDFStructureExtractor, extract_incremental
+from pdf_to_json.incremental import page_fingerprint
+
+from .conftest import without_timing, write_pdf
+
+# Stats that legitimately differ between full and incremental runs
+RUN_STATS = ("pages_processed", "pages_reused")
+
+PAGES = [(f"Heading {n}", f"Body text on page {n}", "continued body text") for n in range(4)]
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = str(tmp_path / "doc.pdf")
+    write_pdf(path, PAGES)
+    return path
+
+
+class TestIncremental:
+    """Test cases for extract_incremental."""
+
+    def test_matches_full_extraction(self, pdf_path, tmp_path):
+        """Test that first and repeated runs equal a full extraction, and a repeat decodes nothing."""
+        index_path = str(tmp_path / "doc.index")
+        expected = without_timing(PDFStructureExtractor().extract_text_with_structure(pdf_path), *RUN_STATS)
+
+        first = extract_incremental(pdf_path, index_path)
+        second = extract_incremental(pdf_path, index_path)
+
+        assert without_timing(first, *RUN_STATS) == expected
+        assert without_timing(second, *RUN_STATS) == expected
+        assert first["stats"]["pages_processed"] == [0, 1, 2, 3]
+        assert second["stats"]["pages_processed"] == []
+        assert second["stats"]["pages_reused"] == 4
+
+    def test_decodes_changed_and_appended_pages_only(self, pdf_path, tmp_path):
+        """Test that only changed and new pages are decoded after the document is regenerated."""
+        index_path = str(tmp_path / "doc.index")
+        extract_incremental(pdf_path, index_path)
+
+        updated_path = str(tmp_path / "updated.pdf")
+        pages = list(PAGES)
+        pages[1] = ("Heading 1", "Revised body text")
+        write_pdf(updated_path, pages + [("Appendix", "Appended page", "continued body text")])
+
+        result = extract_incremental(updated_path, index_path)
+
+        assert result["stats"]["pages_processed"] == [1, 4]
+        expected = PDFStructureExtractor().extract_text_with_structure(updated_path)
+        assert without_timing(result, *RUN_STATS) == without_timing(expected, *RUN_STATS)
+
+    def test_heading_levels_recomputed_only_when_histogram_changes(self, pdf_path, tmp_path):
+        """Test that stored heading levels are reused while the sampled histogram is unchanged."""
+        index_path = str(tmp_path / "doc.index")
+        config = Config()
+        config.MAX_PAGES_FOR_FONT_ANALYSIS = 2
+        extractor = PDFStructureExtractor(config)
+        extractor.extract_incremental(pdf_path, index_path)
+
+        # A change after the sampled pages leaves the histogram as it was
+        late_change = str(tmp_path / "late.pdf")
+        write_pdf(late_change, PAGES[:3] + [("Heading 3", "Changed late page", "continued body text")])
+        with patch.object(extractor, "_assign_heading_levels", wraps = extractor._assign_heading_levels) as assign:
+            extractor.extract_incremental(late_change, index_path)
+            assert assign.call_count == 0
+
+            early_change = str(tmp_path / "early.pdf")
+            write_pdf(early_change, [("Heading 0", "A much longer first page body", "continued body text")] + PAGES[1:])
+            extractor.extract_incremental(early_change, index_path)
+            assert assign.call_count == 1
+
+    def test_index_ignored_for_other_settings_or_corruption(self, pdf_path, tmp_path):
+        """Test that an index from other settings, or an unreadable one, is not reused."""
+        index_path = tmp_path / "doc.index"
+        extract_incremental(pdf_path, str(index_path))
+
+        config = Config()
+        config.MIN_TEXT_LENGTH = 5
+        assert extract_incremental(pdf_path, str(index_path), config = config)["stats"]["pages_reused"] == 0
+
+        index_path.write_text("{not json")
+        result = extract_incremental(pdf_path, str(index_path))
+        assert result["stats"]["pages_reused"] == 0
+        assert extract_incremental(pdf_path, str(index_path))["stats"]["pages_reused"] == 4
+
+    def test_font_mapping_change_is_not_reused(self, tmp_path):
+        """Test that a page whose font's ToUnicode CMap changed, but not its content stream, is decoded again."""
+        path, index_path = str(tmp_path / "doc.pdf"), str(tmp_path / "doc.index")
+        write_pdf(path, PAGES)
+        extract_incremental(path, index_path)
+
+        # Same content streams; the heading font now maps each code to the next character
+        doc = fitz.open(path)
+        mappings = "\n".join(f"<{code:02X}> <{code + 1:04X}>" for code in range(32, 127))
+        cmap_xref = doc.get_new_xref()
+        doc.update_object(cmap_xref, "<<>>")
+        doc.update_stream(cmap_xref, f"begincmap\n1 begincodespacerange\n<00> <FF>\nendcodespacerange\n"
+                                     f"95 beginbfchar\n{mappings}\nendbfchar\nendcmap".encode())
+        doc.xref_set_key(doc[2].get_fonts()[0][0], "ToUnicode", f"{cmap_xref} 0 R")
+        updated_path = str(tmp_path / "updated.pdf")
+        doc.save(updated_path)
+        doc.close()
+
+        result = extract_incremental(updated_path, index_path)
+
+        expected = PDFStructureExtractor().extract_text_with_structure(updated_path)
+        assert without_timing(result, *RUN_STATS) == without_timing(expected, *RUN_STATS)
+        assert result["stats"]["pages_reused"] < 4
+        assert any("Ifbejoh" in section["title"] for section in result["sections"] if section["title"])
+
+    def test_fingerprint_ignores_object_numbers(self, tmp_path):
+        """Test that the same page in differently laid out files has the same fingerprint."""
+        path = str(tmp_path / "doc.pdf")
+        write_pdf(path, PAGES)
+        doc = fitz.open(path)
+        other = fitz.open()
+        other.new_page().insert_text((50, 60), "Cover", fontsize = 18)
+        other.insert_pdf(doc, from_page = 2, to_page = 2)
+
+        assert page_fingerprint(other, 1) == page_fingerprint(doc, 2)
+        assert page_fingerprint(doc, 1) != page_fingerprint(doc, 2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
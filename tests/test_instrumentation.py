@@ -0,0 +1,108 @@
+"""
+Unit tests for extraction profiles and stats hooks.
+"""
+
+import json
+
+import pytest
+
+from pdf_to_json import Config, PDFStructureExtractor, register_hook, unregister_hook
+from pdf_to_json.instrumentation import Profiler
+
+from .conftest import write_pdf
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = str(tmp_path / "profiled.pdf")
+    write_pdf(path, [(f"Heading {n}", f"Body text on page {n}", "continued body text") for n in range(4)])
+    return path
+
+
+def _profile_config(**settings):
+    config = Config()
+    config.PROFILE = True
+    for name, value in settings.items():
+        setattr(config, name, value)
+    return config
+
+
+class TestProfiler:
+    """Test cases for the stage clock."""
+
+    def test_switch_charges_running_stage(self):
+        """Test that time is charged to one stage at a time and nested stages hand back."""
+        profiler = Profiler("a")
+        with profiler.stage("b"):
+            assert profiler.switch("c") == "b"
+        assert profiler.switch(None) == "a"
+
+        assert set(profiler.stages) == {"a", "b", "c"}
+        assert all(seconds >= 0 for seconds in profiler.stages.values())
+
+
+class TestExtractionProfile:
+    """Test cases for stats["profile"] and hooks."""
+
+    def test_profile_only_when_enabled(self, pdf_path):
+        """Test that the profile is recorded only with PROFILE, and nothing else changes."""
+        plain = PDFStructureExtractor().extract_text_with_structure(pdf_path)
+        profiled = PDFStructureExtractor(_profile_config()).extract_text_with_structure(pdf_path)
+
+        assert "profile" not in plain["stats"]
+        profile = profiled["stats"].pop("profile")
+        for result in (plain, profiled):
+            result["stats"].pop("processing_time")
+        assert profiled == plain
+
+        assert {"open", "title", "font_analysis", "page_decode", "line_building",
+                "heading_detection", "paragraph_grouping"} <= set(profile["stages"])
+        assert list(profile["page_decode_times"]) == [str(p) for p in plain["stats"]["pages_processed"]]
+        assert profile["counts"]["spans"] > 0
+        assert profile["counts"]["lines"] >= plain["stats"]["num_paragraphs"]
+        assert profile["peak_memory_bytes"] is None or profile["peak_memory_bytes"] > 0
+        json.dumps(profile)
+
+    def test_parallel_profile_merges_workers(self, pdf_path):
+        """Test that pages decoded by workers appear in the profile."""
+        config = _profile_config(WORKERS = 2, PARALLEL_MIN_PAGES = 1, MAX_PAGES_FOR_FONT_ANALYSIS = 1)
+        result = PDFStructureExtractor(config).extract_text_with_structure(pdf_path)
+        profile = result["stats"]["profile"]
+
+        assert "parallel_wait" in profile["stages"]
+        assert "page_decode" in profile["worker_stages"]
+        assert list(profile["page_decode_times"]) == ["0", "1", "2", "3"]
+
+    def test_outline_profile(self, pdf_path):
+        """Test that outline extraction records a profile too."""
+        result = PDFStructureExtractor(_profile_config()).extract_outline(pdf_path)
+
+        assert "heading_detection" in result["stats"]["profile"]["stages"]
+
+    def test_hooks_receive_stats(self, pdf_path):
+        """Test that hooks see every extraction and that a failing hook is contained."""
+        calls = []
+
+        def failing(name, stats):
+            raise RuntimeError("metrics backend down")
+
+        def recording(name, stats):
+            calls.append((name, stats))
+
+        register_hook(failing)
+        register_hook(recording)
+        try:
+            result = PDFStructureExtractor().extract_text_with_structure(pdf_path)
+            PDFStructureExtractor().extract_outline(pdf_path)
+        finally:
+            unregister_hook(failing)
+            unregister_hook(recording)
+        PDFStructureExtractor().extract_text_with_structure(pdf_path)
+
+        assert len(calls) == 2
+        assert calls[0] == (pdf_path, result["stats"])
+        assert "num_headings" in calls[1][1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,101 @@
+"""
+Unit tests for layout profiles.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from pdf_to_json import Config, LayoutProfile, PDFStructureExtractor
+from pdf_to_json.cache import ResultCache
+from pdf_to_json.layout import _load_profile, assign_heading_levels
+
+from .conftest import without_timing, write_pdf
+
+
+def _template_pages(heading, body):
+    """Pages of a two-page document from one template."""
+    return [(f"{heading} {n}", f"{body} on page {n}", "continued body text of the template") for n in range(2)]
+
+
+@pytest.fixture
+def template_paths(tmp_path):
+    paths = [str(tmp_path / "first.pdf"), str(tmp_path / "second.pdf")]
+    write_pdf(paths[0], _template_pages("Report", "Quarterly figures"))
+    write_pdf(paths[1], _template_pages("Summary", "Annual figures"))
+    return paths
+
+
+class TestLayoutProfile:
+    """Test cases for LayoutProfile."""
+
+    def test_from_histogram(self):
+        """Test that histograms differing only in counts get the same levels, and profiles own their tables."""
+        histogram = {11.0: 500, 14.0: 60, 18.0: 30, 24.0: 1}
+        other_document = {11.0: 730, 14.0: 41, 18.0: 22, 24.0: 2}
+
+        profile = LayoutProfile.from_histogram(histogram, 0.01, 6)
+        other = LayoutProfile.from_histogram(other_document, 0.01, 6)
+
+        assert profile.heading_levels == other.heading_levels == {18.0: "H1", 14.0: "H2"}
+        assert profile.heading_levels == assign_heading_levels(histogram, 0.01, 6)
+        assert other.font_histogram == other_document
+        assert LayoutProfile.from_histogram(histogram, 0.01, 1).heading_levels == {18.0: "H1", 14.0: "H1"}
+        assert profile.level(18.0) == "H1"
+        assert profile.level(11.0) is None
+
+        profile.heading_levels[11.0] = "H1"
+        assert LayoutProfile.from_histogram(histogram, 0.01, 6).heading_levels == {18.0: "H1", 14.0: "H2"}
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved profile loads back equal and is reused while the file is unchanged."""
+        path = str(tmp_path / "template.layout")
+        LayoutProfile({11.0: 100, 18.0: 20}, {18.0: "H1"}).save(path)
+
+        _load_profile.cache_clear()
+        loaded = LayoutProfile.load(path)
+
+        assert loaded.font_histogram == {11.0: 100, 18.0: 20}
+        assert loaded.heading_levels == {18.0: "H1"}
+        loaded.heading_levels.clear()
+        assert LayoutProfile.load(path).heading_levels == {18.0: "H1"}
+        assert _load_profile.cache_info().hits == 1
+
+        with open(path, 'w', encoding = 'utf-8') as f:
+            f.write('{"sections": []}')
+        with pytest.raises(ValueError):
+            LayoutProfile.load(path)
+
+    def test_profile_skips_font_analysis(self, template_paths, tmp_path):
+        """Test that documents of a saved template are extracted without font analysis and unchanged."""
+        layout_path = str(tmp_path / "template.layout")
+        PDFStructureExtractor().extract_layout_profile(template_paths[0]).save(layout_path)
+        expected = without_timing(PDFStructureExtractor().extract_text_with_structure(template_paths[1]))
+        config = Config()
+        config.LAYOUT_PROFILE = layout_path
+
+        with patch.object(PDFStructureExtractor, "analyze_font_sizes", side_effect = AssertionError), \
+                patch.object(PDFStructureExtractor, "_collect_lines", side_effect = AssertionError):
+            result = PDFStructureExtractor(config).extract_text_with_structure(template_paths[1])
+            outline = PDFStructureExtractor(config).extract_outline(template_paths[1])
+
+        # The reported histogram is the template's; everything derived from it is unchanged
+        assert result.pop("font_histogram") == LayoutProfile.load(layout_path).to_dict()["font_histogram"]
+        expected.pop("font_histogram")
+        assert without_timing(result) == expected
+        assert [entry["level"] for entry in outline["outline"]] == ["H1", "H1"]
+
+    def test_cache_key_follows_profile_contents(self, tmp_path):
+        """Test that the result cache key changes with the profile's contents, not its path."""
+        config = Config()
+        config.LAYOUT_PROFILE = str(tmp_path / "template.layout")
+        LayoutProfile({11.0: 100, 18.0: 20}, {18.0: "H1"}).save(config.LAYOUT_PROFILE)
+        first = ResultCache.key_for(b"%PDF", config)
+
+        LayoutProfile({11.0: 100, 18.0: 20, 24.0: 5}, {24.0: "H1", 18.0: "H2"}).save(config.LAYOUT_PROFILE)
+
+        assert ResultCache.key_for(b"%PDF", config) != first
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,94 @@
+"""
+Unit tests for the pdf_to_json columnar line store.
+"""
+
+import pickle
+import random
+from unittest.mock import patch
+
+import pytest
+
+from pdf_to_json import lines as lines_module
+from pdf_to_json.lines import LineStore
+
+
+class TestLineStore:
+    """Test cases for LineStore."""
+
+    def test_append_and_access(self):
+        """Test that appended lines read back column by column."""
+        store = LineStore()
+        store.append(0, "Heading", 18.0, 50.0, 70.0)
+        store.append(1, "Body", 11.0)
+
+        assert len(store) == 2
+        assert store.text(0) == "Heading"
+        assert store.texts() == ["Heading", "Body"]
+        assert list(store.pages) == [0, 1]
+        assert list(store.font_sizes) == [18.0, 11.0]
+        assert (store.top(0), store.bottom(0)) == (50.0, 70.0)
+        assert (store.top(1), store.bottom(1)) == (None, None)
+
+    def test_from_columns_and_extend(self):
+        """Test copying a range of lines between stores keeps texts and offsets aligned."""
+        source = LineStore.from_columns([3, 3, 3], ["a", "bb", "ccc"], [10.0, 11.0, 12.0],
+                                        [1.0, 2.0, None], [1.5, 2.5, None])
+        target = LineStore()
+        target.append(2, "first", 9.0, 0.0, 1.0)
+        target.extend(source, 1)
+        target.extend(source, 0, 1)
+
+        assert target.texts() == ["first", "bb", "ccc", "a"]
+        assert list(target.pages) == [2, 3, 3, 3]
+        assert target.top(2) is None
+        assert target.top(3) == 1.0
+
+    def test_pickle_round_trip(self):
+        """Test that stores survive pickling, as done for process-pool results."""
+        store = LineStore()
+        store.append(0, "one", 11.0, 1.0, 2.0)
+        store.append(0, "two", 11.0, None, None)
+
+        restored = pickle.loads(pickle.dumps(store))
+
+        assert restored.texts() == ["one", "two"]
+        assert list(restored.font_sizes) == [11.0, 11.0]
+        assert restored.bottom(1) is None
+
+    @staticmethod
+    def _random_store(line_count, seed):
+        """Build a store with varied gaps and font sizes and some unknown bounds."""
+        rng = random.Random(seed)
+        store = LineStore()
+        y = 0.0
+        for i in range(line_count):
+            y += rng.choice([11.5, 13.0, 14.2, 30.0])
+            top = None if rng.random() < 0.05 else y
+            bottom = None if rng.random() < 0.05 else y + 10.0
+            store.append(0, f"line {i}", rng.choice([0.0, 10.0, 10.0, 10.0, 14.0, 18.0]), top, bottom)
+        return store
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_vectorized_matches_python(self, seed):
+        """Test that the NumPy path groups and classifies exactly like the Python loops."""
+        pytest.importorskip("numpy")
+        store = self._random_store(500, seed)
+        heading_sizes = {14.0: "H2", 18.0: "H1"}
+
+        with patch.object(lines_module, "VECTORIZE_MIN_LINES", 1):
+            assert store.paragraph_ranges(vectorize = True) == store.paragraph_ranges(vectorize = False)
+            assert store.heading_indices(heading_sizes, vectorize = True) == \
+                store.heading_indices(heading_sizes, vectorize = False)
+
+    def test_fallback_without_numpy(self):
+        """Test that grouping works when NumPy is not installed."""
+        store = self._random_store(300, 0)
+        expected = store.paragraph_ranges(vectorize = False)
+
+        with patch.object(lines_module, "numpy_module", return_value = None):
+            assert store.paragraph_ranges() == expected
+            assert store.heading_indices({18.0}) == [i for i, size in enumerate(store.font_sizes) if size == 18.0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
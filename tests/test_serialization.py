@@ -0,0 +1,66 @@
+"""
+Unit tests for pdf_to_json JSON backends and result serialization.
+"""
+
+import json
+
+import pytest
+
+from pdf_to_json.output import dumps_result
+from pdf_to_json.serialization import get_dumps, stdlib_dumps
+
+SAMPLE_RESULT = {
+    "title": "Überschrift – 標題",
+    "sections": [
+        {"level": "H1", "title": "Intro \"quoted\" \\ path", "paragraphs": ["tab\there", "ctrl\x1f", "lone \ud800"]},
+        {"level": "content", "title": None, "paragraphs": []}
+    ],
+    "font_histogram": {"10.0": 1200, "18.0": 40},
+    "heading_levels": {},
+    "stats": {"page_count": 1, "processing_time": 1e-05, "num_sections": 2}
+}
+
+
+def _backends():
+    backends = ["json"]
+    for name in ["orjson", "msgspec"]:
+        try:
+            __import__(name)
+            backends.append(name)
+        except ImportError:
+            pass
+    return backends
+
+
+class TestSerialization:
+    """Test cases for JSON backends."""
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            get_dumps("yaml")
+
+    def test_auto_backend(self):
+        """Test that auto always resolves to a working encoder."""
+        assert get_dumps("auto")({"a": [1, None]}, None) == '{"a":[1,null]}'
+
+    @pytest.mark.parametrize("backend", _backends())
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_dumps_result_matches_stdlib(self, backend, indent):
+        """Test byte compatibility with json.dumps for every installed backend."""
+        dumps = get_dumps(backend)
+        if indent:
+            expected = json.dumps(SAMPLE_RESULT, ensure_ascii=False, indent=indent)
+        else:
+            expected = json.dumps(SAMPLE_RESULT, ensure_ascii=False, separators=(',', ':'))
+
+        assert dumps_result(SAMPLE_RESULT, indent, dumps) == expected
+
+    def test_stdlib_dumps(self):
+        """Test the stdlib encoder's compact and indented forms."""
+        assert stdlib_dumps({"a": "é"}) == '{"a":"é"}'
+        assert stdlib_dumps({"a": 1}, 2) == '{\n  "a": 1\n}'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
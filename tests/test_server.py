@@ -0,0 +1,198 @@
+"""
+Unit tests for the pdf_to_json extraction service.
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from pdf_to_json import Config, PDFStructureExtractor
+from pdf_to_json.exceptions import ServerBusyError
+from pdf_to_json.server import create_server
+
+from .conftest import titled_pages, without_timing, write_pdf
+
+
+@pytest.fixture(scope = "module")
+def server():
+    """Run a one-worker service on a free localhost port."""
+    config = Config()
+    config.SERVE_MAX_QUEUE = 2
+    service = create_server(config, port = 0, workers = 1)
+    thread = threading.Thread(target = service.serve_forever, daemon = True)
+    thread.start()
+    yield service
+    service.shutdown()
+    service.close()
+    thread.join()
+
+
+def _request(server, method, url, body = None, headers = None):
+    """Send one request and return (status, decoded JSON body)."""
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout = 30)
+    try:
+        conn.request(method, url, body = body, headers = headers or {})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def _post_path(server, path, query = ""):
+    return _request(server, "POST", "/extract" + query, json.dumps({"path": path}),
+                    {"Content-Type": "application/json"})
+
+
+class TestServer:
+    """Test cases for the HTTP extraction service."""
+
+    def test_health(self, server):
+        """Test the health endpoint reports the pool."""
+        status, body = _request(server, "GET", "/health")
+        assert status == 200
+        assert body == {"status": "ok", "workers": 1, "pending": 0}
+
+    def test_extract_path_matches_library(self, server, tmp_path):
+        """Test that a path request returns the same result as the library."""
+        pdf_path = str(tmp_path / "doc.pdf")
+        write_pdf(pdf_path, titled_pages("Served Title"))
+
+        status, body = _post_path(server, pdf_path)
+
+        assert status == 200
+        expected = PDFStructureExtractor().extract_text_with_structure(pdf_path)
+        assert without_timing(body) == without_timing(expected)
+
+    def test_extract_uploaded_bytes_with_options(self, server, tmp_path):
+        """Test raw PDF uploads and query options."""
+        pdf_path = tmp_path / "doc.pdf"
+        write_pdf(str(pdf_path), titled_pages("Uploaded"))
+
+        status, body = _request(server, "POST", "/extract?pages=2", pdf_path.read_bytes(),
+                                {"Content-Type": "application/pdf"})
+        assert status == 200
+        assert body["stats"]["pages_processed"] == [1]
+
+        status, body = _request(server, "POST", "/extract?outline=1", pdf_path.read_bytes())
+        assert status == 200
+        assert body["title"] == "Uploaded"
+        assert "outline" in body
+
+    def test_errors(self, server, tmp_path):
+        """Test status codes for bad requests and bad documents."""
+        assert _post_path(server, str(tmp_path / "missing.pdf"))[0] == 404
+        assert _request(server, "POST", "/extract", b"not a pdf")[0] == 422
+        assert _request(server, "POST", "/extract?pages=x", b"%PDF")[0] == 400
+        assert _request(server, "POST", "/extract?colour=red", b"%PDF")[0] == 400
+        assert _request(server, "POST", "/extract", b"{}", {"Content-Type": "application/json"})[0] == 400
+        assert _request(server, "GET", "/nowhere")[0] == 404
+
+    @pytest.mark.parametrize("length", [None, "-1", "abc"])
+    def test_invalid_content_length(self, server, length):
+        """Test that a missing, negative or malformed Content-Length is refused before reading the body."""
+        conn = http.client.HTTPConnection(*server.server_address[:2], timeout = 30)
+        try:
+            conn.putrequest("POST", "/extract", skip_accept_encoding = True)
+            if length is not None:
+                conn.putheader("Content-Length", length)
+            conn.endheaders()
+            conn.send(b"%PDF")
+            response = conn.getresponse()
+            assert response.status == 400
+            assert "Content-Length" in json.loads(response.read())["error"]
+        finally:
+            conn.close()
+
+    def test_page_out_of_range_is_bad_request(self, server, tmp_path):
+        """Test that selecting a page the document lacks is a client error."""
+        pdf_path = str(tmp_path / "doc.pdf")
+        write_pdf(pdf_path, titled_pages("Two Pages"))
+
+        status, body = _post_path(server, pdf_path, "?pages=9")
+
+        assert status == 400
+        assert "out of range" in body["error"]
+
+    def test_queue_full_is_refused(self, server, tmp_path):
+        """Test that requests beyond the queue limit are refused with 503."""
+        pdf_path = str(tmp_path / "doc.pdf")
+        write_pdf(pdf_path, titled_pages("Busy"))
+        pool = server.pool
+        held = 0
+        while pool._slots.acquire(blocking = False):
+            held += 1
+        try:
+            with pytest.raises(ServerBusyError):
+                pool.run({"source": pdf_path}, timeout = 5)
+            assert _post_path(server, pdf_path)[0] == 503
+        finally:
+            for _ in range(held):
+                pool._slots.release()
+
+    def test_timeout_replaces_worker(self, server, tmp_path):
+        """Test that an overrunning request gets 504 and the worker is replaced."""
+        # Long enough that the worker cannot answer before the zero timeout is checked
+        pdf_path = str(tmp_path / "doc.pdf")
+        write_pdf(pdf_path, [(None, "Slow page")] * 200)
+        old_workers = set(server.pool._workers)
+
+        server.request_timeout = 0.0
+        try:
+            assert _post_path(server, pdf_path)[0] == 504
+        finally:
+            server.request_timeout = 60.0
+
+        assert server.pool._workers.isdisjoint(old_workers)
+        assert _post_path(server, pdf_path)[0] == 200
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason = "Unix sockets unavailable")
+    def test_unix_socket(self, tmp_path):
+        """Test serving over a Unix domain socket."""
+        pdf_path = tmp_path / "doc.pdf"
+        write_pdf(str(pdf_path), titled_pages("Socket"))
+        socket_path = str(tmp_path / "service.sock")
+        service = create_server(socket_path = socket_path, workers = 1)
+        thread = threading.Thread(target = service.serve_forever, daemon = True)
+        thread.start()
+        try:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(socket_path)
+            conn = http.client.HTTPConnection("localhost")
+            conn.sock = client
+            data = pdf_path.read_bytes()
+            conn.request("POST", "/extract", body = data)
+            response = conn.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read())["title"] == "Socket"
+            conn.close()
+        finally:
+            service.shutdown()
+            service.close()
+            thread.join()
+        assert not os.path.exists(socket_path)
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason = "Unix sockets unavailable")
+    def test_socket_path_must_not_be_a_file(self, tmp_path):
+        """Test that an existing non-socket file at the socket path is refused and left in place."""
+        report = tmp_path / "report.pdf"
+        report.write_bytes(b"precious")
+
+        with pytest.raises(ValueError, match = "not a socket"):
+            create_server(socket_path = str(report), workers = 1)
+
+        assert report.read_bytes() == b"precious"
+
+    def test_socket_path_without_unix_sockets(self, tmp_path, monkeypatch):
+        """Test that asking for a Unix socket on a platform without them is a clear error."""
+        monkeypatch.delattr(socket, "AF_UNIX", raising = False)
+
+        with pytest.raises(ValueError, match = "not available"):
+            create_server(socket_path = str(tmp_path / "service.sock"), workers = 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,98 @@
+"""
+Unit tests for extraction from in-memory PDFs and file objects.
+"""
+
+import io
+import mmap
+
+import pytest
+
+from pdf_to_json import Config, PDFStructureExtractor, extract_pdf_to_dict, iter_sections
+from pdf_to_json.exceptions import InvalidPDFError
+from pdf_to_json.sources import close_document, open_document
+
+from .conftest import pdf_bytes, titled_pages, without_timing
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(pdf_bytes(titled_pages("Memory Title")))
+    return path
+
+
+class TestSources:
+    """Test cases for bytes, buffer and file-object inputs."""
+
+    @pytest.mark.parametrize("mmap_files", [True, False])
+    def test_inputs_match_path_extraction(self, pdf_file, mmap_files):
+        """Test that every supported input gives the result of the path."""
+        config = Config()
+        config.MMAP_FILES = mmap_files
+        extractor = PDFStructureExtractor(config)
+        data = pdf_file.read_bytes()
+        expected = without_timing(extractor.extract_text_with_structure(str(pdf_file)))
+
+        with open(pdf_file, "rb") as f:
+            inputs = [pdf_file, data, bytearray(data), memoryview(data), io.BytesIO(data), f]
+            for pdf in inputs:
+                assert without_timing(extractor.extract_text_with_structure(pdf)) == expected
+
+    def test_file_object_read_from_current_position(self, tmp_path):
+        """Test that a file object is read from where it stands, e.g. after a header."""
+        data = pdf_bytes(titled_pages("Memory Title"))
+        path = tmp_path / "wrapped.bin"
+        path.write_bytes(b"HEADER" + data)
+
+        with open(path, "rb") as f:
+            f.seek(6)
+            result = extract_pdf_to_dict(f)
+        assert result["title"] == "Memory Title"
+
+    def test_mapping_released_on_close(self, pdf_file):
+        """Test that closing a memory-mapped document releases the mapping."""
+        doc = open_document(str(pdf_file))
+        assert doc.name == str(pdf_file)
+        mapping = doc._pdf_to_json_buffers[-1]
+        assert isinstance(mapping, mmap.mmap)
+
+        close_document(doc)
+        close_document(doc)
+
+        assert mapping.closed
+
+    def test_bytearray_usable_after_extraction(self):
+        """Test that the bytearray view is released, so the caller can resize it again."""
+        data = bytearray(pdf_bytes(titled_pages("Memory Title")))
+        sections = iter_sections(data)
+        next(sections)
+        with pytest.raises(BufferError):
+            data.extend(b"x")
+        list(sections)
+
+        data.extend(b"x")
+
+    def test_invalid_and_unsupported_inputs(self):
+        """Test errors for bad data and for inputs that are not PDFs at all."""
+        with pytest.raises(InvalidPDFError):
+            extract_pdf_to_dict(b"not a pdf")
+        with pytest.raises(InvalidPDFError):
+            extract_pdf_to_dict(io.BytesIO(b""))
+        with pytest.raises(TypeError):
+            extract_pdf_to_dict(42)
+
+    def test_cache_with_bytes_and_streams(self, tmp_path):
+        """Test that in-memory inputs are cached by content."""
+        data = pdf_bytes(titled_pages("Memory Title"))
+        config = Config()
+        config.CACHE_DIR = str(tmp_path / "cache")
+
+        first = extract_pdf_to_dict(io.BytesIO(data), config = config)
+        second = extract_pdf_to_dict(data, config = config)
+
+        assert second == first
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,74 @@
+"""
+Unit tests for import cost: lazy package attributes and import-time budget.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pdf_to_json
+
+# Cumulative import time allowed for ``import pdf_to_json``, in microseconds. The
+# package took about 200 ms while it imported PyMuPDF and asyncio eagerly.
+IMPORT_BUDGET_US = 100_000
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _python(*args):
+    """Run a fresh interpreter with the repository on the path and return the completed process."""
+    env = dict(os.environ, PYTHONPATH = REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    return subprocess.run([sys.executable, *args], capture_output = True, text = True, env = env, check = True)
+
+
+def _cumulative_import_us(module: str) -> int:
+    """Return the cumulative time ``python -X importtime`` reports for importing ``module``."""
+    stderr = _python("-X", "importtime", "-c", f"import {module}").stderr
+    for line in stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+class TestStartup:
+    """Test cases for startup cost."""
+
+    def test_import_time_budget(self):
+        """Test that importing the package stays within its import-time budget."""
+        # Best of three, to ride out a busy machine
+        best = min(_cumulative_import_us("pdf_to_json") for _ in range(3))
+        assert best < IMPORT_BUDGET_US
+
+    @pytest.mark.parametrize("code", [
+        "import pdf_to_json",
+        "import pdf_to_json.cli",
+        "from pdf_to_json.cli import main; main(['--version'])",
+    ])
+    def test_pymupdf_not_loaded_until_extraction(self, code):
+        """Test that the package and the CLI's argument handling do not import PyMuPDF or asyncio."""
+        check = "import sys; print(sorted(m for m in ('pymupdf', 'asyncio') if m in sys.modules))"
+        output = _python("-c", f"import sys\ntry:\n    {code}\nexcept SystemExit:\n    pass\n{check}").stdout
+        assert output.strip().splitlines()[-1] == "[]"
+
+    def test_import_leaves_logging_unconfigured(self):
+        """Test that importing the library does not configure the root logger."""
+        output = _python("-c", "import logging, pdf_to_json; pdf_to_json.PDFStructureExtractor; "
+                         "print(len(logging.getLogger().handlers))").stdout
+        assert output.strip() == "0"
+
+    def test_lazy_attributes(self):
+        """Test that lazy attributes resolve to their submodule objects."""
+        from pdf_to_json.extractor import PDFStructureExtractor
+
+        assert pdf_to_json.PDFStructureExtractor is PDFStructureExtractor
+        assert "AsyncExtractor" in dir(pdf_to_json)
+        assert all(hasattr(pdf_to_json, name) for name in pdf_to_json.__all__)
+        with pytest.raises(AttributeError):
+            pdf_to_json.no_such_attribute
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])